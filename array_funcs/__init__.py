@@ -0,0 +1,232 @@
+'''
+Additional functions for use with arrays in MicroPython to
+allow basic, fast linear algebra computations.
+
+The methods were implemented using MicroPython's inline
+assembler as per the examples in the online documentation.
+
+The purpose of these methods is to allow vectorization of
+calculations using arrays. With more work, these methods could
+be used to create a new array object (potentially multi-
+dimensional) for matrix or ndarray operations...
+
+The functions are grouped in submodules by family:
+
+int_funcs      1. Functions for arrays of type int
+float_funcs    2. Functions for arrays of type float
+conv_funcs     3. Type conversion functions
+math_funcs     4. Other math functions (pow, exp)
+random_funcs   5. Random number functions
+random_state   RandomState class for the random number functions
+complex_funcs  6. Functions for complex (interleaved float) arrays
+opqueue_funcs  7. Dispatcher for programs of array function calls
+program        Program class for recording programs for opqueue_run
+quant_funcs    8. Functions for quantized (int8) neural networks
+resample_funcs 9. Polyphase FIR filter for resampling
+event_funcs    10. Event detection (crossings and peaks)
+distance_funcs 11. Distances, nearest neighbours and k-means
+sparse_funcs   12. Sparse vector and CSR matrix functions
+linalg_funcs   13. LU factorization and solve (used by linalg)
+
+Importing array_funcs does not assemble any functions.  A family
+is imported (and its functions assembled) the first time one of
+its functions is accessed as an attribute of this package, so
+only the families that are used take up RAM.  Use load() to
+assemble families in advance, e.g. before a time-critical loop.
+Lazy loading needs a MicroPython build with module __getattr__
+support (MICROPY_MODULE_GETATTR), which is the default on most
+ports.
+
+On a computer (CPython) the functions are provided instead by
+host_funcs, which implements them with NumPy with the same in-
+place behaviour and 32-bit results, so the same code can be run
+on recorded data.
+
+Example usage:
+>>> import array_funcs
+>>> from array import array
+>>> numbers = array('i', [-1, 0, 1, 1000])
+>>> array_funcs.int_array_add_scalar(numbers, len(numbers), 1)
+536894992
+>>> numbers
+array('i', [0, 1, 2, 1001])
+'''
+
+import sys
+
+try:
+    from uctypes import addressof
+    _host = None
+except ImportError:
+    # Not MicroPython: use the NumPy versions of the functions
+    from . import host_funcs as _host
+    addressof = _host.addressof
+
+_FAMILIES = (
+    ('int_funcs', (
+        'int_array_assign_scalar',
+        'int_array_add_scalar',
+        'int_array_sub_scalar',
+        'int_array_neg',
+        'int_array_abs',
+        'int_array_div_scalar',
+        'int_array_mul_scalar',
+        'int_array_add_array',
+        'int_array_sub_array',
+        'int_array_div_array',
+        'int_array_mul_array',
+        'int_array_cmp_array',
+        'int_array_copy',
+        'int_array_square',
+        'int_array_sum',
+        'int_array_max',
+        'int_array_min'
+    )),
+    ('float_funcs', (
+        'float_array_assign_scalar',
+        'float_array_add_scalar',
+        'float_array_sub_scalar',
+        'float_array_neg',
+        'float_array_abs',
+        'float_array_mul_scalar',
+        'float_array_div_scalar',
+        'float_array_add_array',
+        'float_array_sub_array',
+        'float_array_div_array',
+        'float_array_mul_array',
+        'float_array_div_int_array',
+        'float_array_mul_int_array',
+        'float_array_add_scaled_array',
+        'float_array_copy',
+        'float_array_cmp_array',
+        'float_array_square',
+        'float_array_sqrt',
+        'float_array_sum',
+        'float_array_max',
+        'float_array_min',
+        'float_array_dot'
+    )),
+    ('conv_funcs', (
+        'int_array_from_float_array',
+        'float_array_from_int_array'
+    )),
+    ('math_funcs', (
+        'float_array_pow_int',
+        'float_array_exp',
+        'float_array_pow_float'
+    )),
+    ('random_funcs', (
+        'int_array_random',
+        'int_array_random_range',
+        'float_array_random',
+        'float_array_random_uniform',
+        'float_array_random_normal'
+    )),
+    ('random_state', (
+        'RandomState',
+    )),
+    ('complex_funcs', (
+        'complex_array_add_array',
+        'complex_array_mul_array',
+        'complex_array_mul_conj_array',
+        'complex_array_mul_scalar',
+        'complex_array_conj',
+        'complex_array_abs',
+        'complex_array_abs2',
+        'complex_array_phase',
+        'complex_array_dot',
+        'complex_array_dot_conj'
+    )),
+    ('opqueue_funcs', (
+        'opqueue_run',
+    )),
+    ('program', (
+        'Program',
+    )),
+    ('quant_funcs', (
+        'int8_dense',
+        'int8_array_requantize',
+        'int8_array_from_float_array',
+        'int8_array_lookup'
+    )),
+    ('resample_funcs', (
+        'float_array_polyphase_fir',
+    )),
+    ('event_funcs', (
+        'float_array_rising_crossings',
+        'float_array_falling_crossings',
+        'int_array_rising_crossings',
+        'int_array_falling_crossings',
+        'float_array_zero_crossings',
+        'int_array_zero_crossings',
+        'float_array_find_peaks',
+        'int_array_find_peaks'
+    )),
+    ('distance_funcs', (
+        'float_array_sqdist',
+        'float_array_l1dist',
+        'float_array_cosdist',
+        'float_array_nsmallest',
+        'float_array_assign_nearest',
+        'float_array_centroid_sums'
+    )),
+    ('sparse_funcs', (
+        'float_array_csr_matvec',
+        'float_array_sparse_dot',
+        'float_array_add_sparse',
+        'float_array_compress'
+    )),
+    ('linalg_funcs', (
+        'float_array_lu_step',
+        'float_array_lu_solve'
+    ))
+)
+
+_HOST_FAMILIES = ('int_funcs', 'float_funcs', 'conv_funcs', 'math_funcs',
+                  'random_funcs', 'complex_funcs', 'opqueue_funcs',
+                  'quant_funcs', 'resample_funcs', 'event_funcs',
+                  'distance_funcs', 'sparse_funcs', 'linalg_funcs')
+
+
+# If set (by the profiler), functions are bound as _hook(name, f)
+# when their family is loaded
+_hook = None
+
+
+def _import_family(family):
+    # Families written in assembler are replaced by host_funcs
+    # on the host; pure Python families are used on both
+    if _host is not None and family in _HOST_FAMILIES:
+        return _host
+    name = __name__ + '.' + family
+    __import__(name)
+    return sys.modules[name]
+
+
+def functions():
+    # Returns the names of all the functions in the package
+    return [name for family, names in _FAMILIES for name in names]
+
+def load(*families):
+    # Imports the given families (all if none are given) and
+    # binds their functions in this package
+    g = globals()
+    for family, names in _FAMILIES:
+        if families and family not in families:
+            continue
+        module = _import_family(family)
+        for name in names:
+            value = getattr(module, name)
+            g[name] = value if _hook is None else _hook(name, value)
+
+
+def __getattr__(name):
+    for family, names in _FAMILIES:
+        if name in names:
+            value = getattr(_import_family(family), name)
+            if _hook is not None:
+                value = _hook(name, value)
+            # Cache it so __getattr__ is only called once
+            globals()[name] = value
+            return value
+    raise AttributeError(name)
@@ -0,0 +1,298 @@
+'''
+Functions for arrays of complex numbers.
+
+A complex array is an array of type float holding interleaved
+real and imaginary parts, [re0, im0, re1, im1, ...], so an array
+of n complex numbers has 2*n floats.  The length argument of
+these functions is the number of complex numbers.  Complex
+scalars are passed as array('f', [re, im]).
+
+Example usage:
+>>> import array_funcs
+>>> from array import array
+>>> z = array('f', [1.0, 2.0, 0.0, -1.0])
+>>> w = array('f', [0.0, 1.0, 3.0, 4.0])
+>>> array_funcs.complex_array_mul_array(z, len(z)//2, w)
+536894992
+>>> z
+array('f', [-2.0, 1.0, 4.0, -3.0])
+'''
+
+
+@micropython.asm_thumb
+def complex_array_add_array(r0, r1, r2):
+    label(LOOP)
+    vldr(s0, [r0, 0])
+    vldr(s1, [r0, 4])
+    vldr(s2, [r2, 0])
+    vldr(s3, [r2, 4])
+    vadd(s0, s0, s2)
+    vadd(s1, s1, s3)
+    vstr(s0, [r0, 0])
+    vstr(s1, [r0, 4])
+    add(r0, 8)
+    add(r2, 8)
+    sub(r1, 1)
+    bgt(LOOP)
+
+@micropython.asm_thumb
+def complex_array_mul_array(r0, r1, r2):
+  # z = z*w
+  # r0: address of z
+  # r1: length of z and w (complex numbers)
+  # r2: address of w
+    label(LOOP)
+    vldr(s0, [r0, 0])      # a
+    vldr(s1, [r0, 4])      # b
+    vldr(s2, [r2, 0])      # c
+    vldr(s3, [r2, 4])      # d
+    vmul(s4, s0, s2)
+    vmul(s5, s1, s3)
+    vsub(s4, s4, s5)       # re = a*c - b*d
+    vmul(s5, s0, s3)
+    vmul(s6, s1, s2)
+    vadd(s5, s5, s6)       # im = a*d + b*c
+    vstr(s4, [r0, 0])
+    vstr(s5, [r0, 4])
+    add(r0, 8)
+    add(r2, 8)
+    sub(r1, 1)
+    bgt(LOOP)
+
+@micropython.asm_thumb
+def complex_array_mul_conj_array(r0, r1, r2):
+  # z = z*conj(w)
+    label(LOOP)
+    vldr(s0, [r0, 0])      # a
+    vldr(s1, [r0, 4])      # b
+    vldr(s2, [r2, 0])      # c
+    vldr(s3, [r2, 4])      # d
+    vmul(s4, s0, s2)
+    vmul(s5, s1, s3)
+    vadd(s4, s4, s5)       # re = a*c + b*d
+    vmul(s5, s1, s2)
+    vmul(s6, s0, s3)
+    vsub(s5, s5, s6)       # im = b*c - a*d
+    vstr(s4, [r0, 0])
+    vstr(s5, [r0, 4])
+    add(r0, 8)
+    add(r2, 8)
+    sub(r1, 1)
+    bgt(LOOP)
+
+@micropython.asm_thumb
+def complex_array_mul_scalar(r0, r1, r2):
+  # z = z*c where c = array('f', [re, im])
+    vldr(s2, [r2, 0])      # c
+    vldr(s3, [r2, 4])      # d
+    label(LOOP)
+    vldr(s0, [r0, 0])
+    vldr(s1, [r0, 4])
+    vmul(s4, s0, s2)
+    vmul(s5, s1, s3)
+    vsub(s4, s4, s5)
+    vmul(s5, s0, s3)
+    vmul(s6, s1, s2)
+    vadd(s5, s5, s6)
+    vstr(s4, [r0, 0])
+    vstr(s5, [r0, 4])
+    add(r0, 8)
+    sub(r1, 1)
+    bgt(LOOP)
+
+@micropython.asm_thumb
+def complex_array_conj(r0, r1):
+    label(LOOP)
+    vldr(s0, [r0, 4])
+    vneg(s0, s0)
+    vstr(s0, [r0, 4])
+    add(r0, 8)
+    sub(r1, 1)
+    bgt(LOOP)
+
+@micropython.asm_thumb
+def complex_array_abs(r0, r1, r2):
+  # x = abs(z) where x is a float array of length n
+  # r0: address of x (output array)
+  # r1: length of x and z
+  # r2: address of z
+    label(LOOP)
+    vldr(s0, [r2, 0])
+    vldr(s1, [r2, 4])
+    vmul(s0, s0, s0)
+    vmul(s1, s1, s1)
+    vadd(s0, s0, s1)
+    vsqrt(s0, s0)
+    vstr(s0, [r0, 0])
+    add(r0, 4)
+    add(r2, 8)
+    sub(r1, 1)
+    bgt(LOOP)
+
+@micropython.asm_thumb
+def complex_array_abs2(r0, r1, r2):
+  # x = abs(z)**2 = re*re + im*im
+    label(LOOP)
+    vldr(s0, [r2, 0])
+    vldr(s1, [r2, 4])
+    vmul(s0, s0, s0)
+    vmul(s1, s1, s1)
+    vadd(s0, s0, s1)
+    vstr(s0, [r0, 0])
+    add(r0, 4)
+    add(r2, 8)
+    sub(r1, 1)
+    bgt(LOOP)
+
+@micropython.asm_thumb
+def complex_array_phase(r0, r1, r2):
+  # x = atan2(im, re) where x is a float array of length n
+  # r0: address of x (output array)
+  # r1: length of x and z
+  # r2: address of z
+  # Method:
+  # a = min(|re|, |im|)/max(|re|, |im|)
+  # r = atan(a) (polynomial, error < 1e-7, Abramowitz & Stegun 4.4.49)
+  # if |im| > |re|: r = pi/2 - r
+  # if re < 0: r = pi - r
+  # if im < 0: r = -r
+  # The signs are tested with the sign bits, so only s0-s15 are
+  # used (s16-s31 must be preserved for the caller).
+    movwt(r7, 0xBEAAAA6C)
+    vmov(s8, r7)           # a2
+    movwt(r7, 0x3E4CBBE5)
+    vmov(s9, r7)           # a4
+    movwt(r7, 0xBE117FC7)
+    vmov(s10, r7)          # a6
+    movwt(r7, 0x3DDA3D83)
+    vmov(s11, r7)          # a8
+    movwt(r7, 0xBD9A3174)
+    vmov(s12, r7)          # a10
+    movwt(r7, 0x3D2FC1FE)
+    vmov(s13, r7)          # a12
+    movwt(r7, 0xBC846E02)
+    vmov(s14, r7)          # a14
+    movwt(r7, 0x3B3BD74A)
+    vmov(s15, r7)          # a16
+    movwt(r7, 0x3FC90FDB)
+    vmov(s7, r7)           # pi/2
+    movwt(r5, 0x7FFFFFFF)  # abs mask
+
+    label(LOOP)
+    ldr(r3, [r2, 0])       # r3 = re (bits)
+    ldr(r4, [r2, 4])       # r4 = im (bits)
+    mov(r6, r3)
+    and_(r6, r5)
+    vmov(s2, r6)           # s2 = |re|
+    mov(r7, r4)
+    and_(r7, r5)
+    vmov(s3, r7)           # s3 = |im|
+    orr(r6, r7)
+    cmp(r6, 0)
+    bne(NONZERO)
+    str(r6, [r0, 0])       # atan2(0, 0) = 0.0
+    b(NEXT)
+
+    label(NONZERO)
+    mov(r6, 0)
+    vcmp(s3, s2)
+    vmrs(APSR_nzcv, FPSCR)
+    bgt(STEEP)
+    vdiv(s4, s3, s2)       # a = |im|/|re|
+    b(POLY)
+    label(STEEP)
+    vdiv(s4, s2, s3)       # a = |re|/|im|
+    mov(r6, 1)
+
+    label(POLY)
+    vmul(s5, s4, s4)       # z = a*a
+    vmul(s6, s15, s5)
+    vadd(s6, s6, s14)
+    vmul(s6, s6, s5)
+    vadd(s6, s6, s13)
+    vmul(s6, s6, s5)
+    vadd(s6, s6, s12)
+    vmul(s6, s6, s5)
+    vadd(s6, s6, s11)
+    vmul(s6, s6, s5)
+    vadd(s6, s6, s10)
+    vmul(s6, s6, s5)
+    vadd(s6, s6, s9)
+    vmul(s6, s6, s5)
+    vadd(s6, s6, s8)
+    vmul(s6, s6, s5)
+    vmul(s6, s6, s4)
+    vadd(s6, s6, s4)       # r = atan(a)
+
+    cmp(r6, 0)
+    beq(OCTANT)
+    vsub(s6, s7, s6)       # r = pi/2 - r
+    label(OCTANT)
+    cmp(r3, 0)             # sign bit of re
+    bge(HALF)
+    vadd(s5, s7, s7)
+    vsub(s6, s5, s6)       # r = pi - r
+    label(HALF)
+    cmp(r4, 0)             # sign bit of im
+    bge(STORE)
+    vneg(s6, s6)           # r = -r
+    label(STORE)
+    vstr(s6, [r0, 0])
+
+    label(NEXT)
+    add(r0, 4)
+    add(r2, 8)
+    sub(r1, 1)
+    bgt_w(LOOP)
+
+@micropython.asm_thumb
+def complex_array_dot(r0, r1, r2, r3):
+  # c = sum(z*w) where c = array('f', [re, im])
+    mov(r4, 0)
+    vmov(s6, r4)           # s6 = sum of re
+    vmov(s7, r4)           # s7 = sum of im
+    label(LOOP)
+    vldr(s0, [r0, 0])
+    vldr(s1, [r0, 4])
+    vldr(s2, [r2, 0])
+    vldr(s3, [r2, 4])
+    vmul(s4, s0, s2)
+    vmul(s5, s1, s3)
+    vsub(s4, s4, s5)
+    vadd(s6, s6, s4)
+    vmul(s4, s0, s3)
+    vmul(s5, s1, s2)
+    vadd(s4, s4, s5)
+    vadd(s7, s7, s4)
+    add(r0, 8)
+    add(r2, 8)
+    sub(r1, 1)
+    bgt(LOOP)
+    vstr(s6, [r3, 0])
+    vstr(s7, [r3, 4])
+
+@micropython.asm_thumb
+def complex_array_dot_conj(r0, r1, r2, r3):
+  # c = sum(z*conj(w)) where c = array('f', [re, im])
+    mov(r4, 0)
+    vmov(s6, r4)
+    vmov(s7, r4)
+    label(LOOP)
+    vldr(s0, [r0, 0])
+    vldr(s1, [r0, 4])
+    vldr(s2, [r2, 0])
+    vldr(s3, [r2, 4])
+    vmul(s4, s0, s2)
+    vmul(s5, s1, s3)
+    vadd(s4, s4, s5)
+    vadd(s6, s6, s4)
+    vmul(s4, s1, s2)
+    vmul(s5, s0, s3)
+    vsub(s4, s4, s5)
+    vadd(s7, s7, s4)
+    add(r0, 8)
+    add(r2, 8)
+    sub(r1, 1)
+    bgt(LOOP)
+    vstr(s6, [r3, 0])
+    vstr(s7, [r3, 4])
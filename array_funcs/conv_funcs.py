@@ -0,0 +1,26 @@
+'''
+Type conversion functions between arrays of type int and
+arrays of type float.
+'''
+
+@micropython.asm_thumb
+def int_array_from_float_array(r0, r1, r2):
+    label(LOOP)
+    vldr(s1, [r2, 0])
+    vcvt_s32_f32(s0, s1)
+    vstr(s0, [r0, 0])
+    add(r0, 4)
+    add(r2, 4)
+    sub(r1, 1)
+    bgt(LOOP)
+
+@micropython.asm_thumb
+def float_array_from_int_array(r0, r1, r2):
+    label(LOOP)
+    vldr(s1, [r2, 0])
+    vcvt_f32_s32(s0, s1)
+    vstr(s0, [r0, 0])
+    add(r0, 4)
+    add(r2, 4)
+    sub(r1, 1)
+    bgt(LOOP)
@@ -0,0 +1,314 @@
+'''
+Distance functions for nearest-neighbour searches and k-means
+clustering with arrays of type float.
+
+A set of m vectors of length dim (prototypes, points or
+centroids) is stored in one flat array in row-major order, so
+vector j is P[j*dim:(j + 1)*dim].  The distance functions write
+the distance from a query vector q to every row of P into d, an
+array('f') of length m, with
+p = array('L', [addressof(q), dim]).
+
+The cosine distance is 1 - dot(P[j], q)/(|P[j]|*|q|), and 1.0 if
+either vector is zero.
+
+float_array_nsmallest(idx, k, d, m) writes the indices of the k
+smallest values of d into idx in increasing order of distance
+(earlier indices first for equal distances) and returns the
+number of indices written, min(k, m).
+
+float_array_assign_nearest(labels, m, X, p) writes the index of
+the nearest centroid (squared distance) of each of the m points
+in X into labels (array('i')), with
+p = array('L', [addressof(C), kc, dim]) for kc centroids C.
+float_array_centroid_sums(S, m, X, p) adds each point to the row
+of S for its label and counts the points, with
+p = array('L', [addressof(labels), dim, addressof(counts)]).
+
+Example usage:
+>>> import array_funcs as af
+>>> from array import array
+>>> P = array('f', [0.0, 0.0, 3.0, 4.0, 1.0, 1.0])   # 3 x 2
+>>> q = array('f', [1.0, 0.0])
+>>> d = array('f', [0.0]*3)
+>>> af.float_array_sqdist(d, 3, P, array('L', [af.addressof(q), 2]))
+536894992
+>>> d
+array('f', [1.0, 20.0, 1.0])
+>>> idx = array('i', [0]*2)
+>>> af.float_array_nsmallest(idx, 2, d, 3)
+2
+>>> idx
+array('i', [0, 2])
+'''
+
+
+@micropython.asm_thumb
+def float_array_sqdist(r0, r1, r2, r3):
+  # d[j] = sum((P[j] - q)**2)
+  # r0: address of d (array('f') of length m)
+  # r1: m (number of rows of P)
+  # r2: address of P (m x dim in row-major order)
+  # r3: address of p = array('L', [address of q, dim])
+    ldr(r4, [r3, 0])
+    vmov(s10, r4)          # s10 = address of q
+    ldr(r5, [r3, 4])
+    vmov(s11, r5)          # s11 = dim
+    mov(r4, 0)
+    vmov(s15, r4)          # s15 = 0.0
+    label(ROW)
+    vmov(r4, s10)          # r4 = address of q
+    vmov(r5, s11)          # r5 = dim
+    vsub(s0, s15, s15)     # s0 = sum = 0.0
+    label(LOOP)
+    vldr(s1, [r2, 0])
+    vldr(s2, [r4, 0])
+    vsub(s1, s1, s2)
+    vmul(s1, s1, s1)
+    vadd(s0, s0, s1)
+    add(r2, 4)
+    add(r4, 4)
+    sub(r5, 1)
+    bgt(LOOP)
+    vstr(s0, [r0, 0])
+    add(r0, 4)
+    sub(r1, 1)
+    bgt(ROW)
+
+@micropython.asm_thumb
+def float_array_l1dist(r0, r1, r2, r3):
+  # d[j] = sum(abs(P[j] - q))
+    ldr(r4, [r3, 0])
+    vmov(s10, r4)
+    ldr(r5, [r3, 4])
+    vmov(s11, r5)
+    mov(r4, 0)
+    vmov(s15, r4)
+    movwt(r6, 0x7FFFFFFF)  # abs mask
+    label(ROW)
+    vmov(r4, s10)
+    vmov(r5, s11)
+    vsub(s0, s15, s15)
+    label(LOOP)
+    vldr(s1, [r2, 0])
+    vldr(s2, [r4, 0])
+    vsub(s1, s1, s2)
+    vmov(r7, s1)
+    and_(r7, r6)
+    vmov(s1, r7)           # s1 = abs(P[j, i] - q[i])
+    vadd(s0, s0, s1)
+    add(r2, 4)
+    add(r4, 4)
+    sub(r5, 1)
+    bgt(LOOP)
+    vstr(s0, [r0, 0])
+    add(r0, 4)
+    sub(r1, 1)
+    bgt(ROW)
+
+@micropython.asm_thumb
+def float_array_cosdist(r0, r1, r2, r3):
+  # d[j] = 1 - dot(P[j], q)/(|P[j]|*|q|)
+    ldr(r4, [r3, 0])
+    vmov(s10, r4)
+    ldr(r5, [r3, 4])
+    vmov(s11, r5)
+    mov(r6, 0)
+    vmov(s15, r6)          # s15 = 0.0
+    movwt(r6, 0x3F800000)
+    vmov(s9, r6)           # s9 = 1.0
+    vsub(s8, s15, s15)     # s8 = |q|**2
+    label(NORM)
+    vldr(s2, [r4, 0])
+    vmul(s2, s2, s2)
+    vadd(s8, s8, s2)
+    add(r4, 4)
+    sub(r5, 1)
+    bgt(NORM)
+
+    label(ROW)
+    vmov(r4, s10)
+    vmov(r5, s11)
+    vsub(s0, s15, s15)     # s0 = dot(P[j], q)
+    vsub(s1, s15, s15)     # s1 = |P[j]|**2
+    label(LOOP)
+    vldr(s2, [r2, 0])
+    vldr(s3, [r4, 0])
+    vmul(s4, s2, s3)
+    vadd(s0, s0, s4)
+    vmul(s4, s2, s2)
+    vadd(s1, s1, s4)
+    add(r2, 4)
+    add(r4, 4)
+    sub(r5, 1)
+    bgt(LOOP)
+    vmul(s1, s1, s8)
+    vsqrt(s1, s1)
+    vcmp(s1, s15)
+    vmrs(APSR_nzcv, FPSCR)
+    bne(NONZERO)
+    vstr(s9, [r0, 0])      # a zero vector: d = 1.0
+    b(NEXT)
+    label(NONZERO)
+    vdiv(s0, s0, s1)
+    vsub(s0, s9, s0)
+    vstr(s0, [r0, 0])
+    label(NEXT)
+    add(r0, 4)
+    sub(r1, 1)
+    bgt(ROW)
+
+@micropython.asm_thumb
+def float_array_nsmallest(r0, r1, r2, r3):
+  # idx = indices of the k smallest values of d, in order
+  # r0: address of idx (array('i') of length k)
+  # r1: k
+  # r2: address of d
+  # r3: m (length of d)
+  # Returns min(k, m) (0 if k <= 0 or m <= 0)
+  # Insertion into the sorted list idx, so O(m*k) in the worst
+  # case but close to O(m) when k is small.
+    mov(r4, 0)             # r4 = j
+    mov(r5, 0)             # r5 = number of indices in idx
+    cmp(r1, 0)
+    ble(END)               # k <= 0
+    cmp(r3, 0)
+    ble(END)               # m <= 0
+    label(LOOP)
+    mov(r7, r4)
+    lsl(r7, r7, 2)
+    add(r7, r7, r2)
+    vldr(s0, [r7, 0])      # s0 = d[j]
+    mov(r6, r5)
+    lsl(r6, r6, 2)
+    add(r6, r6, r0)        # r6 = address of idx[count]
+    cmp(r5, r1)
+    blt(ROOM)
+    sub(r6, 4)             # full: replace idx[k - 1] if d[j] is smaller
+    ldr(r7, [r6, 0])
+    lsl(r7, r7, 2)
+    add(r7, r7, r2)
+    vldr(s1, [r7, 0])
+    vcmp(s0, s1)
+    vmrs(APSR_nzcv, FPSCR)
+    bpl(NEXT)              # d[j] >= d[idx[k - 1]] (or NaN)
+    b(SHIFT)
+    label(ROOM)
+    add(r5, 1)
+
+    label(SHIFT)           # r6 = address of idx[t]
+    cmp(r6, r0)
+    beq(STORE)
+    sub(r6, 4)
+    ldr(r7, [r6, 0])
+    lsl(r7, r7, 2)
+    add(r7, r7, r2)
+    vldr(s1, [r7, 0])      # s1 = d[idx[t - 1]]
+    vcmp(s1, s0)
+    vmrs(APSR_nzcv, FPSCR)
+    ble(BACK)
+    ldr(r7, [r6, 0])
+    str(r7, [r6, 4])       # idx[t] = idx[t - 1]
+    b(SHIFT)
+    label(BACK)
+    add(r6, 4)
+    label(STORE)
+    str(r4, [r6, 0])
+    label(NEXT)
+    add(r4, 1)
+    sub(r3, 1)
+    bgt(LOOP)
+    label(END)
+    mov(r0, r5)
+
+@micropython.asm_thumb
+def float_array_assign_nearest(r0, r1, r2, r3):
+  # labels[i] = index of the centroid nearest to X[i]
+  # r0: address of labels (array('i') of length m)
+  # r1: m (number of points)
+  # r2: address of X (m x dim in row-major order)
+  # r3: address of p = array('L', [address of C, kc, dim])
+    ldr(r4, [r3, 0])
+    vmov(s10, r4)          # s10 = address of C
+    ldr(r4, [r3, 4])
+    vmov(s11, r4)          # s11 = kc
+    ldr(r4, [r3, 8])
+    vmov(s12, r4)          # s12 = dim
+    mov(r4, 0)
+    vmov(s15, r4)
+    label(POINT)
+    vmov(r6, s10)          # r6 = address of C[c]
+    mov(r4, 0)             # r4 = c
+    mov(r5, 0)             # r5 = nearest c
+    label(CENTROID)
+    mov(r3, r2)            # r3 = address of X[i]
+    vmov(r7, s12)
+    vsub(s0, s15, s15)
+    label(LOOP)
+    vldr(s1, [r3, 0])
+    vldr(s2, [r6, 0])
+    vsub(s1, s1, s2)
+    vmul(s1, s1, s1)
+    vadd(s0, s0, s1)
+    add(r3, 4)
+    add(r6, 4)
+    sub(r7, 1)
+    bgt(LOOP)
+    cmp(r4, 0)
+    beq(NEAREST)
+    vcmp(s0, s5)
+    vmrs(APSR_nzcv, FPSCR)
+    bpl(NOT_NEAREST)       # s0 >= nearest distance (or NaN)
+    label(NEAREST)
+    mov(r5, r4)
+    vmov(r7, s0)
+    vmov(s5, r7)           # s5 = nearest distance
+    label(NOT_NEAREST)
+    add(r4, 1)
+    vmov(r7, s11)
+    cmp(r4, r7)
+    blt(CENTROID)
+    str(r5, [r0, 0])
+    add(r0, 4)
+    mov(r2, r3)            # r2 = address of X[i + 1]
+    sub(r1, 1)
+    bgt(POINT)
+
+@micropython.asm_thumb
+def float_array_centroid_sums(r0, r1, r2, r3):
+  # S[labels[i]] += X[i], counts[labels[i]] += 1
+  # r0: address of S (kc x dim in row-major order)
+  # r1: m (number of points)
+  # r2: address of X (m x dim in row-major order)
+  # r3: address of p = array('L', [address of labels, dim,
+  #                                address of counts])
+    ldr(r4, [r3, 0])       # r4 = address of labels[i]
+    ldr(r5, [r3, 4])
+    vmov(s11, r5)          # s11 = dim
+    ldr(r5, [r3, 8])
+    vmov(s12, r5)          # s12 = address of counts
+    label(POINT)
+    ldr(r5, [r4, 0])       # r5 = c = labels[i]
+    vmov(r7, s11)
+    mov(r6, r7)
+    mul(r6, r5)
+    lsl(r6, r6, 2)
+    add(r6, r6, r0)        # r6 = address of S[c]
+    vmov(r3, s12)
+    lsl(r5, r5, 2)
+    add(r3, r3, r5)
+    ldr(r5, [r3, 0])
+    add(r5, 1)
+    str(r5, [r3, 0])       # counts[c] += 1
+    label(LOOP)
+    vldr(s0, [r6, 0])
+    vldr(s1, [r2, 0])
+    vadd(s0, s0, s1)
+    vstr(s0, [r6, 0])
+    add(r2, 4)
+    add(r6, 4)
+    sub(r7, 1)
+    bgt(LOOP)
+    add(r4, 4)
+    sub(r1, 1)
+    bgt(POINT)
@@ -0,0 +1,373 @@
+'''
+Event detection functions for arrays of type int and float.
+
+These functions scan an array once and write the indices of the
+events into an array of type int, idx, which must be long enough
+for all the events (n in the worst case).  They return the number
+of events found.
+
+Threshold crossings use hysteresis: after a rising crossing
+(x > upper) the signal must go below lower before the next rising
+crossing is detected, and vice versa for falling crossings (x <
+lower, re-armed by x > upper).  The parameters are
+p = array('f', [upper, lower, state]) (array('i') for int arrays)
+where state is 0 when the signal is low and 1 (1.0) when it is
+high.  The state is updated so that consecutive blocks can be
+scanned without missing or repeating a crossing.  NaN samples
+are neither above upper nor below lower, so they do not change
+the state.
+
+Zero crossings are the indices i where x[i - 1] and x[i] have
+different signs (the sign bits are compared, so 0 counts as
+positive).  Peaks are local maxima, x[i - 1] < x[i] >= x[i + 1],
+with x[i] >= height; when two peaks are closer than distance
+samples only the higher one is kept.  The parameters are
+p = array('f', [height, distance]) (array('i') for int arrays).
+Zero crossings and peaks need the previous (and next) sample, so
+overlap consecutive blocks by one (two) samples.
+
+Example usage:
+>>> import array_funcs as af
+>>> from array import array
+>>> x = array('f', [0.0, 0.6, 1.2, 0.8, 0.2, 1.1, 0.9, -0.3, 1.5])
+>>> idx = array('i', [0]*len(x))
+>>> p = array('f', [1.0, 0.5, 0.0])
+>>> af.float_array_rising_crossings(idx, len(x), x, p)
+3
+>>> idx[:3]
+array('i', [2, 5, 8])
+>>> p[2]
+1.0
+'''
+
+
+@micropython.asm_thumb
+def float_array_rising_crossings(r0, r1, r2, r3):
+  # idx = indices where x rises above upper (with hysteresis)
+  # r0: address of idx (array('i'))
+  # r1: length of x
+  # r2: address of x
+  # r3: address of p = array('f', [upper, lower, state])
+  # Returns the number of crossings
+    vldr(s10, [r3, 0])     # upper
+    vldr(s11, [r3, 4])     # lower
+    vmov(s12, r3)          # address of p
+    mov(r6, r0)            # r6 = address of idx
+    mov(r4, 0)             # r4 = i
+    ldr(r7, [r3, 8])
+    cmp(r7, 0)
+    bne(HIGH)
+
+    label(LOW)             # wait for x > upper
+    vldr(s0, [r2, 0])
+    vcmp(s0, s10)
+    vmrs(APSR_nzcv, FPSCR)
+    bgt(RISE)
+    label(NEXT_LOW)
+    add(r2, 4)
+    add(r4, 1)
+    sub(r1, 1)
+    bgt(LOW)
+    mov(r7, 0)             # state = 0.0
+    b(END)
+    label(RISE)
+    str(r4, [r0, 0])
+    add(r0, 4)
+    b(NEXT_HIGH)
+
+    label(HIGH)            # wait for x < lower
+    vldr(s0, [r2, 0])
+    vcmp(s0, s11)
+    vmrs(APSR_nzcv, FPSCR)
+    bmi(NEXT_LOW)          # re-armed (lt would include NaN)
+    label(NEXT_HIGH)
+    add(r2, 4)
+    add(r4, 1)
+    sub(r1, 1)
+    bgt(HIGH)
+    movwt(r7, 0x3F800000)  # state = 1.0
+
+    label(END)
+    vmov(r3, s12)
+    str(r7, [r3, 8])
+    sub(r0, r0, r6)
+    asr(r0, r0, 2)
+
+@micropython.asm_thumb
+def float_array_falling_crossings(r0, r1, r2, r3):
+  # idx = indices where x falls below lower (with hysteresis)
+    vldr(s10, [r3, 0])     # upper
+    vldr(s11, [r3, 4])     # lower
+    vmov(s12, r3)
+    mov(r6, r0)
+    mov(r4, 0)
+    ldr(r7, [r3, 8])
+    cmp(r7, 0)
+    bne(HIGH)
+
+    label(LOW)             # wait for x > upper
+    vldr(s0, [r2, 0])
+    vcmp(s0, s10)
+    vmrs(APSR_nzcv, FPSCR)
+    bgt(NEXT_HIGH)         # re-armed
+    label(NEXT_LOW)
+    add(r2, 4)
+    add(r4, 1)
+    sub(r1, 1)
+    bgt(LOW)
+    mov(r7, 0)
+    b(END)
+
+    label(HIGH)            # wait for x < lower
+    vldr(s0, [r2, 0])
+    vcmp(s0, s11)
+    vmrs(APSR_nzcv, FPSCR)
+    bmi(FALL)              # x < lower (lt would include NaN)
+    label(NEXT_HIGH)
+    add(r2, 4)
+    add(r4, 1)
+    sub(r1, 1)
+    bgt(HIGH)
+    movwt(r7, 0x3F800000)
+    b(END)
+    label(FALL)
+    str(r4, [r0, 0])
+    add(r0, 4)
+    b(NEXT_LOW)
+
+    label(END)
+    vmov(r3, s12)
+    str(r7, [r3, 8])
+    sub(r0, r0, r6)
+    asr(r0, r0, 2)
+
+@micropython.asm_thumb
+def int_array_rising_crossings(r0, r1, r2, r3):
+  # idx = indices where a rises above upper (with hysteresis)
+  # r3: address of p = array('i', [upper, lower, state])
+    vmov(s12, r3)          # address of p
+    ldr(r5, [r3, 4])       # r5 = lower
+    ldr(r7, [r3, 8])       # r7 = state
+    ldr(r3, [r3, 0])       # r3 = upper
+    mov(r6, r0)
+    mov(r4, 0)
+    cmp(r7, 0)
+    bne(HIGH)
+
+    label(LOW)
+    ldr(r7, [r2, 0])
+    cmp(r7, r3)
+    bgt(RISE)
+    label(NEXT_LOW)
+    add(r2, 4)
+    add(r4, 1)
+    sub(r1, 1)
+    bgt(LOW)
+    mov(r7, 0)
+    b(END)
+    label(RISE)
+    str(r4, [r0, 0])
+    add(r0, 4)
+    b(NEXT_HIGH)
+
+    label(HIGH)
+    ldr(r7, [r2, 0])
+    cmp(r7, r5)
+    blt(NEXT_LOW)
+    label(NEXT_HIGH)
+    add(r2, 4)
+    add(r4, 1)
+    sub(r1, 1)
+    bgt(HIGH)
+    mov(r7, 1)
+
+    label(END)
+    vmov(r3, s12)
+    str(r7, [r3, 8])
+    sub(r0, r0, r6)
+    asr(r0, r0, 2)
+
+@micropython.asm_thumb
+def int_array_falling_crossings(r0, r1, r2, r3):
+  # idx = indices where a falls below lower (with hysteresis)
+    vmov(s12, r3)
+    ldr(r5, [r3, 4])
+    ldr(r7, [r3, 8])
+    ldr(r3, [r3, 0])
+    mov(r6, r0)
+    mov(r4, 0)
+    cmp(r7, 0)
+    bne(HIGH)
+
+    label(LOW)
+    ldr(r7, [r2, 0])
+    cmp(r7, r3)
+    bgt(NEXT_HIGH)         # re-armed
+    label(NEXT_LOW)
+    add(r2, 4)
+    add(r4, 1)
+    sub(r1, 1)
+    bgt(LOW)
+    mov(r7, 0)
+    b(END)
+
+    label(HIGH)
+    ldr(r7, [r2, 0])
+    cmp(r7, r5)
+    blt(FALL)
+    label(NEXT_HIGH)
+    add(r2, 4)
+    add(r4, 1)
+    sub(r1, 1)
+    bgt(HIGH)
+    mov(r7, 1)
+    b(END)
+    label(FALL)
+    str(r4, [r0, 0])
+    add(r0, 4)
+    b(NEXT_LOW)
+
+    label(END)
+    vmov(r3, s12)
+    str(r7, [r3, 8])
+    sub(r0, r0, r6)
+    asr(r0, r0, 2)
+
+@micropython.asm_thumb
+def float_array_zero_crossings(r0, r1, r2):
+  # idx = indices i where x[i - 1] and x[i] have different signs
+  # r0: address of idx (array('i'))
+  # r1: length of x
+  # r2: address of x (array('f') or array('i'))
+  # Only the sign bits are compared so the same code works for
+  # int and float arrays.
+    mov(r6, r0)
+    mov(r4, 1)             # r4 = i
+    ldr(r3, [r2, 0])       # r3 = x[i - 1]
+    sub(r1, 1)
+    ble(END)
+    label(LOOP)
+    add(r2, 4)
+    ldr(r5, [r2, 0])       # r5 = x[i]
+    mov(r7, r3)
+    eor(r7, r5)
+    cmp(r7, 0)
+    bge(SAME)              # same sign bit
+    str(r4, [r0, 0])
+    add(r0, 4)
+    label(SAME)
+    mov(r3, r5)
+    add(r4, 1)
+    sub(r1, 1)
+    bgt(LOOP)
+    label(END)
+    sub(r0, r0, r6)
+    asr(r0, r0, 2)
+
+int_array_zero_crossings = float_array_zero_crossings
+
+@micropython.asm_thumb
+def float_array_find_peaks(r0, r1, r2, r3):
+  # idx = indices of peaks with x >= height at least distance apart
+  # r0: address of idx (array('i'))
+  # r1: length of x
+  # r2: address of x
+  # r3: address of p = array('f', [height, distance])
+    vldr(s10, [r3, 0])     # s10 = height
+    vldr(s1, [r3, 4])
+    vcvt_s32_f32(s1, s1)
+    vmov(r6, s1)           # r6 = distance
+    vmov(s11, r0)          # s11 = address of idx
+    mov(r5, 0)
+    sub(r5, r5, r6)        # r5 = index of last peak = -distance
+    mov(r4, 1)             # r4 = i
+    sub(r1, 2)
+    ble(END)
+    label(LOOP)            # r2 = address of x[i - 1]
+    vldr(s0, [r2, 0])
+    vldr(s1, [r2, 4])
+    vldr(s2, [r2, 8])
+    vcmp(s1, s0)
+    vmrs(APSR_nzcv, FPSCR)
+    ble(NEXT)              # x[i] <= x[i - 1]
+    vcmp(s1, s2)
+    vmrs(APSR_nzcv, FPSCR)
+    blt(NEXT)              # x[i] < x[i + 1]
+    vcmp(s1, s10)
+    vmrs(APSR_nzcv, FPSCR)
+    blt(NEXT)              # x[i] < height
+    sub(r7, r4, r5)
+    cmp(r7, r6)
+    bge(ADD)
+    # Too close to the last peak: keep the higher one
+    sub(r7, r5, r4)
+    add(r7, 1)
+    lsl(r7, r7, 2)
+    add(r7, r7, r2)        # r7 = address of x[last]
+    vldr(s3, [r7, 0])
+    vcmp(s1, s3)
+    vmrs(APSR_nzcv, FPSCR)
+    ble(NEXT)
+    sub(r0, 4)             # replace the last peak
+    label(ADD)
+    str(r4, [r0, 0])
+    add(r0, 4)
+    mov(r5, r4)
+    label(NEXT)
+    add(r2, 4)
+    add(r4, 1)
+    sub(r1, 1)
+    bgt(LOOP)
+    label(END)
+    vmov(r1, s11)
+    sub(r0, r0, r1)
+    asr(r0, r0, 2)
+
+@micropython.asm_thumb
+def int_array_find_peaks(r0, r1, r2, r3):
+  # idx = indices of peaks with a >= height at least distance apart
+  # r3: address of p = array('i', [height, distance])
+    ldr(r7, [r3, 0])
+    vmov(s10, r7)          # s10 = height
+    ldr(r6, [r3, 4])       # r6 = distance
+    vmov(s11, r0)
+    mov(r5, 0)
+    sub(r5, r5, r6)
+    mov(r4, 1)
+    sub(r1, 2)
+    ble(END)
+    label(LOOP)
+    ldr(r3, [r2, 4])       # r3 = a[i]
+    ldr(r7, [r2, 0])
+    cmp(r3, r7)
+    ble(NEXT)
+    ldr(r7, [r2, 8])
+    cmp(r3, r7)
+    blt(NEXT)
+    vmov(r7, s10)
+    cmp(r3, r7)
+    blt(NEXT)
+    sub(r7, r4, r5)
+    cmp(r7, r6)
+    bge(ADD)
+    sub(r7, r5, r4)
+    add(r7, 1)
+    lsl(r7, r7, 2)
+    add(r7, r7, r2)
+    ldr(r7, [r7, 0])       # r7 = a[last]
+    cmp(r3, r7)
+    ble(NEXT)
+    sub(r0, 4)
+    label(ADD)
+    str(r4, [r0, 0])
+    add(r0, 4)
+    mov(r5, r4)
+    label(NEXT)
+    add(r2, 4)
+    add(r4, 1)
+    sub(r1, 1)
+    bgt(LOOP)
+    label(END)
+    vmov(r1, s11)
+    sub(r0, r0, r1)
+    asr(r0, r0, 2)
@@ -0,0 +1,756 @@
+'''
+NumPy implementations of the array functions for running the
+same code on a computer (CPython) instead of a MicroPython
+board, e.g. to process recorded sensor data.
+
+Every function takes the same arguments as the assembler
+version and works in place on the array's own memory: arrays
+(array('i'), array('f'), memoryview slices, bytearrays or NumPy
+arrays) are wrapped as NumPy views with no copying.  Use
+typecode 'i' for ints ('l' is 64-bit on most computers) and 'f'
+for floats.
+
+The results are calculated in 32-bit arithmetic in the same
+order as on the board so they match the board's results:
+integer operations wrap around, integer division rounds towards
+zero and returns 0 when dividing by zero, float sums are
+accumulated sequentially in single precision, float to int
+conversion truncates and saturates, and float_array_exp and
+float_array_pow_int use the same algorithms as the assembler
+versions.  NaN inputs to the max and min functions are the only
+known difference.
+
+The random number functions produce the same streams as the
+board but are not vectorized (xorshift32 is sequential).
+
+This module is imported by the array_funcs package when the
+micropython module is not available.  It requires NumPy.
+'''
+
+import ctypes
+import math
+import numpy as np
+
+_i32 = np.int32
+_f32 = np.float32
+
+
+def addressof(obj):
+    # Equivalent of uctypes.addressof for writable buffers
+    return ctypes.addressof(ctypes.c_char.from_buffer(obj))
+
+
+def _ints(a, n):
+    return np.frombuffer(a, dtype=np.int32, count=n)
+
+
+def _floats(x, n):
+    return np.frombuffer(x, dtype=np.float32, count=n)
+
+
+def _int_scalar(k):
+    # Registers are 32 bits wide
+    return _i32((int(k) + 0x80000000) % 0x100000000 - 0x80000000)
+
+
+def _float_scalar(v):
+    # Float scalars are passed as array('f', [v])
+    if isinstance(v, (int, float)):
+        return _f32(v)
+    return _floats(v, 1)[0]
+
+
+def _sdiv(a, b):
+    # ARM sdiv: rounds towards zero, x/0 == 0
+    a = a.astype(np.int64)
+    b = np.asarray(b, dtype=np.int64)
+    zero = b == 0
+    q = np.abs(a)//np.where(zero, 1, np.abs(b))
+    q = np.where((a < 0) != (b < 0), -q, q)
+    return np.where(zero, 0, q).astype(np.int32)
+
+
+# ---------- 1. Functions for arrays of type int ----------
+
+def int_array_assign_scalar(a, n, k):
+    _ints(a, n)[:] = _int_scalar(k)
+
+def int_array_add_scalar(a, n, k):
+    a = _ints(a, n)
+    np.add(a, _int_scalar(k), out=a)
+
+def int_array_sub_scalar(a, n, k):
+    a = _ints(a, n)
+    np.subtract(a, _int_scalar(k), out=a)
+
+def int_array_neg(a, n):
+    a = _ints(a, n)
+    np.negative(a, out=a)
+
+def int_array_abs(a, n):
+    a = _ints(a, n)
+    np.abs(a, out=a)
+
+def int_array_div_scalar(a, n, k):
+    a = _ints(a, n)
+    a[:] = _sdiv(a, _int_scalar(k))
+
+def int_array_mul_scalar(a, n, k):
+    a = _ints(a, n)
+    np.multiply(a, _int_scalar(k), out=a)
+
+def int_array_add_array(a, n, b):
+    a = _ints(a, n)
+    np.add(a, _ints(b, n), out=a)
+
+def int_array_sub_array(a, n, b):
+    a = _ints(a, n)
+    np.subtract(a, _ints(b, n), out=a)
+
+def int_array_div_array(a, n, b):
+    a = _ints(a, n)
+    a[:] = _sdiv(a, _ints(b, n))
+
+def int_array_mul_array(a, n, b):
+    a = _ints(a, n)
+    np.multiply(a, _ints(b, n), out=a)
+
+def int_array_cmp_array(a, n, b):
+    a = _ints(a, n)
+    a[:] = a == _ints(b, n)
+
+def int_array_copy(a, n, b):
+    _ints(a, n)[:] = _ints(b, n)
+
+def int_array_square(a, n):
+    a = _ints(a, n)
+    np.multiply(a, a, out=a)
+
+def int_array_sum(a, n):
+    return int(np.sum(_ints(a, n), dtype=np.int32))
+
+def int_array_max(a, n):
+    return int(_ints(a, n).max())
+
+def int_array_min(a, n):
+    return int(_ints(a, n).min())
+
+
+# --------- 2. Functions for arrays of type float ---------
+
+def float_array_assign_scalar(x, n, v):
+    _floats(x, n)[:] = _float_scalar(v)
+
+def float_array_add_scalar(x, n, v):
+    x = _floats(x, n)
+    np.add(x, _float_scalar(v), out=x)
+
+def float_array_sub_scalar(x, n, v):
+    x = _floats(x, n)
+    np.subtract(x, _float_scalar(v), out=x)
+
+def float_array_neg(x, n):
+    x = _floats(x, n)
+    np.negative(x, out=x)
+
+def float_array_abs(x, n):
+    # Clears the sign bit, like the assembler version
+    np.bitwise_and(_ints(x, n), 0x7FFFFFFF, out=_ints(x, n))
+
+def float_array_mul_scalar(x, n, v):
+    x = _floats(x, n)
+    np.multiply(x, _float_scalar(v), out=x)
+
+def float_array_div_scalar(x, n, v):
+    x = _floats(x, n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.divide(x, _float_scalar(v), out=x)
+
+def float_array_add_array(x, n, y):
+    x = _floats(x, n)
+    np.add(x, _floats(y, n), out=x)
+
+def float_array_sub_array(x, n, y):
+    x = _floats(x, n)
+    np.subtract(x, _floats(y, n), out=x)
+
+def float_array_div_array(x, n, y):
+    x = _floats(x, n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.divide(x, _floats(y, n), out=x)
+
+def float_array_mul_array(x, n, y):
+    x = _floats(x, n)
+    np.multiply(x, _floats(y, n), out=x)
+
+def float_array_div_int_array(x, n, a):
+    x = _floats(x, n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.divide(x, _ints(a, n).astype(np.float32), out=x)
+
+def float_array_mul_int_array(x, n, a):
+    x = _floats(x, n)
+    np.multiply(x, _ints(a, n).astype(np.float32), out=x)
+
+def float_array_add_scaled_array(x, n, y, v):
+    x = _floats(x, n)
+    np.add(x, _floats(y, n)*_float_scalar(v), out=x)
+
+def float_array_copy(x, n, y):
+    _floats(x, n)[:] = _floats(y, n)
+
+def float_array_cmp_array(x, n, y):
+    x = _floats(x, n)
+    x[:] = x == _floats(y, n)
+
+def float_array_square(x, n):
+    x = _floats(x, n)
+    np.multiply(x, x, out=x)
+
+def float_array_sqrt(x, n):
+    x = _floats(x, n)
+    with np.errstate(invalid='ignore'):
+        np.sqrt(x, out=x)
+
+def float_array_sum(x, n, v):
+    # np.sum uses pairwise summation so accumulate in order
+    _floats(v, 1)[0] = np.add.accumulate(_floats(x, n),
+                                         dtype=np.float32)[-1]
+
+def float_array_max(x, n, v):
+    _floats(v, 1)[0] = _floats(x, n).max()
+
+def float_array_min(x, n, v):
+    _floats(v, 1)[0] = _floats(x, n).min()
+
+def float_array_dot(x, n, y, v):
+    _floats(v, 1)[0] = np.add.accumulate(_floats(x, n)*_floats(y, n),
+                                         dtype=np.float32)[-1]
+
+
+# ---------- 3. Type conversion functions ----------
+
+def int_array_from_float_array(a, n, x):
+    # vcvt.s32.f32: rounds towards zero, saturates, NaN -> 0
+    x = np.nan_to_num(_floats(x, n).astype(np.float64), nan=0.0,
+                      posinf=2**31 - 1, neginf=-2**31)
+    _ints(a, n)[:] = np.clip(np.trunc(x), -2**31, 2**31 - 1)
+
+def float_array_from_int_array(x, n, a):
+    _floats(x, n)[:] = _ints(a, n)
+
+
+# ---------- 4. Other math functions ----------
+
+def float_array_pow_int(y, n, x, k):
+    y = _floats(y, n)
+    x = _floats(x, n).copy()
+    if k == 1:
+        y[:] = x
+        return
+    f = np.ones(n, dtype=np.float32)
+    if k < 0:
+        with np.errstate(divide='ignore'):
+            x = _f32(1.0)/x
+        k = -k
+    with np.errstate(over='ignore', invalid='ignore'):
+        while k > 0:
+            if k & 1:
+                f *= x
+            x *= x
+            k >>= 1
+    y[:] = f
+
+def float_array_exp(y, n, x):
+    y = _floats(y, n)
+    x = _floats(x, n).copy()
+    neg = np.signbit(x)
+    x[neg] = _f32(0.0) - x[neg]
+    s = x*_f32(2.8) + _f32(8.0)
+    # Number of terms, int(2.8*x + 8.0).  Beyond 1024 terms
+    # (x > 362) the result is inf on the board as well.
+    with np.errstate(invalid='ignore'):
+        terms = np.nan_to_num(s, nan=0.0, posinf=1024.0)
+    terms = np.clip(np.trunc(terms), 1, 1024).astype(np.int32)
+    f = np.ones(n, dtype=np.float32)
+    i = terms.astype(np.float32)
+    with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+        for step in range(int(terms.max()) if n else 0):
+            active = step < terms
+            f = np.where(active, (f*x)/i + _f32(1.0), f)
+            i = np.where(active, i - _f32(1.0), i)
+        f[neg] = _f32(1.0)/f[neg]
+    y[:] = f
+
+def float_array_pow_float(x, n, v):
+    x = _floats(x, n)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        np.power(x, _float_scalar(v), out=x)
+
+
+# ---------- 5. Random number functions ----------
+
+def _xorshift(state, count):
+    # Returns the next count outputs as uint32 and the new state
+    s = int(state)
+    out = np.empty(count, dtype=np.uint32)
+    for i in range(count):
+        s ^= (s << 13) & 0xFFFFFFFF
+        s ^= s >> 17
+        s ^= (s << 5) & 0xFFFFFFFF
+        out[i] = s
+    return out, s
+
+
+def _unit(bits):
+    # 0.0 <= f < 1.0 from the top 23 bits
+    f = ((bits >> 9) | 0x3F800000).astype(np.uint32).view(np.float32)
+    return f - _f32(1.0)
+
+
+def _log(s):
+    # Same polynomial approximation as float_array_random_normal
+    bits = s.view(np.uint32)
+    e = ((bits >> 23).astype(np.int32) - 127).astype(np.float32)
+    m = ((bits & 0x007FFFFF) | 0x3F800000).astype(np.uint32)
+    m = m.view(np.float32)
+    t = (m - _f32(1.0))/(m + _f32(1.0))
+    t2 = t*t
+    p = _f32(1/11)*t2
+    for c in (1/9, 1/7, 1/5, 1/3):
+        p = (p + _f32(c))*t2
+    p = (p + _f32(1.0))*t*_f32(2.0)
+    return p + e*_f32(math.log(2))
+
+
+def _states(s):
+    return np.frombuffer(s, dtype=np.uint32, count=1)
+
+def int_array_random(a, n, s):
+    state = _states(s)
+    bits, state[0] = _xorshift(state[0], n)
+    _ints(a, n)[:] = bits.view(np.int32)
+
+def int_array_random_range(a, n, s, m):
+    state = _states(s)
+    bits, state[0] = _xorshift(state[0], n)
+    _ints(a, n)[:] = bits % np.uint32(m)
+
+def float_array_random(x, n, s):
+    state = _states(s)
+    bits, state[0] = _xorshift(state[0], n)
+    _floats(x, n)[:] = _unit(bits)
+
+def float_array_random_uniform(x, n, s, p):
+    state = _states(s)
+    lo, hi = _floats(p, 2)
+    bits, state[0] = _xorshift(state[0], n)
+    _floats(x, n)[:] = _unit(bits)*(hi - lo) + lo
+
+def float_array_random_normal(x, n, s, p):
+    state = _states(s)
+    mean, std = _floats(p, 2)
+    pairs = (n + 1)//2
+    out = []
+    st = int(state[0])
+    while pairs > 0:
+        tries = pairs + pairs//2 + 4
+        bits, st_end = _xorshift(st, 2*tries)
+        u = _unit(bits[0::2])*_f32(2.0) - _f32(1.0)
+        v = _unit(bits[1::2])*_f32(2.0) - _f32(1.0)
+        r = u*u + v*v
+        ok = np.flatnonzero((r < _f32(1.0)) & (r != _f32(0.0)))[:pairs]
+        if len(ok) == pairs:
+            # Rewind the state to just after the last pair used
+            st_end = int(bits[2*ok[-1] + 1])
+        st = st_end
+        u, v, r = u[ok], v[ok], r[ok]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            f = np.sqrt(-(_log(r)*_f32(2.0)/r))
+        out.append(np.column_stack((u*f*std + mean,
+                                    v*f*std + mean)).ravel())
+        pairs -= len(ok)
+    state[0] = st
+    _floats(x, n)[:] = np.concatenate(out)[:n]
+
+
+# ---------- 6. Functions for complex arrays ----------
+
+def _complex(z, n):
+    # Real and imaginary parts of an interleaved array as views
+    z = _floats(z, 2*n)
+    return z[0::2], z[1::2]
+
+def complex_array_add_array(z, n, w):
+    a, b = _complex(z, n)
+    c, d = _complex(w, n)
+    a += c
+    b += d
+
+def complex_array_mul_array(z, n, w):
+    a, b = _complex(z, n)
+    c, d = _complex(w, n)
+    re = a*c - b*d
+    b[:] = a*d + b*c
+    a[:] = re
+
+def complex_array_mul_conj_array(z, n, w):
+    a, b = _complex(z, n)
+    c, d = _complex(w, n)
+    re = a*c + b*d
+    b[:] = b*c - a*d
+    a[:] = re
+
+def complex_array_mul_scalar(z, n, v):
+    a, b = _complex(z, n)
+    c, d = _floats(v, 2)
+    re = a*c - b*d
+    b[:] = a*d + b*c
+    a[:] = re
+
+def complex_array_conj(z, n):
+    a, b = _complex(z, n)
+    np.negative(b, out=b)
+
+def complex_array_abs(x, n, z):
+    a, b = _complex(z, n)
+    with np.errstate(over='ignore'):
+        _floats(x, n)[:] = np.sqrt(a*a + b*b)
+
+def complex_array_abs2(x, n, z):
+    a, b = _complex(z, n)
+    with np.errstate(over='ignore'):
+        _floats(x, n)[:] = a*a + b*b
+
+_ATAN = tuple(_f32(c) for c in (
+    -0.3333314528, 0.1999355085, -0.1420889944, 0.1065626393,
+    -0.0752896400, 0.0429096138, -0.0161657367, 0.0028662257))
+
+def complex_array_phase(x, n, z):
+    # Same polynomial approximation as the assembler version
+    re, im = _complex(z, n)
+    ar, ai = np.abs(re), np.abs(im)
+    steep = ai > ar
+    with np.errstate(divide='ignore', invalid='ignore'):
+        a = np.where(steep, ar/ai, ai/ar)
+    z2 = a*a
+    p = _ATAN[7]*z2
+    for c in _ATAN[6::-1]:
+        p = (p + c)*z2
+    r = p*a + a
+    r = np.where(steep, _f32(math.pi/2) - r, r)
+    # The signs are tested with the sign bits, like the assembler
+    r = np.where(np.signbit(re), _f32(math.pi) - r, r)
+    r = np.where(np.signbit(im), -r, r)
+    _floats(x, n)[:] = np.where((ar == 0) & (ai == 0), _f32(0.0), r)
+
+def complex_array_dot(z, n, w, v):
+    a, b = _complex(z, n)
+    c, d = _complex(w, n)
+    out = _floats(v, 2)
+    out[0] = np.add.accumulate(a*c - b*d, dtype=np.float32)[-1]
+    out[1] = np.add.accumulate(a*d + b*c, dtype=np.float32)[-1]
+
+def complex_array_dot_conj(z, n, w, v):
+    a, b = _complex(z, n)
+    c, d = _complex(w, n)
+    out = _floats(v, 2)
+    out[0] = np.add.accumulate(a*c + b*d, dtype=np.float32)[-1]
+    out[1] = np.add.accumulate(b*c - a*d, dtype=np.float32)[-1]
+
+
+# ---------- 7. Dispatcher for programs ----------
+
+def _buffer(address, size):
+    return (ctypes.c_char*size).from_address(address)
+
+def opqueue_run(cmds, count):
+    # Decodes the commands and calls the functions above.  cmds
+    # is read by item since array('L') is 64-bit on most computers
+    from .program import OPS, CMD_SIZE
+    for i in range(0, CMD_SIZE*count, CMD_SIZE):
+        op, a, n = cmds[i], cmds[i + 1], cmds[i + 2]
+        if op >= len(OPS):
+            continue
+        name, types = OPS[op]
+        args = []
+        for j in range(len(types)):
+            w = cmds[i + 3 + j]
+            if types[j] == 'i':
+                args.append(_int_scalar(w))
+            elif types[j] == 's':
+                args.append(_buffer(w, 4))
+            else:
+                args.append(_buffer(w, 4*n))
+        globals()[name](_buffer(a, 4*n), n, *args)
+
+
+# ---------- 8. Functions for quantized neural networks ----------
+
+def _int8s(y, n):
+    return np.frombuffer(y, dtype=np.int8, count=n)
+
+def int8_dense(acc, n_out, W, p):
+    x_addr, n_in = p[0], p[1]
+    x = _int8s(_buffer(x_addr, n_in), n_in).astype(np.int64)
+    w = _int8s(W, n_out*n_in).reshape(n_out, n_in).astype(np.int64)
+    out = _ints(acc, n_out)
+    out[:] = (out + w @ x).astype(np.int32)
+
+def _to_int8(t, q):
+    # Clamps and truncates like the assembler versions
+    q = _floats(q, 4)
+    t = t*q[0] + q[1]
+    t = np.minimum(np.maximum(t, q[2]), q[3])
+    return (t.astype(np.int32) - 128).astype(np.int8)
+
+def int8_array_requantize(y, n, acc, q):
+    _int8s(y, n)[:] = _to_int8(_ints(acc, n).astype(np.float32), q)
+
+def int8_array_from_float_array(y, n, x, q):
+    _int8s(y, n)[:] = _to_int8(_floats(x, n), q)
+
+def int8_array_lookup(y, n, table):
+    y = _int8s(y, n)
+    y[:] = _int8s(table, 256)[y.astype(np.int32) + 128]
+
+
+# ---------- 9. Resampling functions ----------
+
+def float_array_polyphase_fir(y, n, x, p):
+    L, M, K, phase, i = p[1], p[2], p[3], p[4], p[5]
+    bank = _floats(_buffer(p[0], 4*L*K), L*K).reshape(L, K)
+    t = phase + M*np.arange(n)
+    start = i + t//L
+    rows = bank[t % L]
+    x = _floats(x, int(start[-1]) + K)
+    s = np.zeros(n, dtype=np.float32)
+    for k in range(K):
+        s += rows[:, k]*x[start + k]
+    _floats(y, n)[:] = s
+    t = phase + M*n
+    p[4] = t % L
+    p[5] = i + t//L
+
+
+# ---------- 10. Event detection functions ----------
+
+def _crossings(idx, n, x, p, dtype, rising):
+    # Only samples outside the hysteresis band change the state,
+    # and after each of them the state is x > upper, so the events
+    # are where that state changes (starting from p[2])
+    x = np.frombuffer(x, dtype=dtype, count=n)
+    p = np.frombuffer(p, dtype=dtype, count=3)
+    upper, lower = p[0], p[1]
+    above = x > upper
+    out = np.flatnonzero(above | (x < lower))
+    states = np.concatenate(([p[2] != 0], above[out]))
+    change = states[1:] != states[:-1]
+    events = out[change & (states[1:] if rising else ~states[1:])]
+    p[2] = 1 if states[-1] else 0
+    _ints(idx, len(events))[:] = events
+    return len(events)
+
+def float_array_rising_crossings(idx, n, x, p):
+    return _crossings(idx, n, x, p, np.float32, True)
+
+def float_array_falling_crossings(idx, n, x, p):
+    return _crossings(idx, n, x, p, np.float32, False)
+
+def int_array_rising_crossings(idx, n, a, p):
+    return _crossings(idx, n, a, p, np.int32, True)
+
+def int_array_falling_crossings(idx, n, a, p):
+    return _crossings(idx, n, a, p, np.int32, False)
+
+def float_array_zero_crossings(idx, n, x):
+    # Compares the sign bits like the assembler version
+    w = _ints(x, n)
+    events = np.flatnonzero((w[:-1] ^ w[1:]) < 0) + 1
+    _ints(idx, len(events))[:] = events
+    return len(events)
+
+int_array_zero_crossings = float_array_zero_crossings
+
+def _find_peaks(idx, n, x, p, dtype):
+    x = np.frombuffer(x, dtype=dtype, count=n)
+    p = np.frombuffer(p, dtype=dtype, count=2)
+    height, distance = p[0], int(p[1])
+    if n < 3:
+        return 0
+    c = x[1:-1]
+    candidates = np.flatnonzero((c > x[:-2]) & (c >= x[2:]) &
+                                (c >= height)) + 1
+    # Greedy in order of index, like the assembler version
+    peaks = []
+    last = -distance
+    for i in candidates:
+        if i - last >= distance:
+            peaks.append(i)
+            last = i
+        elif x[i] > x[last]:
+            peaks[-1] = i
+            last = i
+    _ints(idx, len(peaks))[:] = peaks
+    return len(peaks)
+
+def float_array_find_peaks(idx, n, x, p):
+    return _find_peaks(idx, n, x, p, np.float32)
+
+def int_array_find_peaks(idx, n, a, p):
+    return _find_peaks(idx, n, a, p, np.int32)
+
+
+# ---------- 11. Distance functions ----------
+
+def _rows(P, m, dim):
+    return _floats(P, m*dim).reshape(m, dim)
+
+def _query(p):
+    # q from p = array('L', [addressof(q), dim])
+    dim = p[1]
+    return _floats(_buffer(p[0], 4*dim), dim), dim
+
+def float_array_sqdist(d, m, P, p):
+    q, dim = _query(p)
+    P = _rows(P, m, dim)
+    s = np.zeros(m, dtype=np.float32)
+    for k in range(dim):
+        t = P[:, k] - q[k]
+        s += t*t
+    _floats(d, m)[:] = s
+
+def float_array_l1dist(d, m, P, p):
+    q, dim = _query(p)
+    P = _rows(P, m, dim)
+    s = np.zeros(m, dtype=np.float32)
+    for k in range(dim):
+        s += np.abs(P[:, k] - q[k])
+    _floats(d, m)[:] = s
+
+def float_array_cosdist(d, m, P, p):
+    q, dim = _query(p)
+    P = _rows(P, m, dim)
+    nq = np.add.accumulate(q*q, dtype=np.float32)[-1]
+    dot = np.zeros(m, dtype=np.float32)
+    n2 = np.zeros(m, dtype=np.float32)
+    for k in range(dim):
+        dot += P[:, k]*q[k]
+        n2 += P[:, k]*P[:, k]
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        den = np.sqrt(n2*nq)
+        _floats(d, m)[:] = np.where(den == 0, _f32(1.0),
+                                    _f32(1.0) - dot/den)
+
+def float_array_nsmallest(idx, k, d, m):
+    count = max(min(k, m), 0)
+    order = np.argsort(_floats(d, m), kind='stable')
+    _ints(idx, count)[:] = order[:count]
+    return count
+
+def float_array_assign_nearest(labels, m, X, p):
+    kc, dim = p[1], p[2]
+    C = _floats(_buffer(p[0], 4*kc*dim), kc*dim).reshape(kc, dim)
+    X = _rows(X, m, dim)
+    s = np.zeros((m, kc), dtype=np.float32)
+    for k in range(dim):
+        t = X[:, k, None] - C[None, :, k]
+        s += t*t
+    _ints(labels, m)[:] = np.argmin(s, axis=1)
+
+def float_array_centroid_sums(S, m, X, p):
+    dim = p[1]
+    labels = _ints(_buffer(p[0], 4*m), m)
+    kc = int(labels.max()) + 1
+    counts = _ints(_buffer(p[2], 4*kc), kc)
+    np.add.at(_rows(S, kc, dim), labels, _rows(X, m, dim))
+    np.add.at(counts, labels, 1)
+
+
+# ---------- 12. Sparse vector and matrix functions ----------
+
+def _sparse(s, nnz):
+    # values and indices of s = array('L', [addressof(values),
+    # addressof(indices)])
+    return (_floats(_buffer(s[0], 4*nnz), nnz),
+            _ints(_buffer(s[1], 4*nnz), nnz))
+
+def float_array_csr_matvec(y, n_rows, x, p):
+    rowptr = _ints(_buffer(p[2], 4*(n_rows + 1)), n_rows + 1)
+    nnz = int(rowptr[-1])
+    values, cols = _sparse(p, nnz)
+    x = np.frombuffer(x, dtype=np.float32)
+    out = np.zeros(n_rows, dtype=np.float32)
+    products = values*x[cols]
+    # Accumulate each row in order like the assembler version
+    for r in range(n_rows):
+        if rowptr[r + 1] > rowptr[r]:
+            out[r] = np.add.accumulate(products[rowptr[r]:rowptr[r + 1]],
+                                       dtype=np.float32)[-1]
+    _floats(y, n_rows)[:] = out
+
+def float_array_sparse_dot(x, nnz, s, v):
+    result = _f32(0.0)
+    if nnz > 0:
+        values, indices = _sparse(s, nnz)
+        x = np.frombuffer(x, dtype=np.float32)
+        result = np.add.accumulate(values*x[indices], dtype=np.float32)[-1]
+    _floats(v, 1)[0] = result
+
+def float_array_add_sparse(x, nnz, s, v):
+    if nnz > 0:
+        values, indices = _sparse(s, nnz)
+        x = np.frombuffer(x, dtype=np.float32)
+        # np.add.at handles repeated indices like the loop does
+        np.add.at(x, indices, values*_float_scalar(v))
+
+def float_array_compress(x, n, s, t):
+    x = _floats(x, n)
+    threshold = _float_scalar(t)
+    keep = np.flatnonzero((x > threshold) | (x < -threshold))
+    count = min(len(keep), s[2])
+    if count > 0:
+        values, indices = _sparse(s, count)
+        values[:] = x[keep[:count]]
+        indices[:] = keep[:count]
+    return len(keep)
+
+
+# ---------- 13. LU factorization functions ----------
+
+def float_array_lu_step(A, n, piv, k):
+    A = _floats(A, n*n).reshape(n, n)
+    piv = _ints(piv, n)
+    a = np.abs(A[piv[k:], k])
+    # NaNs are skipped by the comparison in the assembler version
+    a[np.isnan(a)] = 0.0
+    p = k + int(np.argmax(a))
+    if a[p - k] == 0.0:
+        return 0
+    piv[k], piv[p] = piv[p], piv[k]
+    rows = piv[k + 1:]
+    if len(rows):
+        pivot_row = A[piv[k]]
+        l = A[rows, k]/pivot_row[k]
+        A[rows, k] = l
+        A[rows, k + 1:] -= l[:, None]*pivot_row[None, k + 1:]
+    return 1
+
+def float_array_lu_solve(x, n, A, p):
+    A = _floats(A, n*n).reshape(n, n)
+    piv = _ints(_buffer(p[0], 4*n), n)
+    b = _floats(_buffer(p[1], 4*n), n)
+    x = _floats(x, n)
+    # Dot products are accumulated in order like the assembler
+    # version
+    for i in range(n):
+        s = b[piv[i]]
+        if i > 0:
+            s -= np.add.accumulate(A[piv[i], :i]*x[:i], dtype=np.float32)[-1]
+        x[i] = s
+    for i in range(n - 1, -1, -1):
+        s = x[i]
+        if i < n - 1:
+            s -= np.add.accumulate(A[piv[i], i + 1:]*x[i + 1:],
+                                   dtype=np.float32)[-1]
+        x[i] = s/A[piv[i], i]
@@ -0,0 +1,209 @@
+'''
+Functions for arrays of type int.
+
+Example usage:
+>>> import array_funcs
+>>> from array import array
+>>> numbers = array('i', [-1, 0, 1, 1000])
+>>> array_funcs.int_array_add_scalar(numbers, len(numbers), 1)
+536894992
+>>> numbers
+array('i', [0, 1, 2, 1001])
+'''
+
+@micropython.asm_thumb
+def int_array_assign_scalar(r0, r1, r2):
+    label(LOOP)
+    str(r2, [r0, 0])
+    add(r0, 4)
+    sub(r1, 1)
+    bgt(LOOP)
+
+@micropython.asm_thumb
+def int_array_add_scalar(r0, r1, r2):
+    label(LOOP)
+    ldr(r4, [r0, 0])
+    add(r4, r4, r2)
+    str(r4, [r0, 0])
+    add(r0, 4)
+    sub(r1, 1)
+    bgt(LOOP)
+
+@micropython.asm_thumb
+def int_array_sub_scalar(r0, r1, r2):
+    label(LOOP)
+    ldr(r4, [r0, 0])
+    sub(r4, r4, r2)
+    str(r4, [r0, 0])
+    add(r0, 4)
+    sub(r1, 1)
+    bgt(LOOP)
+
+@micropython.asm_thumb
+def int_array_neg(r0, r1):
+    label(LOOP)
+    ldr(r4, [r0, 0])
+    neg(r4, r4)
+    str(r4, [r0, 0])
+    add(r0, 4)
+    sub(r1, 1)
+    bgt(LOOP)
+
+@micropython.asm_thumb
+def int_array_abs(r0, r1):
+    label(LOOP)
+    ldr(r4, [r0, 0])
+    cmp(r4, 0)
+    it(lt)
+    neg(r4, r4)
+    str(r4, [r0, 0])
+    add(r0, 4)
+    sub(r1, 1)
+    bgt(LOOP)
+
+@micropython.asm_thumb
+def int_array_div_scalar(r0, r1, r2):
+    label(LOOP)
+    ldr(r4, [r0, 0])
+    sdiv(r4, r4, r2)
+    str(r4, [r0, 0])
+    add(r0, 4)
+    sub(r1, 1)
+    bgt(LOOP)
+
+@micropython.asm_thumb
+def int_array_mul_scalar(r0, r1, r2):
+    label(LOOP)
+    ldr(r4, [r0, 0])
+    mul(r4, r2)
+    str(r4, [r0, 0])
+    add(r0, 4)
+    sub(r1, 1)
+    bgt(LOOP)
+
+@micropython.asm_thumb
+def int_array_add_array(r0, r1, r2):
+    label(LOOP)
+    ldr(r4, [r0, 0])
+    ldr(r5, [r2, 0])
+    add(r4, r4, r5)
+    str(r4, [r0, 0])
+    add(r0, 4)
+    add(r2, 4)
+    sub(r1, 1)
+    bgt(LOOP)
+
+@micropython.asm_thumb
+def int_array_sub_array(r0, r1, r2):
+    label(LOOP)
+    ldr(r4, [r0, 0])
+    ldr(r5, [r2, 0])
+    sub(r4, r4, r5)
+    str(r4, [r0, 0])
+    add(r0, 4)
+    add(r2, 4)
+    sub(r1, 1)
+    bgt(LOOP)
+
+@micropython.asm_thumb
+def int_array_div_array(r0, r1, r2):
+    label(LOOP)
+    ldr(r4, [r0, 0])
+    ldr(r5, [r2, 0])
+    sdiv(r4, r4, r5)
+    str(r4, [r0, 0])
+    add(r0, 4)
+    add(r2, 4)
+    sub(r1, 1)
+    bgt(LOOP)
+
+@micropython.asm_thumb
+def int_array_mul_array(r0, r1, r2):
+    label(LOOP)
+    ldr(r4, [r0, 0])
+    ldr(r5, [r2, 0])
+    mul(r4, r5)
+    str(r4, [r0, 0])
+    add(r0, 4)
+    add(r2, 4)
+    sub(r1, 1)
+    bgt(LOOP)
+
+@micropython.asm_thumb
+def int_array_cmp_array(r0, r1, r2):
+    label(LOOP)
+    ldr(r3, [r0, 0])
+    ldr(r4, [r2, 0])
+    cmp(r3, r4)
+    bne(NOT)
+    movw(r3, 1)
+    b(NEXT)
+    label(NOT)
+    movw(r3, 0)
+    label(NEXT)
+    str(r3, [r0, 0])
+    add(r0, 4)
+    add(r2, 4)
+    sub(r1, 1)
+    bgt(LOOP)
+
+@micropython.asm_thumb
+def int_array_copy(r0, r1, r2):
+    label(LOOP)
+    ldr(r4, [r2, 0])
+    str(r4, [r0, 0])
+    add(r0, 4)
+    add(r2, 4)
+    sub(r1, 1)
+    bgt(LOOP)
+
+@micropython.asm_thumb
+def int_array_square(r0, r1):
+    label(LOOP)
+    ldr(r2, [r0, 0])
+    mul(r2, r2)
+    str(r2, [r0, 0])
+    add(r0, 4)
+    sub(r1, 1)
+    bgt(LOOP)
+
+@micropython.asm_thumb
+def int_array_sum(r0, r1):
+    movw(r3, 0)
+    label(LOOP)
+    ldr(r4, [r0, 0])
+    add(r3, r3, r4)
+    add(r0, 4)
+    sub(r1, 1)
+    bgt(LOOP)
+    mov(r0, r3)
+
+@micropython.asm_thumb
+def int_array_max(r0, r1):
+    ldr(r3, [r0, 0])
+    label(LOOP)
+    add(r0, 4)
+    sub(r1, 1)
+    ble(END)
+    ldr(r4, [r0, 0])
+    cmp(r3, r4)
+    bge(LOOP)
+    mov(r3, r4)
+    b(LOOP)
+    label(END)
+    mov(r0, r3)
+
+@micropython.asm_thumb
+def int_array_min(r0, r1):
+    ldr(r3, [r0, 0])
+    label(LOOP)
+    add(r0, 4)
+    sub(r1, 1)
+    ble(END)
+    ldr(r4, [r0, 0])
+    cmp(r3, r4)
+    ble(LOOP)
+    mov(r3, r4)
+    b(LOOP)
+    label(END)
+    mov(r0, r3)
@@ -0,0 +1,209 @@
+'''
+LU factorization and solve functions for square matrices stored
+in row-major order in arrays of type float, so element (i, j) of
+an n x n matrix A is A[i*n + j].
+
+Rows are not swapped in memory: the row permutation is kept in
+piv, an array('i') of length n, so row i of P*A is row piv[i] of
+A.  Each step of the factorization (pivot search, multipliers and
+row updates) is a single call, so an n x n factorization takes n
+calls and a solve one call.  The linalg module uses these
+functions.
+
+float_array_lu_step(A, n, piv, k) does step k of the elimination
+and returns 0 if the matrix is singular (column k is zero) or 1.
+float_array_lu_solve(x, n, A, p) solves A*x = b with the factors,
+where p = array('L', [addressof(piv), addressof(b)]).
+
+Example usage:
+>>> import array_funcs as af
+>>> from array import array
+>>> A = array('f', [1.0, 2.0, 4.0, 2.0])
+>>> piv = array('i', [0, 1])
+>>> for k in range(2):
+...     af.float_array_lu_step(A, 2, piv, k)
+...
+>>> piv, A
+(array('i', [1, 0]), array('f', [0.25, 1.5, 4.0, 2.0]))
+>>> x = array('f', [0.0, 0.0])
+>>> b = array('f', [5.0, 8.0])
+>>> af.float_array_lu_solve(x, 2, A, array('L', [af.addressof(piv),
+...                                              af.addressof(b)]))
+536894992
+>>> x
+array('f', [1.0, 2.0])
+'''
+
+
+@micropython.asm_thumb
+def float_array_lu_step(r0, r1, r2, r3):
+  # Step k of the LU factorization with partial pivoting
+  # r0: address of A (n x n)
+  # r1: n
+  # r2: address of piv (array('i') of length n)
+  # r3: k
+  # Returns 0 if column k is zero below row k (singular) or 1
+    vmov(s11, r2)          # s11 = address of piv
+    lsl(r7, r3, 2)
+    add(r2, r2, r7)        # r2 = address of piv[i]
+    mov(r6, r2)            # r6 = address of piv[p]
+    sub(r5, r1, r3)        # r5 = n - k rows to search
+    mov(r4, 0)
+    vmov(s0, r4)           # s0 = amax = 0.0
+    movwt(r4, 0x7FFFFFFF)  # abs mask
+
+    label(SEARCH)
+    ldr(r7, [r2, 0])
+    mul(r7, r1)
+    add(r7, r7, r3)
+    lsl(r7, r7, 2)
+    add(r7, r7, r0)
+    ldr(r7, [r7, 0])
+    and_(r7, r4)
+    vmov(s1, r7)           # s1 = abs(A[piv[i], k])
+    vcmp(s1, s0)
+    vmrs(APSR_nzcv, FPSCR)
+    ble(NOT_LARGER)        # not larger (or NaN)
+    vmov(s0, r7)
+    mov(r6, r2)
+    label(NOT_LARGER)
+    add(r2, 4)
+    sub(r5, 1)
+    bgt(SEARCH)
+
+    mov(r7, 0)
+    vmov(r5, s0)
+    cmp(r5, 0)
+    beq(END)               # singular: return 0
+    vmov(r2, s11)
+    lsl(r7, r3, 2)
+    add(r2, r2, r7)        # r2 = address of piv[k]
+    ldr(r4, [r2, 0])
+    ldr(r5, [r6, 0])
+    str(r5, [r2, 0])       # swap piv[k] and piv[p]
+    str(r4, [r6, 0])
+
+    mov(r7, 1)
+    sub(r4, r1, r3)
+    sub(r4, 1)             # r4 = m = n - k - 1 rows (and columns)
+    ble(END)
+    vmov(s13, r4)          # s13 = m
+    mul(r5, r1)
+    add(r5, r5, r3)
+    lsl(r5, r5, 2)
+    add(r5, r5, r0)        # r5 = address of A[piv[k], k]
+    vmov(s14, r5)
+    vldr(s3, [r5, 0])      # s3 = pivot
+
+    label(ROW)
+    add(r2, 4)
+    ldr(r6, [r2, 0])
+    mul(r6, r1)
+    add(r6, r6, r3)
+    lsl(r6, r6, 2)
+    add(r6, r6, r0)        # r6 = address of A[piv[i], k]
+    vldr(s0, [r6, 0])
+    vdiv(s0, s0, s3)       # s0 = l = A[piv[i], k]/pivot
+    vstr(s0, [r6, 0])
+    vmov(r5, s14)
+    vmov(r7, s13)
+    label(COL)             # A[piv[i], j] -= l*A[piv[k], j]
+    add(r5, 4)
+    add(r6, 4)
+    vldr(s1, [r5, 0])
+    vldr(s2, [r6, 0])
+    vmul(s1, s1, s0)
+    vsub(s2, s2, s1)
+    vstr(s2, [r6, 0])
+    sub(r7, 1)
+    bgt(COL)
+    sub(r4, 1)
+    bgt(ROW)
+    mov(r7, 1)
+
+    label(END)
+    mov(r0, r7)
+
+@micropython.asm_thumb
+def float_array_lu_solve(r0, r1, r2, r3):
+  # x = solution of A*x = b with the factors from float_array_lu_step
+  # r0: address of x (array('f') of length n)
+  # r1: n
+  # r2: address of A (factors, n x n)
+  # r3: address of p = array('L', [address of piv, address of b])
+    ldr(r4, [r3, 4])
+    vmov(s10, r4)          # s10 = address of b
+    ldr(r3, [r3, 0])       # r3 = address of piv
+    cmp(r1, 0)
+    ble(END)
+    mov(r4, 0)             # r4 = i
+
+    label(FORWARD)         # x[i] = b[piv[i]] - L[i, :i]*x[:i]
+    lsl(r5, r4, 2)
+    add(r5, r5, r3)
+    ldr(r5, [r5, 0])       # r5 = piv[i]
+    lsl(r6, r5, 2)
+    vmov(r7, s10)
+    add(r6, r6, r7)
+    vldr(s0, [r6, 0])      # s0 = b[piv[i]]
+    mul(r5, r1)
+    lsl(r5, r5, 2)
+    add(r5, r5, r2)        # r5 = address of A[piv[i], j]
+    mov(r6, r0)            # r6 = address of x[j]
+    mov(r7, 0)
+    vmov(s1, r7)           # s1 = dot = 0.0
+    mov(r7, r4)
+    cmp(r7, 0)
+    ble(FSTORE)
+    label(FDOT)
+    vldr(s2, [r5, 0])
+    vldr(s3, [r6, 0])
+    vmul(s2, s2, s3)
+    vadd(s1, s1, s2)
+    add(r5, 4)
+    add(r6, 4)
+    sub(r7, 1)
+    bgt(FDOT)
+    label(FSTORE)          # r6 = address of x[i]
+    vsub(s0, s0, s1)
+    vstr(s0, [r6, 0])
+    add(r4, 1)
+    cmp(r4, r1)
+    blt(FORWARD)
+
+    sub(r4, 1)             # r4 = i = n - 1
+    label(BACK)            # x[i] = (x[i] - U[i, i+1:]*x[i+1:])/U[i, i]
+    lsl(r5, r4, 2)
+    add(r5, r5, r3)
+    ldr(r5, [r5, 0])
+    mul(r5, r1)
+    add(r5, r5, r4)
+    lsl(r5, r5, 2)
+    add(r5, r5, r2)        # r5 = address of A[piv[i], i]
+    vldr(s4, [r5, 0])      # s4 = U[i, i]
+    lsl(r6, r4, 2)
+    add(r6, r6, r0)        # r6 = address of x[i]
+    vmov(s5, r6)
+    vldr(s0, [r6, 0])
+    mov(r7, 0)
+    vmov(s1, r7)           # s1 = dot = 0.0
+    sub(r7, r1, r4)
+    sub(r7, 1)             # r7 = n - i - 1
+    ble(BSTORE)
+    label(BDOT)
+    add(r5, 4)
+    add(r6, 4)
+    vldr(s2, [r5, 0])
+    vldr(s3, [r6, 0])
+    vmul(s2, s2, s3)
+    vadd(s1, s1, s2)
+    sub(r7, 1)
+    bgt(BDOT)
+    label(BSTORE)
+    vmov(r6, s5)
+    vsub(s0, s0, s1)
+    vdiv(s0, s0, s4)
+    vstr(s0, [r6, 0])
+    sub(r4, 1)
+    bpl(BACK)
+    label(END)
@@ -0,0 +1,359 @@
+'''
+Dispatcher for programs of array function calls (see
+program.py).
+
+opqueue_run(cmds, count) executes count commands from cmds, an
+array('L') of five words per command: opcode, first argument,
+length, third argument and fourth argument.  The loop of each
+supported function is repeated here so that no Python code runs
+between commands.  Unknown opcodes are skipped.
+'''
+
+
+@micropython.asm_thumb
+def opqueue_run(r0, r1):
+  # r0: address of cmds (array('L'), 5 words per command)
+  # r1: number of commands
+    label(CMD)
+    ldr(r4, [r0, 0])       # r4 = opcode
+    ldr(r5, [r0, 4])       # r5 = first argument (array)
+    ldr(r6, [r0, 8])       # r6 = length
+    ldr(r2, [r0, 12])      # r2 = third argument
+    ldr(r3, [r0, 16])      # r3 = fourth argument
+    push({r0, r1})
+
+    # Branch to the handler for the opcode
+    cmp(r4, 0)             # int_array_assign_scalar
+    beq_w(H0)
+    cmp(r4, 1)             # int_array_add_scalar
+    beq_w(H1)
+    cmp(r4, 2)             # int_array_sub_scalar
+    beq_w(H2)
+    cmp(r4, 3)             # int_array_mul_scalar
+    beq_w(H3)
+    cmp(r4, 4)             # int_array_copy
+    beq_w(H4)
+    cmp(r4, 5)             # int_array_add_array
+    beq_w(H5)
+    cmp(r4, 6)             # int_array_sub_array
+    beq_w(H6)
+    cmp(r4, 7)             # int_array_mul_array
+    beq_w(H7)
+    cmp(r4, 8)             # float_array_assign_scalar
+    beq_w(H8)
+    cmp(r4, 9)             # float_array_add_scalar
+    beq_w(H9)
+    cmp(r4, 10)            # float_array_sub_scalar
+    beq_w(H10)
+    cmp(r4, 11)            # float_array_mul_scalar
+    beq_w(H11)
+    cmp(r4, 12)            # float_array_div_scalar
+    beq_w(H12)
+    cmp(r4, 13)            # float_array_copy
+    beq_w(H13)
+    cmp(r4, 14)            # float_array_add_array
+    beq_w(H14)
+    cmp(r4, 15)            # float_array_sub_array
+    beq_w(H15)
+    cmp(r4, 16)            # float_array_mul_array
+    beq_w(H16)
+    cmp(r4, 17)            # float_array_div_array
+    beq_w(H17)
+    cmp(r4, 18)            # float_array_add_scaled_array
+    beq_w(H18)
+    cmp(r4, 19)            # float_array_neg
+    beq_w(H19)
+    cmp(r4, 20)            # float_array_abs
+    beq_w(H20)
+    cmp(r4, 21)            # float_array_square
+    beq_w(H21)
+    cmp(r4, 22)            # float_array_sqrt
+    beq_w(H22)
+    cmp(r4, 23)            # float_array_sum
+    beq_w(H23)
+    cmp(r4, 24)            # float_array_dot
+    beq_w(H24)
+    b(DONE)                # Unknown opcode
+
+    label(H0)              # int_array_assign_scalar
+    label(L0)
+    str(r2, [r5, 0])
+    add(r5, 4)
+    sub(r6, 1)
+    bgt(L0)
+    b(DONE)
+
+    label(H1)              # int_array_add_scalar
+    label(L1)
+    ldr(r7, [r5, 0])
+    add(r7, r7, r2)
+    str(r7, [r5, 0])
+    add(r5, 4)
+    sub(r6, 1)
+    bgt(L1)
+    b(DONE)
+
+    label(H2)              # int_array_sub_scalar
+    label(L2)
+    ldr(r7, [r5, 0])
+    sub(r7, r7, r2)
+    str(r7, [r5, 0])
+    add(r5, 4)
+    sub(r6, 1)
+    bgt(L2)
+    b(DONE)
+
+    label(H3)              # int_array_mul_scalar
+    label(L3)
+    ldr(r7, [r5, 0])
+    mul(r7, r2)
+    str(r7, [r5, 0])
+    add(r5, 4)
+    sub(r6, 1)
+    bgt(L3)
+    b(DONE)
+
+    label(H4)              # int_array_copy
+    label(L4)
+    ldr(r7, [r2, 0])
+    str(r7, [r5, 0])
+    add(r5, 4)
+    add(r2, 4)
+    sub(r6, 1)
+    bgt(L4)
+    b(DONE)
+
+    label(H5)              # int_array_add_array
+    label(L5)
+    ldr(r7, [r5, 0])
+    ldr(r4, [r2, 0])
+    add(r7, r7, r4)
+    str(r7, [r5, 0])
+    add(r5, 4)
+    add(r2, 4)
+    sub(r6, 1)
+    bgt(L5)
+    b(DONE)
+
+    label(H6)              # int_array_sub_array
+    label(L6)
+    ldr(r7, [r5, 0])
+    ldr(r4, [r2, 0])
+    sub(r7, r7, r4)
+    str(r7, [r5, 0])
+    add(r5, 4)
+    add(r2, 4)
+    sub(r6, 1)
+    bgt(L6)
+    b(DONE)
+
+    label(H7)              # int_array_mul_array
+    label(L7)
+    ldr(r7, [r5, 0])
+    ldr(r4, [r2, 0])
+    mul(r7, r4)
+    str(r7, [r5, 0])
+    add(r5, 4)
+    add(r2, 4)
+    sub(r6, 1)
+    bgt(L7)
+    b(DONE)
+
+    label(H8)              # float_array_assign_scalar
+    vldr(s0, [r2, 0])
+    label(L8)
+    vstr(s0, [r5, 0])
+    add(r5, 4)
+    sub(r6, 1)
+    bgt(L8)
+    b(DONE)
+
+    label(H9)              # float_array_add_scalar
+    vldr(s1, [r2, 0])
+    label(L9)
+    vldr(s0, [r5, 0])
+    vadd(s0, s0, s1)
+    vstr(s0, [r5, 0])
+    add(r5, 4)
+    sub(r6, 1)
+    bgt(L9)
+    b(DONE)
+
+    label(H10)             # float_array_sub_scalar
+    vldr(s1, [r2, 0])
+    label(L10)
+    vldr(s0, [r5, 0])
+    vsub(s0, s0, s1)
+    vstr(s0, [r5, 0])
+    add(r5, 4)
+    sub(r6, 1)
+    bgt(L10)
+    b(DONE)
+
+    label(H11)             # float_array_mul_scalar
+    vldr(s1, [r2, 0])
+    label(L11)
+    vldr(s0, [r5, 0])
+    vmul(s0, s0, s1)
+    vstr(s0, [r5, 0])
+    add(r5, 4)
+    sub(r6, 1)
+    bgt(L11)
+    b(DONE)
+
+    label(H12)             # float_array_div_scalar
+    vldr(s1, [r2, 0])
+    label(L12)
+    vldr(s0, [r5, 0])
+    vdiv(s0, s0, s1)
+    vstr(s0, [r5, 0])
+    add(r5, 4)
+    sub(r6, 1)
+    bgt(L12)
+    b(DONE)
+
+    label(H13)             # float_array_copy
+    label(L13)
+    vldr(s0, [r2, 0])
+    vstr(s0, [r5, 0])
+    add(r5, 4)
+    add(r2, 4)
+    sub(r6, 1)
+    bgt(L13)
+    b(DONE)
+
+    label(H14)             # float_array_add_array
+    label(L14)
+    vldr(s0, [r5, 0])
+    vldr(s1, [r2, 0])
+    vadd(s0, s0, s1)
+    vstr(s0, [r5, 0])
+    add(r5, 4)
+    add(r2, 4)
+    sub(r6, 1)
+    bgt(L14)
+    b(DONE)
+
+    label(H15)             # float_array_sub_array
+    label(L15)
+    vldr(s0, [r5, 0])
+    vldr(s1, [r2, 0])
+    vsub(s0, s0, s1)
+    vstr(s0, [r5, 0])
+    add(r5, 4)
+    add(r2, 4)
+    sub(r6, 1)
+    bgt(L15)
+    b(DONE)
+
+    label(H16)             # float_array_mul_array
+    label(L16)
+    vldr(s0, [r5, 0])
+    vldr(s1, [r2, 0])
+    vmul(s0, s0, s1)
+    vstr(s0, [r5, 0])
+    add(r5, 4)
+    add(r2, 4)
+    sub(r6, 1)
+    bgt(L16)
+    b(DONE)
+
+    label(H17)             # float_array_div_array
+    label(L17)
+    vldr(s0, [r5, 0])
+    vldr(s1, [r2, 0])
+    vdiv(s0, s0, s1)
+    vstr(s0, [r5, 0])
+    add(r5, 4)
+    add(r2, 4)
+    sub(r6, 1)
+    bgt(L17)
+    b(DONE)
+
+    label(H18)             # float_array_add_scaled_array
+    vldr(s2, [r3, 0])
+    label(L18)
+    vldr(s0, [r5, 0])
+    vldr(s1, [r2, 0])
+    vmul(s1, s1, s2)
+    vadd(s0, s0, s1)
+    vstr(s0, [r5, 0])
+    add(r5, 4)
+    add(r2, 4)
+    sub(r6, 1)
+    bgt(L18)
+    b(DONE)
+
+    label(H19)             # float_array_neg
+    label(L19)
+    vldr(s0, [r5, 0])
+    vneg(s0, s0)
+    vstr(s0, [r5, 0])
+    add(r5, 4)
+    sub(r6, 1)
+    bgt(L19)
+    b(DONE)
+
+    label(H20)             # float_array_abs
+    movwt(r4, 0x7FFFFFFF)
+    label(L20)
+    ldr(r7, [r5, 0])
+    and_(r7, r4)
+    str(r7, [r5, 0])
+    add(r5, 4)
+    sub(r6, 1)
+    bgt(L20)
+    b(DONE)
+
+    label(H21)             # float_array_square
+    label(L21)
+    vldr(s0, [r5, 0])
+    vmul(s0, s0, s0)
+    vstr(s0, [r5, 0])
+    add(r5, 4)
+    sub(r6, 1)
+    bgt(L21)
+    b(DONE)
+
+    label(H22)             # float_array_sqrt
+    label(L22)
+    vldr(s0, [r5, 0])
+    vsqrt(s0, s0)
+    vstr(s0, [r5, 0])
+    add(r5, 4)
+    sub(r6, 1)
+    bgt(L22)
+    b(DONE)
+
+    label(H23)             # float_array_sum
+    mov(r7, 0)
+    vmov(s0, r7)
+    label(L23)
+    vldr(s1, [r5, 0])
+    vadd(s0, s0, s1)
+    add(r5, 4)
+    sub(r6, 1)
+    bgt(L23)
+    vstr(s0, [r2, 0])
+    b(DONE)
+
+    label(H24)             # float_array_dot
+    mov(r7, 0)
+    vmov(s0, r7)
+    label(L24)
+    vldr(s1, [r5, 0])
+    vldr(s2, [r2, 0])
+    vmul(s1, s1, s2)
+    vadd(s0, s0, s1)
+    add(r5, 4)
+    add(r2, 4)
+    sub(r6, 1)
+    bgt(L24)
+    vstr(s0, [r3, 0])
+    b(DONE)
+
+    label(DONE)
+    pop({r0, r1})
+    add(r0, 20)            # Next command
+    sub(r1, 1)
+    bgt_w(CMD)
@@ -0,0 +1,118 @@
+'''
+Programs of array function calls which are run with a single
+call to opqueue_run.
+
+For short arrays the time taken to call a function from Python
+is longer than the loop itself.  A Program records a sequence of
+calls once, in a preallocated array of commands, and run() then
+executes all of them in one call to the assembler dispatcher
+(opqueue_run in opqueue_funcs.py) without going back to Python.
+
+Each command is five words: the opcode (the index of the
+function in OPS), the first argument, the length and the third
+and fourth arguments.  Arrays and float scalars are stored as
+addresses, so the arrays are used in place and their contents
+(including scalars in array('f', [v])) can be changed between
+runs.  Int scalars are stored as values.
+
+Example usage:
+>>> import array_funcs as af
+>>> from array import array
+>>> x = array('f', [1.0, 2.0, 3.0])
+>>> y = array('f', [0.5, 0.5, 0.5])
+>>> gain = array('f', [2.0])
+>>> prog = af.Program(8)
+>>> prog.add('float_array_mul_scalar', x, len(x), gain)
+>>> prog.add('float_array_add_array', x, len(x), y)
+>>> prog.run()
+>>> x
+array('f', [2.5, 4.5, 6.5])
+'''
+
+from array import array
+import array_funcs as af
+
+# Functions supported by opqueue_run and the types of their
+# arguments after the length: 'a' array, 's' float scalar
+# (array('f', [v])), 'i' int scalar.  The opcode is the index.
+OPS = (
+    ('int_array_assign_scalar', 'i'),
+    ('int_array_add_scalar', 'i'),
+    ('int_array_sub_scalar', 'i'),
+    ('int_array_mul_scalar', 'i'),
+    ('int_array_copy', 'a'),
+    ('int_array_add_array', 'a'),
+    ('int_array_sub_array', 'a'),
+    ('int_array_mul_array', 'a'),
+    ('float_array_assign_scalar', 's'),
+    ('float_array_add_scalar', 's'),
+    ('float_array_sub_scalar', 's'),
+    ('float_array_mul_scalar', 's'),
+    ('float_array_div_scalar', 's'),
+    ('float_array_copy', 'a'),
+    ('float_array_add_array', 'a'),
+    ('float_array_sub_array', 'a'),
+    ('float_array_mul_array', 'a'),
+    ('float_array_div_array', 'a'),
+    ('float_array_add_scaled_array', 'as'),
+    ('float_array_neg', ''),
+    ('float_array_abs', ''),
+    ('float_array_square', ''),
+    ('float_array_sqrt', ''),
+    ('float_array_sum', 's'),
+    ('float_array_dot', 'as')
+)
+
+# Words per command
+CMD_SIZE = 5
+
+
+class Program:
+
+    def __init__(self, size):
+        self.size = size
+        self.count = 0
+        self.cmds = array('L', [0]*CMD_SIZE*size)
+        # Keeps the arrays alive while their addresses are used
+        self._refs = []
+
+    def add(self, name, a, n, *args):
+        # Appends the call name(a, n, *args) to the program
+        for op in range(len(OPS)):
+            if OPS[op][0] == name:
+                break
+        else:
+            raise ValueError('unsupported function: ' + name)
+        types = OPS[op][1]
+        if len(args) != len(types):
+            raise TypeError('{} takes {} arguments'.format(name,
+                                                          len(types) + 2))
+        if self.count >= self.size:
+            raise ValueError('program is full')
+        if n < 1:
+            raise ValueError('length must be at least 1')
+        i = self.count*CMD_SIZE
+        self.cmds[i] = op
+        self.cmds[i + 1] = af.addressof(a)
+        self.cmds[i + 2] = n
+        self.cmds[i + 3] = 0
+        self.cmds[i + 4] = 0
+        self._refs.append(a)
+        for j in range(len(args)):
+            arg = args[j]
+            if types[j] == 'i':
+                self.cmds[i + 3 + j] = arg & 0xFFFFFFFF
+                continue
+            if types[j] == 's' and isinstance(arg, (int, float)):
+                arg = array('f', [arg])
+            self.cmds[i + 3 + j] = af.addressof(arg)
+            self._refs.append(arg)
+        self.count += 1
+
+    def clear(self):
+        self.count = 0
+        self._refs = []
+
+    def run(self):
+        if self.count > 0:
+            af.opqueue_run(self.cmds, self.count)
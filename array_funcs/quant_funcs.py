@@ -0,0 +1,155 @@
+'''
+Functions for quantized (int8) neural network layers.
+
+Quantized values are stored in arrays of type 'b' (int8) and
+represent real values r = scale*(q - zero_point).  Weights are
+quantized symmetrically (zero point 0) so a dense layer is an
+int8 matrix-vector product accumulated in int32, with the input
+zero point folded into the bias (see nn.py).
+
+Parameters which do not fit in the four registers are passed in
+a small array:
+p = array('L', [addressof(x), n_in]) for int8_dense
+q = array('f', [scale, zero_point + 128.5, lo + 128, hi + 128])
+for the float to int8 conversions, where lo and hi are the
+limits of the output (e.g. zero_point for a fused ReLU).
+
+Example usage:
+>>> import array_funcs as af
+>>> from array import array
+>>> W = array('b', [1, 2, -3, 4])      # 2 x 2
+>>> x = array('b', [10, -5])
+>>> acc = array('i', [100, 0])         # bias
+>>> af.int8_dense(acc, 2, W, array('L', [af.addressof(x), 2]))
+536894992
+>>> acc
+array('i', [100, -50])
+'''
+
+
+@micropython.asm_thumb
+def int8_dense(r0, r1, r2, r3):
+  # acc = acc + W*x
+  # r0: address of acc (array('i') of length n_out)
+  # r1: n_out
+  # r2: address of W (array('b'), n_out x n_in in row-major order)
+  # r3: address of p = array('L', [address of x (array('b')), n_in])
+    ldr(r4, [r3, 0])
+    vmov(s0, r4)           # s0 = address of x
+    ldr(r4, [r3, 4])
+    vmov(s1, r4)           # s1 = n_in
+    label(ROW)
+    vmov(r3, s0)           # r3 = address of x
+    vmov(r5, s1)           # r5 = n_in
+    ldr(r6, [r0, 0])       # r6 = acc[o]
+    label(LOOP)
+    ldrb(r4, [r2, 0])
+    lsl(r4, r4, 24)
+    asr(r4, r4, 24)        # r4 = W[o, i] (sign extended)
+    ldrb(r7, [r3, 0])
+    lsl(r7, r7, 24)
+    asr(r7, r7, 24)        # r7 = x[i]
+    mul(r4, r7)
+    add(r6, r6, r4)
+    add(r2, 1)
+    add(r3, 1)
+    sub(r5, 1)
+    bgt(LOOP)
+    str(r6, [r0, 0])
+    add(r0, 4)
+    sub(r1, 1)
+    bgt(ROW)
+
+@micropython.asm_thumb
+def int8_array_requantize(r0, r1, r2, r3):
+  # y = clamp(round(acc*scale + zero_point), lo, hi)
+  # r0: address of y (array('b'))
+  # r1: length of y and acc
+  # r2: address of acc (array('i'))
+  # r3: address of q = array('f', [scale, zero_point + 128.5,
+  #                                lo + 128, hi + 128])
+  # The 128 offset makes the value positive so that truncation
+  # rounds to nearest.
+    vldr(s1, [r3, 0])      # scale
+    vldr(s2, [r3, 4])      # offset
+    vldr(s3, [r3, 8])      # lower limit
+    vldr(s4, [r3, 12])     # upper limit
+    label(LOOP)
+    vldr(s0, [r2, 0])
+    vcvt_f32_s32(s0, s0)
+    vmul(s0, s0, s1)
+    vadd(s0, s0, s2)
+    vcmp(s0, s3)
+    vmrs(APSR_nzcv, FPSCR)
+    bge(ABOVE)
+    vmov(r4, s3)
+    vmov(s0, r4)
+    label(ABOVE)
+    vcmp(s0, s4)
+    vmrs(APSR_nzcv, FPSCR)
+    ble(STORE)
+    vmov(r4, s4)
+    vmov(s0, r4)
+    label(STORE)
+    vcvt_s32_f32(s0, s0)
+    vmov(r4, s0)
+    sub(r4, 128)
+    strb(r4, [r0, 0])
+    add(r0, 1)
+    add(r2, 4)
+    sub(r1, 1)
+    bgt(LOOP)
+
+@micropython.asm_thumb
+def int8_array_from_float_array(r0, r1, r2, r3):
+  # y = clamp(round(x/scale + zero_point), lo, hi)
+  # r0: address of y (array('b'))
+  # r1: length of y and x
+  # r2: address of x (array('f'))
+  # r3: address of q = array('f', [1/scale, zero_point + 128.5,
+  #                                lo + 128, hi + 128])
+    vldr(s1, [r3, 0])
+    vldr(s2, [r3, 4])
+    vldr(s3, [r3, 8])
+    vldr(s4, [r3, 12])
+    label(LOOP)
+    vldr(s0, [r2, 0])
+    vmul(s0, s0, s1)
+    vadd(s0, s0, s2)
+    vcmp(s0, s3)
+    vmrs(APSR_nzcv, FPSCR)
+    bge(ABOVE)
+    vmov(r4, s3)
+    vmov(s0, r4)
+    label(ABOVE)
+    vcmp(s0, s4)
+    vmrs(APSR_nzcv, FPSCR)
+    ble(STORE)
+    vmov(r4, s4)
+    vmov(s0, r4)
+    label(STORE)
+    vcvt_s32_f32(s0, s0)
+    vmov(r4, s0)
+    sub(r4, 128)
+    strb(r4, [r0, 0])
+    add(r0, 1)
+    add(r2, 4)
+    sub(r1, 1)
+    bgt(LOOP)
+
+@micropython.asm_thumb
+def int8_array_lookup(r0, r1, r2):
+  # y[i] = table[y[i] + 128]
+  # r0: address of y (array('b'))
+  # r1: length of y
+  # r2: address of table (array('b') of length 256)
+    mov(r4, 0x80)
+    label(LOOP)
+    ldrb(r3, [r0, 0])
+    eor(r3, r4)            # r3 = y[i] + 128
+    add(r3, r3, r2)
+    ldrb(r3, [r3, 0])
+    strb(r3, [r0, 0])
+    add(r0, 1)
+    sub(r1, 1)
+    bgt(LOOP)
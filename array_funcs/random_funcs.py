@@ -0,0 +1,252 @@
+'''
+Functions for filling arrays with pseudo-random numbers in
+MicroPython.
+
+The numbers are generated in place with the xorshift32
+generator (Marsaglia, 2003).  The generator state is a one-
+element array('I') which is updated by every call so streams
+can be continued across calls and reproduced by re-seeding.
+The RandomState class in random_state.py wraps the state and the
+parameter arrays.
+
+Example usage:
+>>> from array import array
+>>> from array_funcs.random_state import RandomState
+>>> rs = RandomState(1)
+>>> x = array('f', [0.0]*4)
+>>> rs.uniform(x, -1.0, 1.0)
+>>> x
+array('f', [-0.9998741, -0.9685051, 0.2328081, -0.8567629])
+'''
+
+
+@micropython.asm_thumb
+def int_array_random(r0, r1, r2):
+  # Fills a with random 32-bit integers
+  # r0: address of a (output array)
+  # r1: length of a
+  # r2: address of state (array('I') of length 1, non-zero)
+    ldr(r3, [r2, 0])       # r3 = state
+    label(LOOP)
+    lsl(r4, r3, 13)        # state ^= state << 13
+    eor(r3, r4)
+    lsr(r4, r3, 17)        # state ^= state >> 17
+    eor(r3, r4)
+    lsl(r4, r3, 5)         # state ^= state << 5
+    eor(r3, r4)
+    str(r3, [r0, 0])
+    add(r0, 4)
+    sub(r1, 1)
+    bgt(LOOP)
+    str(r3, [r2, 0])       # Save state
+
+
+@micropython.asm_thumb
+def int_array_random_range(r0, r1, r2, r3):
+  # Fills a with random integers in the range 0 <= a < m
+  # r0: address of a (output array)
+  # r1: length of a
+  # r2: address of state (array('I') of length 1, non-zero)
+  # r3: m (a positive integer)
+    mov(r6, r3)            # r6 = m
+    ldr(r3, [r2, 0])       # r3 = state
+    label(LOOP)
+    lsl(r4, r3, 13)
+    eor(r3, r4)
+    lsr(r4, r3, 17)
+    eor(r3, r4)
+    lsl(r4, r3, 5)
+    eor(r3, r4)
+    udiv(r5, r3, r6)       # r5 = state // m
+    mul(r5, r6)
+    sub(r5, r3, r5)        # r5 = state % m
+    str(r5, [r0, 0])
+    add(r0, 4)
+    sub(r1, 1)
+    bgt(LOOP)
+    str(r3, [r2, 0])
+
+
+@micropython.asm_thumb
+def float_array_random(r0, r1, r2):
+  # Fills x with random floats in the range 0.0 <= x < 1.0
+  # r0: address of x (output array)
+  # r1: length of x
+  # r2: address of state (array('I') of length 1, non-zero)
+    ldr(r3, [r2, 0])
+    movwt(r5, 0x3F800000)  # r5 = bits of 1.0
+    vmov(s1, r5)           # s1 = 1.0
+    label(LOOP)
+    lsl(r4, r3, 13)
+    eor(r3, r4)
+    lsr(r4, r3, 17)
+    eor(r3, r4)
+    lsl(r4, r3, 5)
+    eor(r3, r4)
+    lsr(r4, r3, 9)         # Top 23 bits as mantissa
+    orr(r4, r5)
+    vmov(s0, r4)           # s0 = 1.0 <= f < 2.0
+    vsub(s0, s0, s1)
+    vstr(s0, [r0, 0])
+    add(r0, 4)
+    sub(r1, 1)
+    bgt(LOOP)
+    str(r3, [r2, 0])
+
+
+@micropython.asm_thumb
+def float_array_random_uniform(r0, r1, r2, r3):
+  # Fills x with random floats in the range lo <= x < hi
+  # r0: address of x (output array)
+  # r1: length of x
+  # r2: address of state (array('I') of length 1, non-zero)
+  # r3: address of array('f', [lo, hi])
+    vldr(s2, [r3, 0])      # s2 = lo
+    vldr(s3, [r3, 4])
+    vsub(s3, s3, s2)       # s3 = hi - lo
+    ldr(r3, [r2, 0])
+    movwt(r5, 0x3F800000)
+    vmov(s1, r5)           # s1 = 1.0
+    label(LOOP)
+    lsl(r4, r3, 13)
+    eor(r3, r4)
+    lsr(r4, r3, 17)
+    eor(r3, r4)
+    lsl(r4, r3, 5)
+    eor(r3, r4)
+    lsr(r4, r3, 9)
+    orr(r4, r5)
+    vmov(s0, r4)
+    vsub(s0, s0, s1)       # s0 = 0.0 <= f < 1.0
+    vmul(s0, s0, s3)
+    vadd(s0, s0, s2)       # s0 = f*(hi - lo) + lo
+    vstr(s0, [r0, 0])
+    add(r0, 4)
+    sub(r1, 1)
+    bgt(LOOP)
+    str(r3, [r2, 0])
+
+
+@micropython.asm_thumb
+def float_array_random_normal(r0, r1, r2, r3):
+  # Fills x with normally-distributed random floats
+  # r0: address of x (output array)
+  # r1: length of x
+  # r2: address of state (array('I') of length 1, non-zero)
+  # r3: address of array('f', [mean, std])
+  # Method (Marsaglia polar form of Box-Muller):
+  # while True:
+  #     u, v = 2*random() - 1, 2*random() - 1
+  #     s = u*u + v*v
+  #     if 0 < s < 1: break
+  # f = sqrt(-2*log(s)/s)
+  # return mean + std*u*f, mean + std*v*f
+    vldr(s6, [r3, 0])      # s6 = mean
+    vldr(s7, [r3, 4])      # s7 = std
+    ldr(r3, [r2, 0])       # r3 = state
+    movwt(r5, 0x3F800000)
+    vmov(s1, r5)           # s1 = 1.0
+    movwt(r6, 0x40000000)
+    vmov(s8, r6)           # s8 = 2.0
+
+    label(PAIR)
+    lsl(r4, r3, 13)        # u = 2*random() - 1
+    eor(r3, r4)
+    lsr(r4, r3, 17)
+    eor(r3, r4)
+    lsl(r4, r3, 5)
+    eor(r3, r4)
+    lsr(r4, r3, 9)
+    orr(r4, r5)
+    vmov(s2, r4)
+    vsub(s2, s2, s1)
+    vmul(s2, s2, s8)
+    vsub(s2, s2, s1)       # s2 = u
+    lsl(r4, r3, 13)        # v = 2*random() - 1
+    eor(r3, r4)
+    lsr(r4, r3, 17)
+    eor(r3, r4)
+    lsl(r4, r3, 5)
+    eor(r3, r4)
+    lsr(r4, r3, 9)
+    orr(r4, r5)
+    vmov(s3, r4)
+    vsub(s3, s3, s1)
+    vmul(s3, s3, s8)
+    vsub(s3, s3, s1)       # s3 = v
+    vmul(s4, s2, s2)
+    vmul(s5, s3, s3)
+    vadd(s4, s4, s5)       # s4 = s = u*u + v*v
+    vcmp(s4, s1)
+    vmrs(APSR_nzcv, FPSCR)
+    bge(PAIR)              # Reject if s >= 1.0
+    vmov(r4, s4)
+    cmp(r4, 0)
+    beq(PAIR)              # Reject if s == 0.0
+
+  # Calculate s12 = log(s)
+    # Method: s = 2**e * m where 1.0 <= m < 2.0
+    # log(s) = e*log(2) + 2*atanh(t), t = (m - 1)/(m + 1)
+    lsr(r6, r4, 23)
+    sub(r6, 127)           # r6 = e
+    movwt(r7, 0x007FFFFF)
+    and_(r7, r4)
+    orr(r7, r5)
+    vmov(s9, r7)           # s9 = m
+    vsub(s10, s9, s1)
+    vadd(s11, s9, s1)
+    vdiv(s10, s10, s11)    # s10 = t
+    vmul(s11, s10, s10)    # s11 = t*t
+    movwt(r7, 0x3DBA2E8C)
+    vmov(s12, r7)          # s12 = 1/11
+    vmul(s12, s12, s11)
+    movwt(r7, 0x3DE38E39)
+    vmov(s13, r7)
+    vadd(s12, s12, s13)    # + 1/9
+    vmul(s12, s12, s11)
+    movwt(r7, 0x3E124925)
+    vmov(s13, r7)
+    vadd(s12, s12, s13)    # + 1/7
+    vmul(s12, s12, s11)
+    movwt(r7, 0x3E4CCCCD)
+    vmov(s13, r7)
+    vadd(s12, s12, s13)    # + 1/5
+    vmul(s12, s12, s11)
+    movwt(r7, 0x3EAAAAAB)
+    vmov(s13, r7)
+    vadd(s12, s12, s13)    # + 1/3
+    vmul(s12, s12, s11)
+    vadd(s12, s12, s1)     # + 1
+    vmul(s12, s12, s10)
+    vmul(s12, s12, s8)     # s12 = log(m)
+    vmov(s13, r6)
+    vcvt_f32_s32(s13, s13)
+    movwt(r7, 0x3F317218)
+    vmov(s14, r7)          # s14 = log(2)
+    vmul(s13, s13, s14)
+    vadd(s12, s12, s13)    # s12 = log(s)
+
+  # Calculate s12 = f = sqrt(-2*log(s)/s)
+    vmul(s12, s12, s8)
+    vdiv(s12, s12, s4)
+    vneg(s12, s12)
+    vsqrt(s12, s12)
+
+  # Save results and increment iterators
+    vmul(s2, s2, s12)
+    vmul(s2, s2, s7)
+    vadd(s2, s2, s6)       # s2 = mean + std*u*f
+    vstr(s2, [r0, 0])
+    add(r0, 4)
+    sub(r1, 1)
+    ble(END)
+    vmul(s3, s3, s12)
+    vmul(s3, s3, s7)
+    vadd(s3, s3, s6)       # s3 = mean + std*v*f
+    vstr(s3, [r0, 0])
+    add(r0, 4)
+    sub(r1, 1)
+    bgt_w(PAIR)            # Wide branch: loop is over 256 bytes
+    label(END)
+    str(r3, [r2, 0])
+
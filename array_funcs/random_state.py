@@ -0,0 +1,64 @@
+'''
+Random number generator state for the functions in random_funcs.
+
+RandomState keeps the xorshift32 state (a one-element array('I'))
+and the parameter arrays, so that streams of random numbers can be
+continued across calls and reproduced by re-seeding.  It calls the
+functions through the array_funcs package so it works with either
+backend.
+
+Example usage:
+>>> from array import array
+>>> from array_funcs.random_state import RandomState
+>>> rs = RandomState(1)
+>>> x = array('f', [0.0]*4)
+>>> rs.uniform(x, -1.0, 1.0)
+>>> x
+array('f', [-0.9998741, -0.9685051, 0.2328081, -0.8567629])
+'''
+
+from array import array
+import array_funcs as af
+
+
+class RandomState:
+
+    def __init__(self, seed=1):
+        self.state = array('I', [1])
+        self._p = array('f', [0.0, 1.0])
+        self.seed(seed)
+
+    def seed(self, seed):
+        # xorshift32 state must not be zero
+        seed &= 0xFFFFFFFF
+        self.state[0] = seed if seed else 0x9E3779B9
+
+    def getstate(self):
+        return self.state[0]
+
+    def setstate(self, state):
+        self.state[0] = state
+
+    def randbits(self, a):
+        af.int_array_random(a, len(a), self.state)
+
+    def randint(self, a, lo, hi):
+        # a = random integers in the range lo <= a < hi
+        if hi <= lo:
+            raise ValueError('hi must be greater than lo')
+        af.int_array_random_range(a, len(a), self.state, hi - lo)
+        if lo != 0:
+            af.int_array_add_scalar(a, len(a), lo)
+
+    def random(self, x):
+        af.float_array_random(x, len(x), self.state)
+
+    def uniform(self, x, lo, hi):
+        self._p[0] = lo
+        self._p[1] = hi
+        af.float_array_random_uniform(x, len(x), self.state, self._p)
+
+    def normal(self, x, mean=0.0, std=1.0):
+        self._p[0] = mean
+        self._p[1] = std
+        af.float_array_random_normal(x, len(x), self.state, self._p)
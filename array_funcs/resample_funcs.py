@@ -0,0 +1,94 @@
+'''
+Polyphase FIR filter for decimation, interpolation and rational
+resampling of arrays of type float.
+
+Resampling by L/M is done by (conceptually) inserting L - 1
+zeros between the input samples, low-pass filtering and keeping
+every M-th sample.  The filter h of length L*K is split into L
+phases of K taps so that only the non-zero samples are used:
+output m uses phase (m*M) % L and K consecutive input samples.
+Decimation is L = 1 and interpolation is M = 1.
+
+The parameters are passed in
+p = array('L', [addressof(bank), L, M, K, phase, i])
+where bank is an array('f') of L*K taps with phase j in
+bank[j*K:(j + 1)*K] in reversed order (see resample.py), and
+phase and i are the phase and the index in x of the first input
+sample of the next output.  They are updated so that the next
+call continues where this one stopped.
+
+Example usage (decimate by 2 with the 2-tap average filter):
+>>> import array_funcs as af
+>>> from array import array
+>>> bank = array('f', [0.5, 0.5])
+>>> x = array('f', [1.0, 3.0, 5.0, 7.0, 9.0, 11.0])
+>>> y = array('f', [0.0]*3)
+>>> p = array('L', [af.addressof(bank), 1, 2, 2, 0, 0])
+>>> af.float_array_polyphase_fir(y, 3, x, p)
+536894992
+>>> y
+array('f', [2.0, 6.0, 10.0])
+>>> p[5]
+6
+'''
+
+
+@micropython.asm_thumb
+def float_array_polyphase_fir(r0, r1, r2, r3):
+  # y[m] = sum(bank[phase*K + k]*x[i + k] for k in range(K))
+  # r0: address of y (output array)
+  # r1: length of y (number of outputs)
+  # r2: address of x (input array)
+  # r3: address of p = array('L', [address of bank, L, M, K,
+  #                                phase, i])
+    ldr(r4, [r3, 0])
+    vmov(s10, r4)          # s10 = address of bank
+    ldr(r4, [r3, 4])
+    vmov(s11, r4)          # s11 = L
+    ldr(r4, [r3, 8])
+    vmov(s12, r4)          # s12 = M
+    ldr(r4, [r3, 12])
+    vmov(s13, r4)          # s13 = K
+    vmov(s14, r3)          # s14 = address of p
+    ldr(r6, [r3, 16])      # r6 = phase
+    ldr(r7, [r3, 20])      # r7 = i
+    mov(r4, 0)
+    vmov(s15, r4)          # s15 = 0.0
+
+    label(OUTPUT)
+    vmov(r3, s13)          # r3 = K (tap counter)
+    mov(r4, r3)
+    mul(r4, r6)
+    lsl(r4, r4, 2)
+    vmov(r5, s10)
+    add(r4, r4, r5)        # r4 = address of bank[phase*K]
+    mov(r5, r7)
+    lsl(r5, r5, 2)
+    add(r5, r5, r2)        # r5 = address of x[i]
+    vsub(s0, s15, s15)     # s0 = sum = 0.0
+    label(TAP)
+    vldr(s1, [r4, 0])
+    vldr(s2, [r5, 0])
+    vmul(s1, s1, s2)
+    vadd(s0, s0, s1)
+    add(r4, 4)
+    add(r5, 4)
+    sub(r3, 1)
+    bgt(TAP)
+    vstr(s0, [r0, 0])
+    add(r0, 4)
+
+    # phase += M, i += phase//L, phase %= L
+    vmov(r3, s12)
+    add(r6, r6, r3)
+    vmov(r3, s11)
+    udiv(r4, r6, r3)
+    add(r7, r7, r4)
+    mul(r4, r3)
+    sub(r6, r6, r4)
+    sub(r1, 1)
+    bgt(OUTPUT)
+
+    vmov(r3, s14)
+    str(r6, [r3, 16])
+    str(r7, [r3, 20])
@@ -0,0 +1,179 @@
+'''
+Functions for sparse vectors and sparse matrices in compressed
+sparse row (CSR) format with arrays of type float.
+
+A sparse vector of nnz non-zero elements is stored in two arrays,
+values (array('f')) and indices (array('i')), and passed to the
+functions as s = array('L', [addressof(values), addressof(indices)]).
+
+A CSR matrix is stored in three arrays: values (array('f')) and
+cols (array('i')) hold the non-zero elements of each row in turn
+and their column indices, and rowptr (array('i') of length
+n_rows + 1) holds the position in values of the start of each
+row, so row r is values[rowptr[r]:rowptr[r + 1]] and
+rowptr[n_rows] is the number of non-zero elements.  It is passed
+as p = array('L', [addressof(values), addressof(cols),
+addressof(rowptr)]).
+
+float_array_compress(x, n, s, t) stores the elements of x with
+abs(x[i]) > threshold, where t = array('f', [threshold]), in the
+sparse vector s = array('L', [addressof(values),
+addressof(indices), capacity]) and returns their number.  If the
+number is larger than capacity only the first capacity elements
+are stored.
+
+These functions accept nnz = 0 and empty rows.
+
+Example usage:
+>>> import array_funcs as af
+>>> from array import array
+>>> x = array('f', [0.0, 2.0, 0.0, 0.0, -1.0])
+>>> values = array('f', [0.0]*5)
+>>> indices = array('i', [0]*5)
+>>> s = array('L', [af.addressof(values), af.addressof(indices), 5])
+>>> af.float_array_compress(x, len(x), s, array('f', [0.0]))
+2
+>>> y = array('f', [1.0, 1.0, 1.0, 1.0, 1.0])
+>>> v = array('f', [0.0])
+>>> af.float_array_sparse_dot(y, 2, s, v)
+536894992
+>>> v
+array('f', [1.0])
+'''
+
+
+@micropython.asm_thumb
+def float_array_csr_matvec(r0, r1, r2, r3):
+  # y = A*x for the CSR matrix A
+  # r0: address of y (array('f') of length n_rows)
+  # r1: n_rows
+  # r2: address of x (array('f') of length n_cols)
+  # r3: address of p = array('L', [address of values, address of
+  #                                cols, address of rowptr])
+    ldr(r4, [r3, 0])       # r4 = address of values[k]
+    ldr(r5, [r3, 4])       # r5 = address of cols[k]
+    ldr(r3, [r3, 8])       # r3 = address of rowptr[r]
+    mov(r6, 0)
+    vmov(s15, r6)          # s15 = 0.0
+    label(ROW)
+    ldr(r6, [r3, 4])
+    ldr(r7, [r3, 0])
+    sub(r6, r6, r7)        # r6 = number of elements in row r
+    add(r3, 4)
+    vsub(s0, s15, s15)     # s0 = sum = 0.0
+    cmp(r6, 0)
+    ble(STORE)
+    label(LOOP)
+    ldr(r7, [r5, 0])
+    lsl(r7, r7, 2)
+    add(r7, r7, r2)
+    vldr(s1, [r7, 0])      # x[cols[k]]
+    vldr(s2, [r4, 0])      # values[k]
+    vmul(s1, s1, s2)
+    vadd(s0, s0, s1)
+    add(r4, 4)
+    add(r5, 4)
+    sub(r6, 1)
+    bgt(LOOP)
+    label(STORE)
+    vstr(s0, [r0, 0])
+    add(r0, 4)
+    sub(r1, 1)
+    bgt(ROW)
+
+@micropython.asm_thumb
+def float_array_sparse_dot(r0, r1, r2, r3):
+  # v = sum(values[k]*x[indices[k]])
+  # r0: address of x (dense array)
+  # r1: nnz
+  # r2: address of s = array('L', [address of values,
+  #                                address of indices])
+  # r3: address of v = array('f', [0.0]) (result)
+    ldr(r4, [r2, 0])
+    ldr(r5, [r2, 4])
+    mov(r6, 0)
+    vmov(s0, r6)           # s0 = sum = 0.0
+    cmp(r1, 0)
+    ble(END)
+    label(LOOP)
+    ldr(r6, [r5, 0])
+    lsl(r6, r6, 2)
+    add(r6, r6, r0)
+    vldr(s1, [r6, 0])
+    vldr(s2, [r4, 0])
+    vmul(s1, s1, s2)
+    vadd(s0, s0, s1)
+    add(r4, 4)
+    add(r5, 4)
+    sub(r1, 1)
+    bgt(LOOP)
+    label(END)
+    vstr(s0, [r3, 0])
+
+@micropython.asm_thumb
+def float_array_add_sparse(r0, r1, r2, r3):
+  # x[indices[k]] += v*values[k]
+  # r0: address of x (dense array)
+  # r1: nnz
+  # r2: address of s = array('L', [address of values,
+  #                                address of indices])
+  # r3: address of v = array('f', [scale])
+    ldr(r4, [r2, 0])
+    ldr(r5, [r2, 4])
+    vldr(s3, [r3, 0])
+    cmp(r1, 0)
+    ble(END)
+    label(LOOP)
+    ldr(r6, [r5, 0])
+    lsl(r6, r6, 2)
+    add(r6, r6, r0)
+    vldr(s1, [r6, 0])
+    vldr(s2, [r4, 0])
+    vmul(s2, s2, s3)
+    vadd(s1, s1, s2)
+    vstr(s1, [r6, 0])
+    add(r4, 4)
+    add(r5, 4)
+    sub(r1, 1)
+    bgt(LOOP)
+    label(END)
+
+@micropython.asm_thumb
+def float_array_compress(r0, r1, r2, r3):
+  # s = elements of x with abs(x[i]) > threshold
+  # r0: address of x
+  # r1: length of x
+  # r2: address of s = array('L', [address of values,
+  #                                address of indices, capacity])
+  # r3: address of t = array('f', [threshold])
+  # Returns the number of elements (which may be > capacity)
+    ldr(r4, [r2, 0])       # r4 = address of values
+    ldr(r5, [r2, 4])       # r5 = address of indices
+    ldr(r6, [r2, 8])       # r6 = capacity
+    vldr(s3, [r3, 0])      # s3 = threshold
+    vneg(s4, s3)           # s4 = -threshold
+    mov(r3, 0)             # r3 = count
+    mov(r7, 0)             # r7 = i
+    label(LOOP)
+    vldr(s0, [r0, 0])
+    vcmp(s0, s3)
+    vmrs(APSR_nzcv, FPSCR)
+    bgt(KEEP)
+    vcmp(s0, s4)
+    vmrs(APSR_nzcv, FPSCR)
+    bmi(KEEP)              # x[i] < -threshold
+    b(NEXT)
+    label(KEEP)
+    add(r3, 1)
+    cmp(r3, r6)
+    bgt(NEXT)              # full
+    vstr(s0, [r4, 0])
+    str(r7, [r5, 0])
+    add(r4, 4)
+    add(r5, 4)
+    label(NEXT)
+    add(r0, 4)
+    add(r7, 1)
+    sub(r1, 1)
+    bgt(LOOP)
+    mov(r0, r3)
@@ -0,0 +1,39 @@
+'''
+Measures the import time and free heap of array_funcs on the
+board.  Run it straight after a reset so that nothing has been
+imported yet, with either the .py sources, the .mpy files from
+build_mpy.py or frozen firmware installed:
+
+>>> import bench_import
+'''
+
+import gc
+import utime
+
+def step(label, f):
+    gc.collect()
+    free = gc.mem_free()
+    t = utime.ticks_us()
+    f()
+    delta = utime.ticks_diff(utime.ticks_us(), t)
+    gc.collect()
+    print('{:32s} {:8.3f}ms {:8d} bytes free ({:+d})'.format(
+        label, delta/1000, gc.mem_free(), gc.mem_free() - free))
+
+def import_package():
+    global af
+    import array_funcs as af
+
+def access_three_kernels():
+    af.float_array_add_scalar
+    af.float_array_mul_array
+    af.int_array_sum
+
+def load_all():
+    af.load()
+
+gc.collect()
+print('Free heap before import: {} bytes'.format(gc.mem_free()))
+step('import array_funcs', import_package)
+step('access 3 kernels (2 families)', access_three_kernels)
+step('load all families', load_all)
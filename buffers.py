@@ -0,0 +1,127 @@
+'''
+Double-buffered (ping-pong) acquisition for use with the
+array functions in MicroPython.
+
+A producer (timer callback, interrupt handler or a simulated
+source) writes samples into one preallocated array while the
+previously filled array is processed by a chain of array_funcs
+kernels.  When the write buffer is full the two buffers are
+swapped and processing of the full one is requested with
+micropython.schedule so that it runs outside the interrupt.
+
+Nothing is allocated in the producer path (put and isr) so it
+is safe to call from a hard interrupt.  If the producer fills a
+buffer before the other one has been processed, the new frame
+is dropped and the overruns counter is incremented.
+
+Example usage:
+>>> import array_funcs as af
+>>> from array import array
+>>> from buffers import PingPong
+>>> from pyb import ADC, Pin, Timer
+>>> adc = ADC(Pin('X19'))
+>>> pp = PingPong('i', 256, source=adc.read)
+>>> offset = 2048
+>>> pp.add_stage(af.int_array_sub_scalar, offset)
+>>> pp.callback = lambda a: print(af.int_array_max(a, len(a)))
+>>> tim = Timer(4, freq=10000)
+>>> tim.callback(pp.isr)
+'''
+
+from array import array
+
+try:
+    from micropython import schedule
+except ImportError:
+    # CPython: frames are processed as soon as they are full
+    schedule = None
+
+
+class PingPong:
+
+    def __init__(self, typecode, n, source=None, callback=None):
+        self.n = n
+        self.bufs = (array(typecode, [0]*n), array(typecode, [0]*n))
+        self.source = source
+        self.callback = callback
+        self.frames = 0
+        self.overruns = 0
+        self._stages = []
+        self._write = 0    # index of buffer being filled
+        self._pos = 0      # next position in the write buffer
+        self._ready = -1   # index of full buffer or -1 if none
+        # Bound method is created here so that the interrupt
+        # handler does not allocate when scheduling it
+        self._process_ref = self.process
+
+    def add_stage(self, f, *args):
+        # Appends kernel f to the processing chain. It is called
+        # as f(buf, len(buf), *args) on every full buffer.
+        self._stages.append((f, args))
+
+    def clear_stages(self):
+        self._stages = []
+
+    def reset(self):
+        self.frames = 0
+        self.overruns = 0
+        self._write = 0
+        self._pos = 0
+        self._ready = -1
+
+    def put(self, value):
+        # Producer path: stores one sample. Safe in an ISR.
+        self.bufs[self._write][self._pos] = value
+        self._pos += 1
+        if self._pos < self.n:
+            return
+        self._pos = 0
+        if self._ready != -1:
+            # Consumer has not finished with the other buffer
+            # so this frame is overwritten
+            self.overruns += 1
+            return
+        self._ready = self._write
+        self._write ^= 1
+        if schedule is None:
+            self.process()
+            return
+        try:
+            schedule(self._process_ref, None)
+        except RuntimeError:
+            # Schedule queue full; poll() will pick it up
+            pass
+
+    def isr(self, _):
+        # Timer or pin callback reading one sample from source
+        self.put(self.source())
+
+    def feed(self, samples):
+        # Simulated producer: puts every value from an iterable
+        for value in samples:
+            self.put(value)
+
+    def poll(self):
+        # Processes a full buffer if one is waiting. Returns
+        # True if a frame was processed.
+        if self._ready == -1:
+            return False
+        self.process()
+        return True
+
+    def process(self, _=None):
+        i = self._ready
+        if i == -1:
+            return
+        buf = self.bufs[i]
+        n = self.n
+        try:
+            for f, args in self._stages:
+                f(buf, n, *args)
+            if self.callback is not None:
+                self.callback(buf)
+        finally:
+            # Release the buffer even if a stage raised, otherwise
+            # every later frame would count as an overrun
+            self._ready = -1
+        self.frames += 1
@@ -0,0 +1,55 @@
+'''
+Precompiles the array_funcs package and helper modules to .mpy
+files with mpy-cross, to be copied to the board's filesystem.
+
+Loading .mpy files skips compiling the source on the board,
+which reduces import time and the peak heap used by the
+compiler.  The -march option is required because the modules
+contain inline assembler (use armv7emsp for the PYBoard and
+other STM32F4 boards).
+
+Usage:
+    python build_mpy.py [-march=armv7emsp] [-o build]
+
+For frozen firmware use manifest.py instead.
+'''
+
+import argparse
+import glob
+import os
+import subprocess
+import sys
+
+# host_funcs.py needs NumPy and is only used on a computer
+SOURCES = (
+    [src for src in glob.glob(os.path.join('array_funcs', '*.py'))
+     if os.path.basename(src) != 'host_funcs.py'] +
+    ['buffers.py', 'timers.py', 'exp_funcs.py', 'pow_funcs.py',
+     'linalg.py', 'profiler.py', 'nn.py', 'resample.py', 'cluster.py',
+     'sparse.py']
+)
+
+
+def build(march, out_dir, mpy_cross='mpy-cross'):
+    for src in sorted(SOURCES):
+        dst = os.path.join(out_dir, os.path.splitext(src)[0] + '.mpy')
+        os.makedirs(os.path.dirname(dst) or '.', exist_ok=True)
+        cmd = [mpy_cross, '-march=' + march, '-o', dst, src]
+        print(' '.join(cmd))
+        subprocess.check_call(cmd)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('-march', default='armv7emsp',
+                        help='mpy-cross target architecture')
+    parser.add_argument('-o', '--out', default='build',
+                        help='output directory')
+    parser.add_argument('--mpy-cross', default='mpy-cross',
+                        help='path to the mpy-cross executable')
+    args = parser.parse_args(argv)
+    build(args.march, args.out, args.mpy_cross)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,139 @@
+'''
+Nearest-neighbour classification and k-means clustering with the
+distance functions.
+
+Vectors are stored in flat arrays of type float in row-major
+order, so vector j of a set of vectors of length dim is
+X[j*dim:(j + 1)*dim].  The classes allocate their work arrays
+when they are created so queries and k-means steps (step()) do
+not allocate memory.
+
+Example usage:
+>>> from array import array
+>>> import cluster
+>>> P = array('f', [0.0, 0.0, 0.1, 0.2, 5.0, 5.0, 5.2, 4.9])
+>>> knn = cluster.NearestNeighbours(P, 4, 2, array('i', [0, 0, 1, 1]))
+>>> knn.classify(array('f', [4.0, 4.5]), 3)
+1
+>>> km = cluster.KMeans(array('f', [0.0, 0.0, 1.0, 1.0]), 2, 2)
+>>> labels = array('i', [0]*4)
+>>> km.fit(P, 4, labels)
+>>> labels
+array('i', [0, 0, 1, 1])
+'''
+
+from array import array
+import array_funcs as af
+
+_DISTANCES = {
+    'sq': 'float_array_sqdist',
+    'l1': 'float_array_l1dist',
+    'cos': 'float_array_cosdist'
+}
+
+
+class NearestNeighbours:
+
+    def __init__(self, P, m, dim, labels=None, metric='sq'):
+        # P: m prototypes of length dim, labels: array('i') of
+        # their classes (for classify), metric: 'sq' (squared
+        # Euclidean), 'l1' (Manhattan) or 'cos' (cosine)
+        if metric not in _DISTANCES:
+            raise ValueError('unknown metric: {}'.format(metric))
+        self.P = P
+        self.m = m
+        self.dim = dim
+        self.labels = labels
+        self.distance = getattr(af, _DISTANCES[metric])
+        self.d = array('f', [0.0]*m)
+        self.idx = array('i', [0]*m)
+        self._p = array('L', [0, dim])
+
+    def distances(self, q):
+        # Returns the distances from q to all the prototypes (the
+        # array self.d, overwritten by the next query)
+        self._p[0] = af.addressof(q)
+        self.distance(self.d, self.m, self.P, self._p)
+        return self.d
+
+    def query(self, q, k=1):
+        # Returns the number of neighbours found, min(k, m).  Their
+        # indices, nearest first, are in self.idx[:k] and their
+        # distances in self.d.
+        if k < 1:
+            raise ValueError('k must be at least 1')
+        self.distances(q)
+        return af.float_array_nsmallest(self.idx, k, self.d, self.m)
+
+    def classify(self, q, k=1):
+        # Returns the most common label of the k nearest
+        # prototypes (the nearest of the tied labels)
+        count = self.query(q, k)
+        best, votes = self.labels[self.idx[0]], 0
+        for i in range(count):
+            label = self.labels[self.idx[i]]
+            n = 0
+            for j in range(count):
+                if self.labels[self.idx[j]] == label:
+                    n += 1
+            if n > votes:
+                best, votes = label, n
+        return best
+
+
+class KMeans:
+
+    def __init__(self, C, k, dim):
+        # C: initial centroids (k x dim), updated in place
+        self.C = C
+        self.k = k
+        self.dim = dim
+        self.S = array('f', [0.0]*k*dim)
+        self.counts = array('i', [0]*k)
+        # Views of the rows of C and S, made once because slicing a
+        # memoryview allocates
+        mv, ms = memoryview(C), memoryview(self.S)
+        self._c_rows = [mv[c*dim:(c + 1)*dim] for c in range(k)]
+        self._s_rows = [ms[c*dim:(c + 1)*dim] for c in range(k)]
+        self._zero = array('f', [0.0])
+        self._v = array('f', [0.0])
+        self._p_assign = array('L', [af.addressof(C), k, dim])
+        self._p_sums = array('L', [0, dim, af.addressof(self.counts)])
+
+    def assign(self, X, m, labels):
+        # Sets labels (array('i') of length m) to the nearest
+        # centroid of each of the m points in X
+        af.float_array_assign_nearest(labels, m, X, self._p_assign)
+
+    def update(self, X, m, labels):
+        # Moves each centroid to the mean of its points.  Centroids
+        # without points are not moved.
+        k, dim = self.k, self.dim
+        af.float_array_assign_scalar(self.S, k*dim, self._zero)
+        af.int_array_assign_scalar(self.counts, k, 0)
+        self._p_sums[0] = af.addressof(labels)
+        af.float_array_centroid_sums(self.S, m, X, self._p_sums)
+        for c in range(k):
+            if self.counts[c] > 0:
+                self._v[0] = self.counts[c]
+                af.float_array_div_scalar(self._s_rows[c], dim, self._v)
+                af.float_array_copy(self._c_rows[c], dim, self._s_rows[c])
+
+    def step(self, X, m, labels):
+        # One k-means iteration
+        self.assign(X, m, labels)
+        self.update(X, m, labels)
+
+    def fit(self, X, m, labels, iterations=10):
+        # Runs k-means until the labels do not change (at most
+        # iterations steps).  Copies the labels at each step.
+        self.assign(X, m, labels)
+        for i in range(iterations):
+            self.update(X, m, labels)
+            old = array('i', labels)
+            self.assign(X, m, labels)
+            for j in range(m):
+                if old[j] != labels[j]:
+                    break
+            else:
+                break
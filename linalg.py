@@ -0,0 +1,147 @@
+'''
+Small dense linear solvers for MicroPython using the array
+functions.
+
+Matrices are stored in row-major order in flat arrays of type
+float, so element (i, j) of an n x n matrix A is A[i*n + j].
+All functions work in place.  lu_factor and lu_solve use the
+LU functions (linalg_funcs), which do a whole elimination step or
+solve per call, so they take O(n) calls.  The other functions
+allocate a few memoryview slices which are passed to the array
+functions for the row updates.  Each row update is one call to
+float_array_add_scaled_array or float_array_dot, so they take
+O(n**2) calls rather than O(n**3) Python operations.
+
+Example usage:
+>>> from array import array
+>>> import linalg
+>>> A = array('f', [4.0, 2.0, 2.0, 3.0])
+>>> b = array('f', [2.0, 1.0])
+>>> linalg.cholesky(A, 2)
+>>> linalg.cho_solve(A, 2, b)
+>>> b
+array('f', [0.5, 0.0])
+'''
+
+from array import array
+import math
+import array_funcs as af
+
+
+def lu_factor(A, n, piv):
+    # LU factorization with partial pivoting, P*A = L*U.
+    # A is overwritten with L (unit diagonal, not stored) and
+    # U.  Rows are not swapped in memory: row i of P*A is row
+    # piv[i] of A, where piv is an array('i') of length n.
+    for i in range(n):
+        piv[i] = i
+    for k in range(n):
+        # Pivot search, multipliers and row updates in one call
+        if not af.float_array_lu_step(A, n, piv, k):
+            raise ValueError('matrix is singular')
+
+
+def lu_solve(A, n, piv, b, x, p=None):
+    # Solves A*x = b using the factorization from lu_factor.
+    # b is not modified.  p is an optional array('L', [0, 0]) for
+    # the addresses of piv and b; pass the same one on every call
+    # so that repeated solves do not allocate memory.
+    if p is None:
+        p = array('L', [0, 0])
+    p[0] = af.addressof(piv)
+    p[1] = af.addressof(b)
+    af.float_array_lu_solve(x, n, A, p)
+
+
+def cholesky(A, n):
+    # Cholesky factorization of a symmetric positive-definite
+    # matrix, A = R.T*R.  The upper triangle of A is overwritten
+    # with R.  The lower triangle is not used.
+    mv = memoryview(A)
+    v = array('f', [0.0])
+    for k in range(n):
+        rk = k*n
+        d = A[rk + k]
+        if not d > 0.0:
+            raise ValueError('matrix is not positive definite')
+        d = math.sqrt(d)
+        A[rk + k] = d
+        m = n - k - 1
+        if m == 0:
+            break
+        v[0] = d
+        af.float_array_div_scalar(mv[rk + k + 1:rk + n], m, v)
+        for i in range(k + 1, n):
+            ri = i*n
+            v[0] = -A[rk + i]
+            af.float_array_add_scaled_array(mv[ri + i:ri + n], n - i,
+                                            mv[rk + i:rk + n], v)
+
+
+def cho_solve(R, n, b):
+    # Solves A*x = b in place (b = x) using R from cholesky
+    mv = memoryview(R)
+    mb = memoryview(b)
+    v = array('f', [0.0])
+    # R.T*y = b (column-oriented forward substitution)
+    for k in range(n):
+        rk = k*n
+        b[k] /= R[rk + k]
+        if k < n - 1:
+            v[0] = -b[k]
+            af.float_array_add_scaled_array(mb[k + 1:], n - k - 1,
+                                            mv[rk + k + 1:rk + n], v)
+    back_sub(R, n, b)
+
+
+def forward_sub(L, n, b):
+    # Solves L*x = b in place where L is lower triangular
+    mv = memoryview(L)
+    mb = memoryview(b)
+    v = array('f', [0.0])
+    for i in range(n):
+        ri = i*n
+        s = b[i]
+        if i > 0:
+            af.float_array_dot(mv[ri:ri + i], i, mb, v)
+            s -= v[0]
+        b[i] = s/L[ri + i]
+
+
+def back_sub(U, n, b):
+    # Solves U*x = b in place where U is upper triangular
+    mv = memoryview(U)
+    mb = memoryview(b)
+    v = array('f', [0.0])
+    for i in range(n - 1, -1, -1):
+        ri = i*n
+        s = b[i]
+        if i < n - 1:
+            af.float_array_dot(mv[ri + i + 1:ri + n], n - i - 1,
+                               mb[i + 1:], v)
+            s -= v[0]
+        b[i] = s/U[ri + i]
+
+
+def lstsq(A, m, n, b, x, G):
+    # Least-squares solution of A*x = b where A is m x n (m >= n)
+    # by the normal equations (A.T*A)*x = A.T*b.  G is an n x n
+    # work array.  A and b are not modified.
+    # Note: the normal equations square the condition number of
+    # A so scale the columns of A to similar magnitudes.
+    ma = memoryview(A)
+    mg = memoryview(G)
+    v = array('f', [0.0])
+    af.float_array_assign_scalar(G, n*n, v)
+    af.float_array_assign_scalar(x, n, v)
+    for r in range(m):
+        row = r*n
+        v[0] = b[r]
+        af.float_array_add_scaled_array(x, n, ma[row:row + n], v)
+        for i in range(n):
+            # Upper triangle of G += A[r, i]*A[r, i:]
+            v[0] = A[row + i]
+            af.float_array_add_scaled_array(mg[i*n + i:(i + 1)*n], n - i,
+                                            ma[row + i:row + n], v)
+    cholesky(G, n)
+    cho_solve(G, n, x)
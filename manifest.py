@@ -0,0 +1,32 @@
+# Manifest for freezing array_funcs into MicroPython firmware.
+# Frozen modules are executed from flash so importing them uses
+# no heap for bytecode.  Build with e.g.:
+#   make -C ports/stm32 BOARD=PYBV11 FROZEN_MANIFEST=/path/to/manifest.py
+include("$(PORT_DIR)/boards/manifest.py")
+# host_funcs.py (NumPy, for computers only) is left out
+package("array_funcs", files=[
+    "__init__.py",
+    "int_funcs.py",
+    "float_funcs.py",
+    "conv_funcs.py",
+    "math_funcs.py",
+    "random_funcs.py",
+    "random_state.py",
+    "complex_funcs.py",
+    "opqueue_funcs.py",
+    "program.py",
+    "quant_funcs.py",
+    "resample_funcs.py",
+    "event_funcs.py",
+    "distance_funcs.py",
+    "sparse_funcs.py",
+    "linalg_funcs.py",
+])
+module("buffers.py")
+module("timers.py")
+module("linalg.py")
+module("profiler.py")
+module("nn.py")
+module("resample.py")
+module("cluster.py")
+module("sparse.py")
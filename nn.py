@@ -0,0 +1,273 @@
+'''
+Quantized (int8) inference for small fully connected neural
+networks (multilayer perceptrons) using the array functions.
+
+Weights are stored in arrays of type 'b' with one scale per
+layer (symmetric quantization, W_real = w_scale*W) and biases in
+arrays of type 'i' in units of in_scale*w_scale.  Activations are
+int8 with a scale and zero point per layer.  Each layer is an
+int32 matrix-vector product (int8_dense) followed by
+requantization to int8 with a fused ReLU clamp, or a table
+lookup for tanh and sigmoid.  The last layer is converted to
+floats, with an optional softmax.
+
+All buffers (the int8 activation arena, the int32 accumulator,
+the output and a work array for the last layer) are allocated
+when the Network is created and every activation of the last
+layer is done with the array functions, so predict() does not
+allocate memory.
+
+Example usage:
+>>> import nn
+>>> from array import array
+>>> net = nn.load('model.qnn')
+>>> features = array('f', [0.0]*net.n_in)
+>>> probabilities = net.predict(features)
+>>> label = net.predict_class(features)
+'''
+
+from array import array
+import math
+import struct
+import array_funcs as af
+
+# Activation functions, stored by index in weight files
+ACTIVATIONS = (None, 'relu', 'tanh', 'sigmoid', 'softmax')
+
+# Output quantization (scale, zero point) of the lookup tables
+_TABLE_QUANT = {
+    'tanh': (1/128, 0),
+    'sigmoid': (1/256, -128)
+}
+
+_MAGIC = b'QNN1'
+_HEADER = '<4sfbB'      # magic, in_scale, in_zero, number of layers
+_LAYER = '<HHBffb'      # n_in, n_out, activation, w_scale,
+                        # out_scale, out_zero
+
+
+class Dense:
+
+    def __init__(self, W, bias, n_in, n_out, w_scale, out_scale=1.0,
+                 out_zero=0, activation=None):
+        # W: array('b') of n_out x n_in weights in row-major order
+        # bias: array('i') of n_out biases
+        # out_scale, out_zero: quantization of the output before
+        # the activation function (not used by the last layer)
+        if activation not in ACTIVATIONS:
+            raise ValueError('unknown activation: {}'.format(activation))
+        if len(W) < n_in*n_out or len(bias) < n_out:
+            raise ValueError('weights do not match layer size')
+        self.W = W
+        self.bias = bias
+        self.n_in = n_in
+        self.n_out = n_out
+        self.w_scale = w_scale
+        self.out_scale = out_scale
+        self.out_zero = out_zero
+        self.activation = activation
+
+
+def quantize_weights(weights):
+    # Returns array('b') and scale for a sequence of float weights
+    m = max([abs(w) for w in weights])
+    scale = m/127 if m > 0.0 else 1.0
+    return array('b', [round(w/scale) for w in weights]), scale
+
+def quantize_bias(bias, in_scale, w_scale):
+    # Returns array('i') of biases in units of in_scale*w_scale
+    s = in_scale*w_scale
+    return array('i', [round(b/s) for b in bias])
+
+def quantization(lo, hi):
+    # Returns (scale, zero point) for int8 values covering the
+    # real range lo to hi (which must include 0.0)
+    scale = (hi - lo)/255 if hi > lo else 1.0
+    return scale, max(-128, min(127, round(-128 - lo/scale)))
+
+def _limits(scale, zero, lo=-128, hi=127):
+    # Parameter array for int8_array_requantize and
+    # int8_array_from_float_array
+    return array('f', [scale, zero + 128.5, lo + 128, hi + 128])
+
+
+class Network:
+
+    def __init__(self, layers, in_scale, in_zero):
+        # layers: list of Dense, in_scale and in_zero: quantization
+        # of the input features
+        if not layers:
+            raise ValueError('no layers')
+        for k in range(len(layers)):
+            layer = layers[k]
+            if k > 0 and layer.n_in != layers[k - 1].n_out:
+                raise ValueError('layer {} has {} inputs, expected {}'
+                                 .format(k, layer.n_in,
+                                         layers[k - 1].n_out))
+            if layer.activation == 'softmax' and k < len(layers) - 1:
+                raise ValueError('softmax must be the last layer')
+        self.layers = layers
+        self.in_scale = in_scale
+        self.in_zero = in_zero
+        self.n_in = layers[0].n_in
+        self.n_out = layers[-1].n_out
+
+        width = max([self.n_in] + [layer.n_out for layer in layers])
+        self.arena = array('b', [0]*2*width)
+        mv = memoryview(self.arena)
+        bufs = (mv[:width], mv[width:])
+        self._acc = array('i', [0]*width)
+        self.output = array('f', [0.0]*self.n_out)
+        self._work = array('f', [0.0]*self.n_out)
+        self._v = array('f', [0.0])
+        self._input = bufs[0]
+        self._q_in = _limits(1/in_scale, in_zero)
+
+        # Per layer: (layer, bias with the input zero point folded
+        # in, p for int8_dense, output buffer, q for requantize,
+        # lookup table)
+        self._steps = []
+        scale, zero = in_scale, in_zero
+        for k in range(len(layers)):
+            layer = layers[k]
+            x, y = bufs[k % 2], bufs[(k + 1) % 2]
+            W = layer.W
+            n = layer.n_in
+            # sum(W*(x - zero)) = sum(W*x) - zero*sum(W)
+            bias = array('i', [layer.bias[o] - zero*sum(W[o*n:(o + 1)*n])
+                               for o in range(layer.n_out)])
+            p = array('L', [af.addressof(x), n])
+            acc_scale = scale*layer.w_scale
+            q, table = None, None
+            if k < len(layers) - 1:
+                act = layer.activation
+                lo = layer.out_zero if act == 'relu' else -128
+                q = _limits(acc_scale/layer.out_scale, layer.out_zero, lo)
+                scale, zero = layer.out_scale, layer.out_zero
+                if act in _TABLE_QUANT:
+                    table = self._table(act, scale, zero)
+                    scale, zero = _TABLE_QUANT[act]
+            self._steps.append((layer, bias, p, y, q, table, acc_scale))
+
+    def _table(self, act, scale, zero):
+        # Lookup table from int8 inputs to int8 outputs of act
+        f = math.tanh if act == 'tanh' else \
+            lambda r: 1/(1 + math.exp(-r))
+        out_scale, out_zero = _TABLE_QUANT[act]
+        table = array('b', [0]*256)
+        for i in range(256):
+            r = f(scale*(i - 128 - zero))
+            table[i] = max(-128, min(127, round(r/out_scale) + out_zero))
+        return table
+
+    def predict(self, x):
+        # Returns the output for the input features x (array('f')
+        # of length n_in).  The result is the array self.output
+        # which is overwritten by the next call.
+        acc = self._acc
+        af.int8_array_from_float_array(self._input, self.n_in, x,
+                                       self._q_in)
+        for layer, bias, p, y, q, table, acc_scale in self._steps:
+            n = layer.n_out
+            af.int_array_copy(acc, n, bias)
+            af.int8_dense(acc, n, layer.W, p)
+            if q is not None:
+                af.int8_array_requantize(y, n, acc, q)
+                if table is not None:
+                    af.int8_array_lookup(y, n, table)
+        self._finish(layer, acc, acc_scale)
+        return self.output
+
+    def _finish(self, layer, acc, acc_scale):
+        # Converts the last layer to floats and applies its
+        # activation function
+        out = self.output
+        n = self.n_out
+        v = self._v
+        af.float_array_from_int_array(out, n, acc)
+        v[0] = acc_scale
+        af.float_array_mul_scalar(out, n, v)
+        act = layer.activation
+        if act == 'softmax':
+            af.float_array_max(out, n, v)
+            af.float_array_sub_scalar(out, n, v)
+            af.float_array_exp(out, n, out)
+            af.float_array_sum(out, n, v)
+            af.float_array_div_scalar(out, n, v)
+        elif act == 'relu':
+            # (x + abs(x))/2 is exact
+            w = self._work
+            af.float_array_copy(w, n, out)
+            af.float_array_abs(w, n)
+            af.float_array_add_array(out, n, w)
+            v[0] = 0.5
+            af.float_array_mul_scalar(out, n, v)
+        elif act == 'tanh':
+            # tanh(x) = 2*sigmoid(2*x) - 1
+            v[0] = 2.0
+            af.float_array_mul_scalar(out, n, v)
+            self._sigmoid(out, n)
+            v[0] = 2.0
+            af.float_array_mul_scalar(out, n, v)
+            v[0] = 1.0
+            af.float_array_sub_scalar(out, n, v)
+        elif act == 'sigmoid':
+            self._sigmoid(out, n)
+
+    def _sigmoid(self, out, n):
+        # out = 1/(1 + exp(-out)) with the array functions
+        w = self._work
+        v = self._v
+        af.float_array_neg(out, n)
+        af.float_array_exp(w, n, out)
+        v[0] = 1.0
+        af.float_array_add_scalar(w, n, v)
+        af.float_array_assign_scalar(out, n, v)
+        af.float_array_div_array(out, n, w)
+
+    def predict_class(self, x):
+        # Returns the index of the largest output
+        out = self.predict(x)
+        best = 0
+        for i in range(1, self.n_out):
+            if out[i] > out[best]:
+                best = i
+        return best
+
+
+def save(net, filename):
+    # Writes the network to a weight file
+    with open(filename, 'wb') as f:
+        f.write(struct.pack(_HEADER, _MAGIC, net.in_scale, net.in_zero,
+                            len(net.layers)))
+        for layer in net.layers:
+            f.write(struct.pack(_LAYER, layer.n_in, layer.n_out,
+                                ACTIVATIONS.index(layer.activation),
+                                layer.w_scale, layer.out_scale,
+                                layer.out_zero))
+            f.write(layer.W)
+            f.write(layer.bias)
+
+def load(filename):
+    # Reads a network from a weight file written by save()
+    with open(filename, 'rb') as f:
+        magic, in_scale, in_zero, count = struct.unpack(
+            _HEADER, f.read(struct.calcsize(_HEADER)))
+        if magic != _MAGIC:
+            raise ValueError('not a weight file')
+        layers = []
+        size = struct.calcsize(_LAYER)
+        for k in range(count):
+            n_in, n_out, act, w_scale, out_scale, out_zero = \
+                struct.unpack(_LAYER, f.read(size))
+            if act >= len(ACTIVATIONS):
+                raise ValueError('unknown activation in layer {}'
+                                 .format(k))
+            W = array('b', [0]*n_in*n_out)
+            bias = array('i', [0]*n_out)
+            if f.readinto(W) != len(W) or \
+               f.readinto(bias) != 4*n_out:
+                raise ValueError('weight file is truncated')
+            layers.append(Dense(W, bias, n_in, n_out, w_scale, out_scale,
+                                out_zero, ACTIVATIONS[act]))
+    return Network(layers, in_scale, in_zero)
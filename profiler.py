@@ -0,0 +1,164 @@
+'''
+Per-function profiling counters for the array functions.
+
+When profiling is enabled, every function in the array_funcs
+package (and in the exp_funcs and pow_funcs modules, if they
+have been imported) is replaced by a wrapper which records the
+number of calls, the total number of elements processed (the
+length argument) and the total and maximum time of the calls in
+microseconds.  The counters are kept in arrays allocated once,
+the first time profiling is enabled.
+
+Only the families that have already been loaded are wrapped by
+enable(); a family loaded while profiling is on is wrapped as it
+is loaded, so profiling does not assemble unused families.
+
+disable() puts the original functions back, so there is no
+overhead at all when profiling is off.  Note that functions
+bound before enable() is called, e.g. with
+'from array_funcs import float_array_sum', are not profiled.
+The elements are not counted for opqueue_run, int8_dense and
+float_array_nsmallest, whose second argument is not the number
+of elements.
+
+Example usage:
+>>> import profiler
+>>> profiler.enable()
+>>> run_control_loop()
+>>> profiler.disable()
+>>> profiler.report()
+Function                          Calls   Elements   Total ms  Mean us   Max us
+...
+'''
+
+from array import array
+import sys
+import utime
+import array_funcs
+
+_names = array_funcs.functions()
+_funcs = []
+_wrappers = []
+_calls = None
+_elements = None
+_total_us = None
+_max_us = None
+_enabled = False
+
+# Functions whose second argument is not the number of elements
+_NO_ELEMENTS = ('opqueue_run', 'int8_dense', 'float_array_nsmallest')
+
+
+def _wrap(i, f):
+    count = _names[i] not in _NO_ELEMENTS
+    def wrapper(*args):
+        t = utime.ticks_us()
+        result = f(*args)
+        delta = utime.ticks_diff(utime.ticks_us(), t)
+        _calls[i] += 1
+        if count and len(args) > 1:
+            _elements[i] += args[1]
+        _total_us[i] += delta
+        if delta > _max_us[i]:
+            _max_us[i] = delta
+        return result
+    return wrapper
+
+
+def _setup():
+    global _calls, _elements, _total_us, _max_us
+    if _calls is not None:
+        return
+    n = len(_names)
+    _funcs.extend([None]*n)
+    _wrappers.extend([None]*n)
+    # Counters wrap around after 2**32 (about 71 minutes of
+    # total time for a single function)
+    _calls = array('L', [0]*n)
+    _elements = array('L', [0]*n)
+    _total_us = array('L', [0]*n)
+    _max_us = array('L', [0]*n)
+
+
+def _wrapped(name, f):
+    # Returns the wrapper of function f (made the first time)
+    if isinstance(f, type):
+        return f
+    i = _names.index(name)
+    if _funcs[i] is not f:
+        _funcs[i] = f
+        _wrappers[i] = _wrap(i, f)
+    return _wrappers[i]
+
+
+def _modules():
+    modules = [array_funcs]
+    for name in ('exp_funcs', 'pow_funcs'):
+        if name in sys.modules:
+            modules.append(sys.modules[name])
+    return modules
+
+
+def _bind(old, new):
+    # Replaces the functions in old by those in new in the modules
+    # where they are bound (without loading any families)
+    for module in _modules():
+        d = module.__dict__
+        for i in range(len(_names)):
+            if old[i] is not None and d.get(_names[i]) is old[i]:
+                setattr(module, _names[i], new[i])
+
+
+def enable():
+    global _enabled
+    _setup()
+    if not _enabled:
+        for module in _modules():
+            d = module.__dict__
+            for name in _names:
+                if name in d:
+                    _wrapped(name, d[name])
+        _bind(_funcs, _wrappers)
+        array_funcs._hook = _wrapped
+        _enabled = True
+
+
+def disable():
+    global _enabled
+    if _enabled:
+        array_funcs._hook = None
+        _bind(_wrappers, _funcs)
+        _enabled = False
+
+
+def enabled():
+    return _enabled
+
+
+def reset():
+    _setup()
+    for i in range(len(_names)):
+        _calls[i] = 0
+        _elements[i] = 0
+        _total_us[i] = 0
+        _max_us[i] = 0
+
+
+def stats(name):
+    # Returns (calls, elements, total us, max us) for a function
+    _setup()
+    i = _names.index(name)
+    return _calls[i], _elements[i], _total_us[i], _max_us[i]
+
+
+def report():
+    # Prints the functions that were called, slowest first
+    _setup()
+    print('{:32s} {:>6s} {:>10s} {:>10s} {:>8s} {:>8s}'.format(
+        'Function', 'Calls', 'Elements', 'Total ms', 'Mean us', 'Max us'))
+    order = sorted([i for i in range(len(_names)) if _calls[i]],
+                   key=lambda i: -_total_us[i])
+    for i in order:
+        print('{:32s} {:6d} {:10d} {:10.3f} {:8d} {:8d}'.format(
+            _names[i], _calls[i], _elements[i], _total_us[i]/1000,
+            _total_us[i]//_calls[i], _max_us[i]))
@@ -0,0 +1,119 @@
+'''
+Decimation, interpolation and rational resampling of blocks of
+samples using float_array_polyphase_fir.
+
+Each Resampler keeps the last K - 1 input samples (K is the
+number of taps per phase) and its position between calls, so a
+signal can be processed in consecutive blocks of any size and the
+output is the same as processing it in one block.  The default
+filter is a windowed-sinc low-pass filter with the cutoff at the
+lower of the two Nyquist frequencies, so decimation is anti-
+aliased and interpolation removes the images.  The filter delays
+the output by (L*K - 1)/2 samples of the upsampled signal.
+
+Example usage:
+>>> from array import array
+>>> import resample
+>>> dec = resample.Decimator(4, block=256)
+>>> x = array('f', [0.0]*256)
+>>> y = array('f', [0.0]*dec.max_output)
+>>> n = dec.process(y, x, len(x))      # n == 64
+'''
+
+from array import array
+import math
+import array_funcs as af
+
+
+def lowpass(n_taps, cutoff, gain=1.0):
+    # Returns a windowed-sinc (Hamming) low-pass filter of n_taps
+    # taps with cutoff as a fraction of the sample rate (< 0.5)
+    h = array('f', [0.0]*n_taps)
+    c = (n_taps - 1)/2
+    for j in range(n_taps):
+        t = j - c
+        if t == 0:
+            s = 2*cutoff
+        else:
+            s = math.sin(2*math.pi*cutoff*t)/(math.pi*t)
+        w = 0.54 - 0.46*math.cos(2*math.pi*j/(n_taps - 1)) \
+            if n_taps > 1 else 1.0
+        h[j] = gain*s*w
+    return h
+
+
+class Resampler:
+
+    def __init__(self, up, down, block, taps=None, h=None):
+        # Resamples by up/down (L/M).  block is the largest number
+        # of input samples passed to process().  taps is the
+        # number of taps per phase (default 8*max(L, M)/L, at least
+        # 4), or h is the filter (array('f'), length a multiple of
+        # L, designed for the sample rate L times the input rate).
+        if up < 1 or down < 1 or block < 1:
+            raise ValueError('up, down and block must be at least 1')
+        L, M = up, down
+        if h is None:
+            if taps is None:
+                taps = max(4, (8*max(L, M) + L - 1)//L)
+            h = lowpass(L*taps, 0.5/max(L, M), L)
+        if len(h) % L:
+            raise ValueError('filter length must be a multiple of up')
+        K = len(h)//L
+        self.up = L
+        self.down = M
+        self.taps = K
+        self.block = block
+        # Largest number of outputs from one call to process()
+        self.max_output = (block*L + M - 1)//M
+        # Phase j holds h[j], h[j + L], ... in reversed order
+        self.bank = array('f', [0.0]*L*K)
+        for j in range(L):
+            for k in range(K):
+                self.bank[j*K + K - 1 - k] = h[j + k*L]
+        self.buffer = array('f', [0.0]*(K - 1 + block))
+        self._mv = memoryview(self.buffer)
+        self._p = array('L', [af.addressof(self.bank), L, M, K, 0, 0])
+
+    def reset(self):
+        # Clears the history
+        v = array('f', [0.0])
+        af.float_array_assign_scalar(self.buffer, len(self.buffer), v)
+        self._p[4] = 0
+        self._p[5] = 0
+
+    def process(self, y, x, n):
+        # Resamples n samples from x into y and returns the number
+        # of output samples (at most max_output)
+        if n > self.block:
+            raise ValueError('n is larger than block')
+        K = self.taps
+        p = self._p
+        mv = self._mv
+        if n > 0:
+            af.float_array_copy(mv[K - 1:], n, x)
+        # Outputs whose last input sample is in this block
+        count = ((n - p[5])*self.up - p[4] + self.down - 1)//self.down
+        if count > 0:
+            if len(y) < count:
+                raise ValueError('y is too short')
+            af.float_array_polyphase_fir(y, count, self.buffer, p)
+        else:
+            count = 0
+        # Keep the last K - 1 samples for the next block
+        p[5] -= n
+        if K > 1 and n > 0:
+            af.float_array_copy(self.buffer, K - 1, mv[n:])
+        return count
+
+
+class Decimator(Resampler):
+
+    def __init__(self, factor, block, taps=None, h=None):
+        Resampler.__init__(self, 1, factor, block, taps, h)
+
+
+class Interpolator(Resampler):
+
+    def __init__(self, factor, block, taps=None, h=None):
+        Resampler.__init__(self, factor, 1, block, taps, h)
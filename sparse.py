@@ -0,0 +1,152 @@
+'''
+Sparse vectors and sparse matrices in compressed sparse row (CSR)
+format using the sparse functions.
+
+Memory and time grow with the number of non-zero elements rather
+than the full size: a CSR matrix uses 8 bytes per non-zero
+element plus 4 bytes per row, compared with 4 bytes per element
+for a dense float array.
+
+Example usage:
+>>> from array import array
+>>> import sparse
+>>> A = array('f', [0.0, 2.0, 0.0,
+...                 0.0, 0.0, 0.0,
+...                 1.0, 0.0, 3.0])
+>>> S = sparse.csr_from_dense(A, 3, 3)
+>>> S.nnz
+3
+>>> y = array('f', [0.0]*3)
+>>> S.matvec(y, array('f', [1.0, 1.0, 1.0]))
+>>> y
+array('f', [2.0, 0.0, 4.0])
+'''
+
+from array import array
+import array_funcs as af
+
+
+class SparseVector:
+
+    def __init__(self, values, indices, nnz, n):
+        # values (array('f')) and indices (array('i')) of the nnz
+        # non-zero elements of a vector of length n
+        self.values = values
+        self.indices = indices
+        self.nnz = nnz
+        self.n = n
+        self._s = array('L', [af.addressof(values), af.addressof(indices),
+                              len(values)])
+        self._v = array('f', [0.0])
+
+    def dot(self, x):
+        # Returns the dot product with the dense array x
+        af.float_array_sparse_dot(x, self.nnz, self._s, self._v)
+        return self._v[0]
+
+    def add_to(self, x, scale=1.0):
+        # x = x + scale*self for the dense array x
+        self._v[0] = scale
+        af.float_array_add_sparse(x, self.nnz, self._s, self._v)
+
+    def to_dense(self, x):
+        # Writes the vector into the dense array x
+        self._v[0] = 0.0
+        af.float_array_assign_scalar(x, self.n, self._v)
+        self.add_to(x)
+
+
+def sparse_from_dense(x, n, threshold=0.0):
+    # Returns a SparseVector of the elements of x with
+    # abs(x[i]) > threshold
+    t = array('f', [threshold])
+    s = array('L', [0, 0, 0])
+    nnz = af.float_array_compress(x, n, s, t)
+    values = array('f', [0.0]*max(nnz, 1))
+    indices = array('i', [0]*max(nnz, 1))
+    if nnz > 0:
+        s[0] = af.addressof(values)
+        s[1] = af.addressof(indices)
+        s[2] = nnz
+        af.float_array_compress(x, n, s, t)
+    return SparseVector(values, indices, nnz, n)
+
+
+class CSRMatrix:
+
+    def __init__(self, values, cols, rowptr, n_rows, n_cols):
+        # values (array('f')) and cols (array('i')) of the non-zero
+        # elements row by row and rowptr (array('i') of length
+        # n_rows + 1) with the start of each row in values
+        if len(rowptr) != n_rows + 1:
+            raise ValueError('rowptr must have n_rows + 1 elements')
+        if len(values) < rowptr[n_rows] or len(cols) < rowptr[n_rows]:
+            raise ValueError('values and cols are too short')
+        self.values = values
+        self.cols = cols
+        self.rowptr = rowptr
+        self.n_rows = n_rows
+        self.n_cols = n_cols
+        self.nnz = rowptr[n_rows]
+        self._p = array('L', [af.addressof(values), af.addressof(cols),
+                              af.addressof(rowptr)])
+        self._s = array('L', [0, 0])
+        self._v = array('f', [0.0])
+
+    def matvec(self, y, x):
+        # y = A*x where x has n_cols and y n_rows elements
+        af.float_array_csr_matvec(y, self.n_rows, x, self._p)
+
+    def _row(self, r):
+        # Points self._s at row r and returns its number of elements
+        start = self.rowptr[r]
+        self._s[0] = self._p[0] + 4*start
+        self._s[1] = self._p[1] + 4*start
+        return self.rowptr[r + 1] - start
+
+    def row_dot(self, r, x):
+        # Returns the dot product of row r with the dense array x
+        af.float_array_sparse_dot(x, self._row(r), self._s, self._v)
+        return self._v[0]
+
+    def add_row_to(self, r, x, scale=1.0):
+        # x = x + scale*(row r) for the dense array x
+        self._v[0] = scale
+        af.float_array_add_sparse(x, self._row(r), self._s, self._v)
+
+    def to_dense(self, A):
+        # Writes the matrix into the dense row-major array A
+        mv = memoryview(A)
+        self._v[0] = 0.0
+        af.float_array_assign_scalar(A, self.n_rows*self.n_cols, self._v)
+        for r in range(self.n_rows):
+            row = r*self.n_cols
+            self.add_row_to(r, mv[row:row + self.n_cols])
+
+
+def csr_from_dense(A, n_rows, n_cols, threshold=0.0):
+    # Returns a CSRMatrix of the elements of the dense row-major
+    # array A with abs(A[i, j]) > threshold
+    mv = memoryview(A)
+    t = array('f', [threshold])
+    s = array('L', [0, 0, 0])
+    # Count the elements first so the arrays have the exact size
+    rowptr = array('i', [0]*(n_rows + 1))
+    for r in range(n_rows):
+        row = r*n_cols
+        rowptr[r + 1] = rowptr[r] + af.float_array_compress(
+            mv[row:row + n_cols], n_cols, s, t)
+    nnz = rowptr[n_rows]
+    values = array('f', [0.0]*max(nnz, 1))
+    cols = array('i', [0]*max(nnz, 1))
+    base_v = af.addressof(values)
+    base_c = af.addressof(cols)
+    for r in range(n_rows):
+        count = rowptr[r + 1] - rowptr[r]
+        if count > 0:
+            row = r*n_cols
+            s[0] = base_v + 4*rowptr[r]
+            s[1] = base_c + 4*rowptr[r]
+            s[2] = count
+            af.float_array_compress(mv[row:row + n_cols], n_cols, s, t)
+    return CSRMatrix(values, cols, rowptr, n_rows, n_cols)
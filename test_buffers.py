@@ -0,0 +1,33 @@
+from buffers import PingPong
+from array import array
+import array_funcs as af
+
+print("\nTesting PingPong double buffer")
+
+frames = []
+
+def consumer(a):
+    frames.append(af.int_array_sum(a, len(a)))
+
+n = 8
+pp = PingPong('i', n, callback=consumer)
+pp.add_stage(af.int_array_mul_scalar, 2)
+pp.add_stage(af.int_array_add_scalar, 1)
+
+# Simulated source: 4 frames of the values 0, 1, ..., n-1
+pp.feed(list(range(n))*4)
+while pp.poll():
+    pass
+
+expected = sum([2*i + 1 for i in range(n)])
+print("Frames processed: {}".format(pp.frames))
+print("Overruns: {}".format(pp.overruns))
+print("Frame sums: {}".format(frames))
+print("Expected sum: {}".format(expected))
+
+print("\nOverrun test (no processing between frames)")
+pp = PingPong('f', n)
+pp.process = lambda *args: None  # Consumer never finishes
+pp._process_ref = pp.process
+pp.feed([0.5]*n*3)
+print("Overruns: {} (expected 2)".format(pp.overruns))
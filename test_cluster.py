@@ -0,0 +1,62 @@
+from array import array
+import utime
+import array_funcs as af
+import cluster
+
+# 200 prototypes of length 16 in 4 classes around 4 centres
+m, dim, k = 200, 16, 4
+rs = af.RandomState(1)
+centres = array('f', [0.0]*k*dim)
+rs.uniform(centres, -2.0, 2.0)
+P = array('f', [0.0]*m*dim)
+labels = array('i', [j % k for j in range(m)])
+rs.normal(P, 0.0, 0.5)
+for j in range(m):
+    c = labels[j]
+    for i in range(dim):
+        P[j*dim + i] += centres[c*dim + i]
+
+def python_sqdist(q):
+    return [sum([(P[j*dim + i] - q[i])**2 for i in range(dim)])
+            for j in range(m)]
+
+print("\n-------- Testing Distance Functions ----------")
+
+q = array('f', [0.0]*dim)
+rs.normal(q, 0.0, 0.5)
+for i in range(dim):
+    q[i] += centres[2*dim + i]
+
+knn = cluster.NearestNeighbours(P, m, dim, labels)
+d = knn.distances(q)
+expected = python_sqdist(q)
+print("\nfloat_array_sqdist max error: {}".format(
+    max([abs(a - b) for a, b in zip(d, expected)])))
+count = knn.query(q, 5)
+print("5 nearest: {}".format(knn.idx[:count]))
+print("Expected:  {}".format(sorted(range(m), key=lambda j: expected[j])[:5]))
+print("Class: {} (expected 2)".format(knn.classify(q, 5)))
+for metric in ('l1', 'cos'):
+    print("Class ({}): {}".format(
+        metric, cluster.NearestNeighbours(P, m, dim, labels,
+                                          metric).classify(q, 5)))
+
+# k-means starting from the first point of each class
+C = array('f', P[:k*dim])
+km = cluster.KMeans(C, k, dim)
+found = array('i', [0]*m)
+km.fit(P, m, found)
+print("\nk-means labels match classes: {}".format(
+    all([found[j] == labels[j] for j in range(m)])))
+print("Points per centroid: {}".format(km.counts))
+
+print("\nTimes for {} vectors of length {}:".format(m, dim))
+t = utime.ticks_us()
+python_sqdist(q)
+print("Python distances: {}us".format(utime.ticks_diff(utime.ticks_us(), t)))
+t = utime.ticks_us()
+knn.query(q, 5)
+print("query(q, 5): {}us".format(utime.ticks_diff(utime.ticks_us(), t)))
+t = utime.ticks_us()
+km.step(P, m, found)
+print("KMeans.step: {}us".format(utime.ticks_diff(utime.ticks_us(), t)))
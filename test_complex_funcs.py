@@ -0,0 +1,76 @@
+from array import array
+import math
+import array_funcs as af
+
+def to_complex(z):
+    return [complex(z[2*i], z[2*i + 1]) for i in range(len(z)//2)]
+
+def max_error(x, y):
+    return max([abs(xi - yi) for xi, yi in zip(x, y)])
+
+z0 = [complex(1.0, 2.0), complex(0.0, -1.0), complex(-3.0, 0.5),
+      complex(-0.25, -4.0)]
+w0 = [complex(0.0, 1.0), complex(3.0, 4.0), complex(1.5, -2.0),
+      complex(-1.0, 0.0)]
+n = len(z0)
+
+def init():
+    z = array('f', [p for zi in z0 for p in (zi.real, zi.imag)])
+    w = array('f', [p for wi in w0 for p in (wi.real, wi.imag)])
+    return z, w
+
+print("\n-------- Testing Complex Array Functions ----------")
+
+tests = [
+    ('complex_array_add_array', af.complex_array_add_array,
+     [zi + wi for zi, wi in zip(z0, w0)]),
+    ('complex_array_mul_array', af.complex_array_mul_array,
+     [zi*wi for zi, wi in zip(z0, w0)]),
+    ('complex_array_mul_conj_array', af.complex_array_mul_conj_array,
+     [zi*wi.conjugate() for zi, wi in zip(z0, w0)])
+]
+for fname, f, expected in tests:
+    z, w = init()
+    f(z, n, w)
+    print("\nFunction: {}(z, len(z)//2, w)".format(fname))
+    print("Result: {}".format(to_complex(z)))
+    print("Max error: {}".format(max_error(to_complex(z), expected)))
+
+z, w = init()
+c = array('f', [0.5, -1.0])
+af.complex_array_mul_scalar(z, n, c)
+print("\nFunction: complex_array_mul_scalar(z, len(z)//2, c)")
+print("Max error: {}".format(max_error(to_complex(z),
+                                       [zi*complex(0.5, -1.0) for zi in z0])))
+
+z, w = init()
+af.complex_array_conj(z, n)
+print("\nFunction: complex_array_conj(z, len(z)//2)")
+print("Result: {}".format(to_complex(z)))
+
+x = array('f', [0.0]*n)
+tests = [
+    ('complex_array_abs', af.complex_array_abs, [abs(zi) for zi in z0]),
+    ('complex_array_abs2', af.complex_array_abs2, [abs(zi)**2 for zi in z0]),
+    ('complex_array_phase', af.complex_array_phase,
+     [math.atan2(zi.imag, zi.real) for zi in z0])
+]
+for fname, f, expected in tests:
+    z, w = init()
+    f(x, n, z)
+    print("\nFunction: {}(x, len(x), z)".format(fname))
+    print("Result: {}".format(x))
+    print("Max error: {}".format(max_error(x, expected)))
+
+c = array('f', [0.0, 0.0])
+tests = [
+    ('complex_array_dot', af.complex_array_dot,
+     sum([zi*wi for zi, wi in zip(z0, w0)])),
+    ('complex_array_dot_conj', af.complex_array_dot_conj,
+     sum([zi*wi.conjugate() for zi, wi in zip(z0, w0)]))
+]
+for fname, f, expected in tests:
+    z, w = init()
+    f(z, n, w, c)
+    print("\nFunction: {}(z, len(z)//2, w, c)".format(fname))
+    print("Result: {} (expected {})".format(complex(c[0], c[1]), expected))
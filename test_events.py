@@ -0,0 +1,86 @@
+from array import array
+import math
+import utime
+import array_funcs as af
+
+# Noisy sine wave with 10 periods
+n = 1000
+noise = array('f', [0.0]*n)
+af.RandomState(1).normal(noise, 0.0, 0.05)
+x = array('f', [math.sin(2*math.pi*10*i/n) + noise[i] for i in range(n)])
+idx = array('i', [0]*n)
+
+def python_rising(x, upper, lower):
+    events, high = [], False
+    for i in range(len(x)):
+        if not high and x[i] > upper:
+            events.append(i)
+            high = True
+        elif high and x[i] < lower:
+            high = False
+    return events
+
+print("\n-------- Testing Event Detection Functions ----------")
+
+# Without hysteresis the noise causes extra crossings
+for upper, lower in ((0.5, 0.5), (0.5, 0.3)):
+    p = array('f', [upper, lower, 0.0])
+    count = af.float_array_rising_crossings(idx, n, x, p)
+    print("\nfloat_array_rising_crossings, upper {}, lower {}".format(
+        upper, lower))
+    print("Count: {} (10 periods)".format(count))
+    print("Same as Python: {}".format(
+        list(idx[:count]) == python_rising(x, upper, lower)))
+
+p = array('f', [0.5, 0.3, 0.0])
+count = af.float_array_falling_crossings(idx, n, x, p)
+print("\nfloat_array_falling_crossings: {}".format(count))
+
+# Blocks give the same result as the whole array
+p = array('f', [0.5, 0.3, 0.0])
+events = []
+for i in range(0, n, 64):
+    m = min(64, n - i)
+    count = af.float_array_rising_crossings(idx, m, memoryview(x)[i:], p)
+    events.extend([i + j for j in idx[:count]])
+print("In blocks of 64: {}".format(events == python_rising(x, 0.5, 0.3)))
+
+# A NaN sample (e.g. a dropped reading) does not change the state
+y = array('f', x)
+y[30] = float('nan')
+p = array('f', [0.5, 0.3, 0.0])
+count = af.float_array_rising_crossings(idx, n, y, p)
+print("With a NaN sample: {}".format(
+    list(idx[:count]) == python_rising(y, 0.5, 0.3)))
+
+a = array('i', [int(1000*v) for v in x])
+p = array('i', [500, 300, 0])
+count = af.int_array_rising_crossings(idx, n, a, p)
+print("\nint_array_rising_crossings: {}".format(count))
+
+count = af.float_array_zero_crossings(idx, n, x)
+print("\nfloat_array_zero_crossings: {} (20 without noise)".format(count))
+count = af.int_array_zero_crossings(idx, n, a)
+print("int_array_zero_crossings: {}".format(count))
+
+p = array('f', [0.5, 50])
+count = af.float_array_find_peaks(idx, n, x, p)
+print("\nfloat_array_find_peaks(height 0.5, distance 50): {}".format(count))
+print("Indices: {}".format(idx[:count]))
+print("Expected near: {}".format([25 + 100*i for i in range(10)]))
+count = af.int_array_find_peaks(idx, n, a, array('i', [500, 50]))
+print("int_array_find_peaks: {}".format(count))
+
+print("\nTime for {} samples:".format(n))
+p = array('f', [0.5, 0.3, 0.0])
+t = utime.ticks_us()
+python_rising(x, 0.5, 0.3)
+print("Python loop: {}us".format(utime.ticks_diff(utime.ticks_us(), t)))
+t = utime.ticks_us()
+af.float_array_rising_crossings(idx, n, x, p)
+print("float_array_rising_crossings: {}us".format(
+    utime.ticks_diff(utime.ticks_us(), t)))
+t = utime.ticks_us()
+af.float_array_find_peaks(idx, n, x, array('f', [0.5, 50]))
+print("float_array_find_peaks: {}us".format(
+    utime.ticks_diff(utime.ticks_us(), t)))
@@ -0,0 +1,468 @@
+# Checks the NumPy (host) versions of the array functions against
+# plain Python calculations.  Run with CPython: python test_host_funcs.py
+from array import array
+import math
+import struct
+import sys
+import array_funcs as af
+from array_funcs import host_funcs
+
+def f32(v):
+    # Rounds a Python float to single precision
+    return struct.unpack('f', struct.pack('f', v))[0]
+
+def i32(k):
+    return (k + 2**31) % 2**32 - 2**31
+
+failures = []
+
+def check(name, result, expected, tol=0):
+    ok = (len(result) == len(expected) and
+          all([abs(r - e) <= tol for r, e in zip(result, expected)]))
+    print("{:32s} {}".format(name, "OK" if ok else "FAILED"))
+    if not ok:
+        failures.append(name)
+        print("  result:   {}".format(list(result)))
+        print("  expected: {}".format(list(expected)))
+    return ok
+
+a0 = [-10, 0, 7, 2**31 - 1, -2**31]
+b0 = [3, -1, 0, 2, -1]
+x0 = [f32(v) for v in [-1.5, 0.0, 0.1, 2.0, 1000.25]]
+y0 = [f32(v) for v in [0.5, -2.0, 3.0, 0.25, -0.1]]
+n = len(a0)
+
+print("\n-------- Testing host functions ----------")
+print("Backend: {}".format(af.int_array_add_scalar.__module__))
+
+a = array('i', a0)
+af.int_array_add_scalar(a, n, 5)
+check('int_array_add_scalar', a, [i32(ai + 5) for ai in a0])
+
+a = array('i', a0)
+af.int_array_mul_array(a, n, array('i', b0))
+check('int_array_mul_array', a, [i32(ai*bi) for ai, bi in zip(a0, b0)])
+
+def sdiv(p, q):
+    if q == 0:
+        return 0
+    r = abs(p)//abs(q)
+    return i32(-r if (p < 0) != (q < 0) else r)
+
+a = array('i', a0)
+af.int_array_div_array(a, n, array('i', b0))
+check('int_array_div_array', a, [sdiv(ai, bi) for ai, bi in zip(a0, b0)])
+
+a = array('i', a0)
+af.int_array_div_scalar(a, n, -3)
+check('int_array_div_scalar', a, [sdiv(ai, -3) for ai in a0])
+
+a = array('i', a0)
+af.int_array_abs(a, n)
+check('int_array_abs', a, [i32(abs(ai)) for ai in a0])
+
+check('int_array_sum', [af.int_array_sum(array('i', a0), n)],
+      [i32(sum(a0))])
+check('int_array_max', [af.int_array_max(array('i', a0), n)], [max(a0)])
+check('int_array_min', [af.int_array_min(array('i', a0), n)], [min(a0)])
+
+a = array('i', a0)
+af.int_array_assign_scalar(a, n, -7)
+check('int_array_assign_scalar', a, [-7]*n)
+
+a = array('i', a0)
+af.int_array_sub_scalar(a, n, 5)
+check('int_array_sub_scalar', a, [i32(ai - 5) for ai in a0])
+
+a = array('i', a0)
+af.int_array_mul_scalar(a, n, -3)
+check('int_array_mul_scalar', a, [i32(ai*-3) for ai in a0])
+
+a = array('i', a0)
+af.int_array_add_array(a, n, array('i', b0))
+check('int_array_add_array', a, [i32(ai + bi) for ai, bi in zip(a0, b0)])
+
+a = array('i', a0)
+af.int_array_sub_array(a, n, array('i', b0))
+check('int_array_sub_array', a, [i32(ai - bi) for ai, bi in zip(a0, b0)])
+
+a = array('i', a0)
+af.int_array_cmp_array(a, n, array('i', [-10, 1, 7, 0, -2**31]))
+check('int_array_cmp_array', a, [1, 0, 1, 0, 1])
+
+a = array('i', [0]*n)
+af.int_array_copy(a, n, array('i', a0))
+check('int_array_copy', a, a0)
+
+a = array('i', a0)
+af.int_array_neg(a, n)
+check('int_array_neg', a, [i32(-ai) for ai in a0])
+
+a = array('i', a0)
+af.int_array_square(a, n)
+check('int_array_square', a, [i32(ai*ai) for ai in a0])
+
+x = array('f', x0)
+af.float_array_mul_array(x, n, array('f', y0))
+check('float_array_mul_array', x, [f32(xi*yi) for xi, yi in zip(x0, y0)])
+
+x = array('f', x0)
+af.float_array_add_scaled_array(x, n, array('f', y0), array('f', [0.3]))
+check('float_array_add_scaled_array', x,
+      [f32(xi + f32(yi*f32(0.3))) for xi, yi in zip(x0, y0)])
+
+x = array('f', [f32(0.1)]*1000)
+v = array('f', [0.0])
+af.float_array_sum(x, len(x), v)
+s = 0.0
+for xi in x:
+    s = f32(s + xi)
+check('float_array_sum', v, [s])
+
+x = array('f', x0)
+af.float_array_abs(x, n)
+check('float_array_abs', x, [abs(xi) for xi in x0])
+
+v = array('f', [0.3])
+v3 = f32(0.3)
+for name, op in (('assign_scalar', lambda a: v3),
+                 ('add_scalar', lambda a: a + v3),
+                 ('sub_scalar', lambda a: a - v3),
+                 ('mul_scalar', lambda a: a*v3),
+                 ('div_scalar', lambda a: a/v3)):
+    x = array('f', x0)
+    getattr(af, 'float_array_' + name)(x, n, v)
+    check('float_array_' + name, x, [f32(op(xi)) for xi in x0])
+
+for name, op in (('add_array', lambda a, b: a + b),
+                 ('sub_array', lambda a, b: a - b),
+                 ('div_array', lambda a, b: a/b),
+                 ('copy', lambda a, b: b)):
+    x = array('f', x0)
+    getattr(af, 'float_array_' + name)(x, n, array('f', y0))
+    check('float_array_' + name, x,
+          [f32(op(xi, yi)) for xi, yi in zip(x0, y0)])
+
+x = array('f', x0)
+af.float_array_cmp_array(x, n, array('f', [-1.5, 1.0, 0.1, 2.0, 0.0]))
+check('float_array_cmp_array', x, [1.0, 0.0, 1.0, 1.0, 0.0])
+
+c0 = [3, -1, 4, 2, -7]
+x = array('f', x0)
+af.float_array_mul_int_array(x, n, array('i', c0))
+check('float_array_mul_int_array', x, [f32(xi*ci) for xi, ci in zip(x0, c0)])
+x = array('f', x0)
+af.float_array_div_int_array(x, n, array('i', c0))
+check('float_array_div_int_array', x, [f32(xi/ci) for xi, ci in zip(x0, c0)])
+
+x = array('f', x0)
+af.float_array_neg(x, n)
+check('float_array_neg', x, [-xi for xi in x0])
+
+x = array('f', x0)
+af.float_array_square(x, n)
+check('float_array_square', x, [f32(xi*xi) for xi in x0])
+
+x = array('f', [abs(xi) for xi in x0])
+af.float_array_sqrt(x, n)
+check('float_array_sqrt', x, [f32(math.sqrt(abs(xi))) for xi in x0])
+
+v = array('f', [0.0])
+af.float_array_max(array('f', x0), n, v)
+check('float_array_max', v, [max(x0)])
+af.float_array_min(array('f', x0), n, v)
+check('float_array_min', v, [min(x0)])
+
+af.float_array_dot(array('f', x0), n, array('f', y0), v)
+s = 0.0
+for xi, yi in zip(x0, y0):
+    s = f32(s + f32(xi*yi))
+check('float_array_dot', v, [s])
+
+a = array('i', [0]*4)
+af.int_array_from_float_array(a, 4, array('f', [-1.7, 1.7, 3e9, -3e9]))
+check('int_array_from_float_array', a, [-1, 1, 2**31 - 1, -2**31])
+
+x = array('f', [0.0]*n)
+af.float_array_from_int_array(x, n, array('i', a0))
+check('float_array_from_int_array', x, [f32(ai) for ai in a0])
+
+x = array('f', [0.5, 1.0, 2.0, 9.0])
+af.float_array_pow_float(x, len(x), array('f', [0.5]))
+check('float_array_pow_float', x, [math.sqrt(0.5), 1.0, math.sqrt(2), 3.0],
+      tol=1e-6)
+
+print("\nfloat_array_exp compared with math.exp:")
+x = array('f', [(i - 300)/10 for i in range(601)])
+y = array('f', [0.0]*len(x))
+af.float_array_exp(y, len(y), x)
+err = max([abs(yi - math.exp(xi))/math.exp(xi) for xi, yi in zip(x, y)])
+print("Max relative error: {}".format(err))
+
+print("\nfloat_array_pow_int compared with x**n:")
+x = array('f', [-1.0, -0.5, 0.5, 1.0, 10.0])
+y = array('f', [0.0]*len(x))
+for k in (-3, 0, 1, 2, 5):
+    af.float_array_pow_int(y, len(y), x, k)
+    err = max([abs(yi - xi**k)/abs(xi**k) for xi, yi in zip(x, y)])
+    print(" {:3d}: max relative error {}".format(k, err))
+
+print("\nRandom numbers:")
+def xorshift(s):
+    s ^= (s << 13) & 0xFFFFFFFF
+    s ^= s >> 17
+    s ^= (s << 5) & 0xFFFFFFFF
+    return s
+
+rs = af.RandomState(1)
+a = array('i', [0]*5)
+rs.randint(a, 0, 100)
+s, expected = 1, []
+for i in range(5):
+    s = xorshift(s)
+    expected.append(s % 100)
+check('int_array_random_range', a, expected)
+check('state after 5 numbers', [rs.getstate()], [s])
+
+x = array('f', [0.0]*10000)
+rs.normal(x, 2.0, 0.5)
+m = sum(x)/len(x)
+sd = math.sqrt(sum([(xi - m)**2 for xi in x])/len(x))
+print("normal mean, std: {:.4f}, {:.4f} (expected 2.0, 0.5)".format(m, sd))
+rs.seed(3)
+y1 = array('f', [0.0]*7)
+y2 = array('f', [0.0]*6)
+rs.normal(y1)
+rs.normal(y2)
+rs.seed(3)
+z = array('f', [0.0]*14)
+rs.normal(z)
+check('normal stream continues', list(y1) + list(y2), z[:7] + z[8:])
+
+state = array('I', [1])
+a = array('i', [0]*3)
+af.int_array_random(a, 3, state)
+s, bits = 1, []
+for i in range(6):
+    s = xorshift(s)
+    bits.append(s)
+check('int_array_random', a, [i32(b) for b in bits[:3]])
+x = array('f', [0.0]*3)
+af.float_array_random(x, 3, state)
+check('float_array_random', x, [(b >> 9)/2**23 for b in bits[3:]])
+state[0] = 1
+af.float_array_random_uniform(x, 3, state, array('f', [-2.0, 3.0]))
+check('float_array_random_uniform', x,
+      [f32(f32((b >> 9)/2**23*5.0) - 2.0) for b in bits[:3]])
+
+print("\nComplex numbers:")
+z = array('f', [1.0, 2.0, 0.0, -1.0])
+af.complex_array_mul_array(z, 2, array('f', [0.0, 1.0, 3.0, 4.0]))
+check('complex_array_mul_array', z, [-2.0, 1.0, 4.0, -3.0])
+z0 = [1.0, 2.0, 0.0, -1.0]
+w = array('f', [0.0, 1.0, 3.0, 4.0])
+for name, args, expected in (
+        ('add_array', (w,), [1.0, 3.0, 3.0, 3.0]),
+        ('mul_conj_array', (w,), [2.0, -1.0, -4.0, -3.0]),
+        ('mul_scalar', (array('f', [0.0, 2.0]),), [-4.0, 2.0, 2.0, 0.0]),
+        ('conj', (), [1.0, -2.0, 0.0, 1.0])):
+    z = array('f', z0)
+    getattr(af, 'complex_array_' + name)(z, 2, *args)
+    check('complex_array_' + name, z, expected)
+x = array('f', [0.0]*2)
+af.complex_array_abs(x, 2, array('f', z0))
+check('complex_array_abs', x, [f32(math.sqrt(5)), 1.0])
+af.complex_array_abs2(x, 2, array('f', z0))
+check('complex_array_abs2', x, [5.0, 1.0])
+c = array('f', [0.0]*2)
+af.complex_array_dot(array('f', z0), 2, w, c)
+check('complex_array_dot', c, [2.0, -2.0])
+af.complex_array_dot_conj(array('f', z0), 2, w, c)
+check('complex_array_dot_conj', c, [-2.0, -4.0])
+x = array('f', [0.0]*4)
+af.complex_array_phase(x, 4, array('f', [1.0, 1.0, -1.0, 0.0,
+                                         0.0, -2.0, 0.0, 0.0]))
+check('complex_array_phase', x,
+      [math.pi/4, math.pi, -math.pi/2, 0.0], tol=1e-6)
+
+def device_phase(re, im):
+    # complex_array_phase in the assembler's order of operations,
+    # rounding every step to single precision
+    coeffs = [struct.unpack('f', struct.pack('I', h))[0] for h in (
+        0xBEAAAA6C, 0x3E4CBBE5, 0xBE117FC7, 0x3DDA3D83,
+        0xBD9A3174, 0x3D2FC1FE, 0xBC846E02, 0x3B3BD74A)]
+    half_pi = f32(math.pi/2)
+    ar, ai = abs(re), abs(im)
+    if ar == 0 and ai == 0:
+        return 0.0
+    steep = ai > ar
+    a = f32(ar/ai) if steep else f32(ai/ar)
+    z2 = f32(a*a)
+    p = f32(coeffs[7]*z2)
+    for c in coeffs[6::-1]:
+        p = f32(f32(p + c)*z2)
+    r = f32(f32(p*a) + a)
+    if steep:
+        r = f32(half_pi - r)
+    if math.copysign(1.0, re) < 0:
+        r = f32(f32(half_pi + half_pi) - r)
+    if math.copysign(1.0, im) < 0:
+        r = -r
+    return r
+
+rs = af.RandomState(5)
+z = array('f', [0.0]*2000)
+rs.normal(z)
+z[0], z[1], z[2], z[3] = -1.0, -0.0, 0.0, 1.0
+x = array('f', [0.0]*1000)
+af.complex_array_phase(x, 1000, z)
+check('complex_array_phase (device order)', x,
+      [device_phase(z[2*i], z[2*i + 1]) for i in range(1000)])
+
+print("\nPrograms:")
+x = array('f', [1.0, 2.0, 3.0])
+prog = af.Program(4)
+prog.add('float_array_mul_scalar', x, len(x), array('f', [2.0]))
+prog.add('float_array_add_array', x, len(x), array('f', [0.5]*3))
+prog.run()
+check('opqueue_run', x, [2.5, 4.5, 6.5])
+
+print("\nQuantized functions:")
+acc = array('i', [100, 0])
+x8 = array('b', [10, -5])
+af.int8_dense(acc, 2, array('b', [1, 2, -3, 4]),
+              array('L', [af.addressof(x8), 2]))
+check('int8_dense', acc, [100, -50])
+y8 = array('b', [0]*4)
+af.int8_array_requantize(y8, 4, array('i', [-1000, 5, 7, 1000]),
+                         array('f', [0.5, 128.5, 118.0, 255.0]))
+check('int8_array_requantize', y8, [-10, 3, 4, 127])
+af.int8_array_from_float_array(y8, 4, array('f', [-2.0, 0.24, 0.26, 9.0]),
+                               array('f', [2.0, 128.5, 0.0, 255.0]))
+check('int8_array_from_float_array', y8, [-4, 0, 1, 18])
+y8 = array('b', [-128, -1, 0, 127])
+af.int8_array_lookup(y8, 4, array('b', [i//2 - 64 for i in range(256)]))
+check('int8_array_lookup', y8, [-64, -1, 0, 63])
+
+print("\nResampling:")
+bank = array('f', [0.5, 0.5])
+y = array('f', [0.0]*3)
+p = array('L', [af.addressof(bank), 1, 2, 2, 0, 0])
+af.float_array_polyphase_fir(y, 3, array('f', [1.0, 3.0, 5.0, 7.0, 9.0, 11.0]),
+                             p)
+check('float_array_polyphase_fir', y, [2.0, 6.0, 10.0])
+check('polyphase state', p[4:], [0, 6])
+
+print("\nEvent detection:")
+x = array('f', [0.0, 0.6, 1.2, 0.8, 0.2, 1.1, 0.9, -0.3, 1.5])
+idx = array('i', [0]*len(x))
+p = array('f', [1.0, 0.5, 0.0])
+count = af.float_array_rising_crossings(idx, len(x), x, p)
+check('float_array_rising_crossings', idx[:count] + array('i', [count]),
+      [2, 5, 8, 3])
+check('crossings state', p[2:], [1.0])
+p = array('f', [1.0, 0.5, 0.0])
+count = af.float_array_falling_crossings(idx, len(x), x, p)
+check('float_array_falling_crossings', idx[:count], [4, 7])
+# NaN is neither above upper nor below lower
+x = array('f', [0.0, 1.2, float('nan'), 1.2, 0.2, 1.2])
+p = array('f', [1.0, 0.5, 0.0])
+count = af.float_array_rising_crossings(idx, len(x), x, p)
+check('rising crossings with NaN', idx[:count], [1, 5])
+p = array('f', [1.0, 0.5, 0.0])
+count = af.float_array_falling_crossings(idx, len(x), x, p)
+check('falling crossings with NaN', idx[:count] + array('i', [count]),
+      [4, 1])
+a = array('i', [0, 600, 400, 200, 700, 100])
+p = array('i', [500, 300, 0])
+count = af.int_array_rising_crossings(idx, len(a), a, p)
+check('int_array_rising_crossings', idx[:count] + p[2:], [1, 4, 0])
+p = array('i', [500, 300, 0])
+count = af.int_array_falling_crossings(idx, len(a), a, p)
+check('int_array_falling_crossings', idx[:count], [3, 5])
+x = array('f', [1.0, -0.0, 2.0, -3.0, 0.0])
+count = af.float_array_zero_crossings(idx, len(x), x)
+check('float_array_zero_crossings', idx[:count], [1, 2, 3, 4])
+a = array('i', [3, -1, 0, 0, -5, 2])
+count = af.int_array_zero_crossings(idx, len(a), a)
+check('int_array_zero_crossings', idx[:count] + array('i', [count]),
+      [1, 2, 4, 5, 4])
+x = array('f', [0.0, 2.0, 1.0, 3.0, 3.0, 0.0, 0.5, 0.4, 2.5, 0.0])
+count = af.float_array_find_peaks(idx, len(x), x, array('f', [1.0, 3.0]))
+check('float_array_find_peaks', idx[:count] + array('i', [count]), [3, 8, 2])
+count = af.float_array_find_peaks(idx, 1, x, array('f', [1.0, 3.0]))
+check('find_peaks of 1 sample', [count], [0])
+a = array('i', [0, 20, 10, 30, 30, 0, 5, 4, 25, 0])
+count = af.int_array_find_peaks(idx, len(a), a, array('i', [10, 3]))
+check('int_array_find_peaks', idx[:count] + array('i', [count]), [3, 8, 2])
+
+print("\nDistances:")
+P = array('f', [0.0, 0.0, 3.0, 4.0, 1.0, 1.0])
+q = array('f', [1.0, 0.0])
+d = array('f', [0.0]*3)
+p = array('L', [af.addressof(q), 2])
+af.float_array_sqdist(d, 3, P, p)
+check('float_array_sqdist', d, [1.0, 20.0, 1.0])
+af.float_array_l1dist(d, 3, P, p)
+check('float_array_l1dist', d, [1.0, 6.0, 1.0])
+af.float_array_cosdist(d, 3, P, p)
+check('float_array_cosdist', d, [1.0, 0.4, 1 - 1/math.sqrt(2)], tol=1e-6)
+idx = array('i', [0]*3)
+count = af.float_array_nsmallest(idx, 3, array('f', [2.0, 1.0, 1.0]), 3)
+check('float_array_nsmallest', idx[:count], [1, 2, 0])
+check('float_array_nsmallest (k = 0, m = 0)',
+      [af.float_array_nsmallest(idx, 0, d, 3),
+       af.float_array_nsmallest(idx, 3, d, 0)], [0, 0])
+labels = array('i', [0]*3)
+C = array('f', [0.0, 0.0, 3.0, 3.0])
+af.float_array_assign_nearest(labels, 3, P, array('L', [af.addressof(C), 2, 2]))
+check('float_array_assign_nearest', labels, [0, 1, 0])
+S = array('f', [0.0]*4)
+counts = array('i', [0]*2)
+af.float_array_centroid_sums(S, 3, P, array('L', [af.addressof(labels), 2,
+                                                  af.addressof(counts)]))
+check('float_array_centroid_sums', S + array('f', counts),
+      [1.0, 1.0, 3.0, 4.0, 2.0, 1.0])
+
+print("\nSparse functions:")
+x = array('f', [0.0, 2.0, 0.0, 0.05, -1.0])
+values = array('f', [0.0]*5)
+indices = array('i', [0]*5)
+s = array('L', [af.addressof(values), af.addressof(indices), 5])
+count = af.float_array_compress(x, len(x), s, array('f', [0.1]))
+check('float_array_compress', list(values[:count]) + list(indices[:count]),
+      [2.0, -1.0, 1, 4])
+v = array('f', [0.0])
+af.float_array_sparse_dot(array('f', [1.0, 2.0, 3.0, 4.0, 5.0]), count, s, v)
+check('float_array_sparse_dot', v, [-1.0])
+y = array('f', [1.0]*5)
+af.float_array_add_sparse(y, count, s, array('f', [0.5]))
+check('float_array_add_sparse', y, [1.0, 2.0, 1.0, 1.0, 0.5])
+values = array('f', [2.0, 1.0, 3.0])
+cols = array('i', [1, 0, 2])
+rowptr = array('i', [0, 1, 1, 3])
+p = array('L', [af.addressof(values), af.addressof(cols),
+                af.addressof(rowptr)])
+y = array('f', [9.0]*3)
+af.float_array_csr_matvec(y, 3, array('f', [1.0, 2.0, 3.0]), p)
+check('float_array_csr_matvec', y, [4.0, 0.0, 10.0])
+
+print("\nLU functions:")
+A = array('f', [1.0, 2.0, 4.0, 2.0])
+piv = array('i', [0, 1])
+steps = [af.float_array_lu_step(A, 2, piv, k) for k in range(2)]
+check('float_array_lu_step', list(A) + list(piv) + steps,
+      [0.25, 1.5, 4.0, 2.0, 1, 0, 1, 1])
+x = array('f', [0.0, 0.0])
+b = array('f', [5.0, 8.0])
+af.float_array_lu_solve(x, 2, A, array('L', [af.addressof(piv),
+                                             af.addressof(b)]))
+check('float_array_lu_solve', x, [1.0, 2.0])
+check('float_array_lu_step (singular)',
+      [af.float_array_lu_step(array('f', [0.0, 1.0, 0.0, 2.0]), 2,
+                              array('i', [0, 1]), 0)], [0])
+
+if failures:
+    print("\n{} checks FAILED: {}".format(len(failures), ', '.join(failures)))
+    sys.exit(1)
+print("\nAll checks passed")
@@ -0,0 +1,68 @@
+from array import array
+from array_funcs.random_state import RandomState
+from timers import *
+import linalg
+
+def matvec(A, n, x):
+    return array('f', [sum([A[i*n + j]*x[j] for j in range(n)])
+                       for i in range(n)])
+
+def max_error(x, y):
+    return max([abs(xi - yi) for xi, yi in zip(x, y)])
+
+rs = RandomState(1)
+n = 12
+
+# Random symmetric positive-definite matrix S = M*M.T + n*I
+M = array('f', [0.0]*n*n)
+rs.normal(M)
+S = array('f', [0.0]*n*n)
+for i in range(n):
+    for j in range(n):
+        S[i*n + j] = sum([M[i*n + k]*M[j*n + k] for k in range(n)])
+    S[i*n + i] += n
+x_true = array('f', [0.0]*n)
+rs.uniform(x_true, -1.0, 1.0)
+b = matvec(S, n, x_true)
+
+print("\nTesting functions: cholesky(A, n), cho_solve(R, n, b)")
+R = array('f', S)
+x = array('f', b)
+linalg.cholesky(R, n)
+linalg.cho_solve(R, n, x)
+print("Max error: {}".format(max_error(x, x_true)))
+
+print("\nTesting functions: lu_factor(A, n, piv), lu_solve(A, n, piv, b, x)")
+A = array('f', M)
+b = matvec(M, n, x_true)
+piv = array('i', [0]*n)
+linalg.lu_factor(A, n, piv)
+linalg.lu_solve(A, n, piv, b, x)
+print("Max error: {}".format(max_error(x, x_true)))
+
+print("\nTesting function: lstsq(A, m, n, b, x, G)")
+m = 3*n
+A = array('f', [0.0]*m*n)
+rs.normal(A)
+b = array('f', [sum([A[r*n + j]*x_true[j] for j in range(n)])
+                for r in range(m)])
+G = array('f', [0.0]*n*n)
+linalg.lstsq(A, m, n, b, x, G)
+print("Max error: {}".format(max_error(x, x_true)))
+
+print("\nPerformance of {0}x{0} solves:".format(n))
+
+def chol_solve(R, n, x):
+    linalg.cholesky(R, n)
+    linalg.cho_solve(R, n, x)
+
+p = array('L', [0, 0])
+
+def lu_solve(A, n, piv, b, x):
+    linalg.lu_factor(A, n, piv)
+    linalg.lu_solve(A, n, piv, b, x, p)
+
+print("cholesky + cho_solve:")
+timed_function(chol_solve)(array('f', S), n, array('f', b[:n]))
+print("lu_factor + lu_solve:")
+timed_function(lu_solve)(array('f', M), n, piv, b, x)
@@ -0,0 +1,99 @@
+from array import array
+import math
+import utime
+try:
+    import uos as os
+except ImportError:
+    import os
+import array_funcs as af
+import nn
+
+# A random 16-32-16-4 network (about 1200 parameters) is quantized
+# and compared with the same network in floating point
+sizes = [16, 32, 16, 4]
+activations = ['relu', 'tanh', 'softmax']
+ranges = [(0.0, 4.0), (-3.0, 3.0), None]
+rs = af.RandomState(1)
+
+weights, biases = [], []
+for k in range(len(sizes) - 1):
+    w = array('f', [0.0]*sizes[k]*sizes[k + 1])
+    rs.normal(w, 0.0, 1/math.sqrt(sizes[k]))
+    b = array('f', [0.0]*sizes[k + 1])
+    rs.normal(b, 0.0, 0.1)
+    weights.append(w)
+    biases.append(b)
+
+def float_predict(x):
+    for k in range(len(weights)):
+        n_in, n_out = sizes[k], sizes[k + 1]
+        y = [sum([weights[k][o*n_in + i]*x[i] for i in range(n_in)]) +
+             biases[k][o] for o in range(n_out)]
+        if activations[k] == 'relu':
+            y = [max(0.0, v) for v in y]
+        elif activations[k] == 'tanh':
+            y = [math.tanh(v) for v in y]
+        elif activations[k] == 'softmax':
+            m = max(y)
+            y = [math.exp(v - m) for v in y]
+            s = sum(y)
+            y = [v/s for v in y]
+        x = y
+    return x
+
+in_scale, in_zero = nn.quantization(-3.0, 3.0)
+layers = []
+scale = in_scale
+for k in range(len(weights)):
+    W, w_scale = nn.quantize_weights(weights[k])
+    bias = nn.quantize_bias(biases[k], scale, w_scale)
+    out_scale, out_zero = 1.0, 0
+    if ranges[k] is not None:
+        out_scale, out_zero = nn.quantization(*ranges[k])
+    layers.append(nn.Dense(W, bias, sizes[k], sizes[k + 1], w_scale,
+                           out_scale, out_zero, activations[k]))
+    scale = 1/128 if activations[k] == 'tanh' else out_scale
+net = nn.Network(layers, in_scale, in_zero)
+
+print("\n-------- Testing Quantized Network ----------")
+print("\nLayers: {}".format(sizes))
+print("Weights: {} bytes, arena: {} bytes".format(
+    sum([len(layer.W) + 4*len(layer.bias) for layer in layers]),
+    len(net.arena) + 4*len(net._acc)))
+
+x = array('f', [0.0]*sizes[0])
+max_error = 0.0
+agree = 0
+trials = 20
+for t in range(trials):
+    rs.normal(x)
+    expected = float_predict(x)
+    result = net.predict(x)
+    max_error = max(max_error,
+                    max([abs(r - e) for r, e in zip(result, expected)]))
+    if net.predict_class(x) == expected.index(max(expected)):
+        agree += 1
+print("\nLast output: {}".format(result))
+print("Expected:    {}".format(expected))
+print("Max error: {}".format(max_error))
+print("Same class: {}/{}".format(agree, trials))
+
+times = []
+for j in range(10):
+    t = utime.ticks_us()
+    net.predict(x)
+    times.append(utime.ticks_diff(utime.ticks_us(), t))
+print("\nTime per prediction: {}us".format(sum(times)/len(times)))
+
+# Temporary file, removed afterwards
+filename = '_test_nn_tmp.qnn'
+try:
+    nn.save(net, filename)
+    net2 = nn.load(filename)
+finally:
+    try:
+        os.remove(filename)
+    except OSError:
+        pass
+print("\nSaved and loaded: {}".format(
+    list(net2.predict(x)) == list(net.predict(x))))
@@ -0,0 +1,77 @@
+from array import array
+import utime
+import array_funcs as af
+
+def max_error(x, y):
+    return max([abs(xi - yi) for xi, yi in zip(x, y)])
+
+# 25 joints with 8-element vectors and 8 small ops per joint
+n_joints = 25
+n = 8
+pos = [array('f', [0.1*(i + j) for i in range(n)]) for j in range(n_joints)]
+vel = [array('f', [0.01*(i - j) for i in range(n)]) for j in range(n_joints)]
+err = [array('f', [0.0]*n) for j in range(n_joints)]
+cnt = [array('i', [0]*n) for j in range(n_joints)]
+dt = array('f', [0.02])
+gain = array('f', [-0.5])
+total = array('f', [0.0])
+
+def tick_direct():
+    for j in range(n_joints):
+        af.float_array_add_scaled_array(pos[j], n, vel[j], dt)
+        af.float_array_copy(err[j], n, pos[j])
+        af.float_array_sub_scalar(err[j], n, dt)
+        af.float_array_square(err[j], n)
+        af.float_array_sqrt(err[j], n)
+        af.float_array_add_scaled_array(vel[j], n, err[j], gain)
+        af.float_array_sum(err[j], n, total)
+        af.int_array_add_scalar(cnt[j], n, 1)
+
+prog = af.Program(8*n_joints)
+for j in range(n_joints):
+    prog.add('float_array_add_scaled_array', pos[j], n, vel[j], dt)
+    prog.add('float_array_copy', err[j], n, pos[j])
+    prog.add('float_array_sub_scalar', err[j], n, dt)
+    prog.add('float_array_square', err[j], n)
+    prog.add('float_array_sqrt', err[j], n)
+    prog.add('float_array_add_scaled_array', vel[j], n, err[j], gain)
+    prog.add('float_array_sum', err[j], n, total)
+    prog.add('int_array_add_scalar', cnt[j], n, 1)
+
+print("\n-------- Testing Program and opqueue_run ----------")
+print("\nCommands: {}".format(prog.count))
+
+# Same results as calling the functions one by one
+saved = [array('f', p) for p in pos], [array('f', v) for v in vel]
+tick_direct()
+expected = [array('f', p) for p in pos], total[0]
+for j in range(n_joints):
+    pos[j][:] = saved[0][j]
+    vel[j][:] = saved[1][j]
+prog.run()
+print("Max error (pos): {}".format(
+    max([max_error(p, e) for p, e in zip(pos, expected[0])])))
+print("Sum: {} (expected {})".format(total[0], expected[1]))
+print("Counts: {}".format(cnt[0]))
+
+# Changing a scalar array changes the next run
+dt[0] = 0.0
+before = array('f', pos[0])
+prog.run()
+print("\nWith dt = 0, pos unchanged: {}".format(pos[0] == before))
+dt[0] = 0.02
+
+print("\nTime per tick ({} ops):".format(prog.count))
+for name, f in (('direct calls', tick_direct), ('prog.run()', prog.run)):
+    t = utime.ticks_us()
+    for i in range(10):
+        f()
+    delta = utime.ticks_diff(utime.ticks_us(), t)
+    print("{}: {}us".format(name, delta/10))
+
+prog.clear()
+print("\nAfter clear(): {} commands".format(prog.count))
+try:
+    prog.add('float_array_max', pos[0], n, total)
+except ValueError as e:
+    print("ValueError: {}".format(e))
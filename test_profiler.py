@@ -0,0 +1,23 @@
+from array import array
+import array_funcs as af
+import profiler
+
+n = 256
+x = array('f', [0.5]*n)
+y = array('f', [2.0]*n)
+v = array('f', [0.0])
+
+print("\nTesting profiler")
+profiler.enable()
+print("Enabled: {}".format(profiler.enabled()))
+for i in range(100):
+    af.float_array_mul_array(x, len(x), y)
+    af.float_array_div_array(x, len(x), y)
+    af.float_array_sum(x, len(x), v)
+profiler.disable()
+print("Enabled: {}".format(profiler.enabled()))
+profiler.report()
+print("\nstats('float_array_sum'): {}".format(
+    profiler.stats('float_array_sum')))
+profiler.reset()
+print("After reset(): {}".format(profiler.stats('float_array_sum')))
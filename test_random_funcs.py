@@ -0,0 +1,59 @@
+from array_funcs.random_state import RandomState
+from timers import *
+from array import array
+from urandom import random
+import math
+
+def mean_std(x):
+    m = sum(x)/len(x)
+    return m, math.sqrt(sum([(xi - m)**2 for xi in x])/len(x))
+
+rs = RandomState(12345)
+n = 1000
+
+print("\nTesting function: int_array_random_range(a, len(a), s, m)")
+a = array('i', [0]*n)
+rs.randint(a, -5, 5)
+print("a[:10]: {}".format(a[:10]))
+print("min, max: {}, {}".format(min(a), max(a)))
+
+print("\nTesting function: float_array_random_uniform(x, len(x), s, p)")
+x = array('f', [0.0]*n)
+rs.uniform(x, -1.0, 1.0)
+print("x[:5]: {}".format(x[:5]))
+print("mean, std: {} (expected 0.0, {})".format(mean_std(x), 1/math.sqrt(3)))
+
+print("\nTesting function: float_array_random_normal(x, len(x), s, p)")
+rs.normal(x, 2.0, 0.5)
+print("x[:5]: {}".format(x[:5]))
+print("mean, std: {} (expected 2.0, 0.5)".format(mean_std(x)))
+
+print("\nReproducibility")
+rs.seed(7)
+y1 = array('f', [0.0]*8)
+rs.normal(y1)
+state = rs.getstate()
+y2 = array('f', [0.0]*8)
+rs.normal(y2)
+rs.seed(7)
+z = array('f', [0.0]*16)
+rs.normal(z)
+print("Same stream: {}".format(list(z) == list(y1) + list(y2)))
+rs.setstate(state)
+rs.normal(y1)
+print("Resumed stream: {}".format(list(y1) == list(y2)))
+
+print("\nPerformance on array of length: {}".format(n))
+
+def list_random(n):
+    return array('f', [random()*2.0 - 1.0 for i in range(n)])
+
+timed_uniform = timed_function(rs.uniform)
+timed_normal = timed_function(rs.normal)
+timed_list_random = timed_function(list_random)
+print("rs.uniform(x, -1.0, 1.0):")
+timed_uniform(x, -1.0, 1.0)
+print("rs.normal(x):")
+timed_normal(x)
+print("array('f', [random()*2.0 - 1.0 for i in range(n)]):")
+y = timed_list_random(n)
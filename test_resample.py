@@ -0,0 +1,72 @@
+from array import array
+import math
+import utime
+import resample
+
+def rms(x, start=0):
+    x = x[start:]
+    return math.sqrt(sum([v*v for v in x])/len(x))
+
+def tone(n, f, phase=0):
+    # Sine wave of frequency f (fraction of the sample rate)
+    return array('f', [math.sin(2*math.pi*f*(i + phase)) for i in range(n)])
+
+def run(r, x, block):
+    # Processes x in blocks and returns the output
+    out = []
+    y = array('f', [0.0]*r.max_output)
+    for i in range(0, len(x), block):
+        n = min(block, len(x) - i)
+        count = r.process(y, memoryview(x)[i:], n)
+        out.extend(y[:count])
+    return array('f', out)
+
+n = 1024
+print("\n-------- Testing Resampling ----------")
+
+# Decimate by 4: a tone above the new Nyquist frequency (0.125 of
+# the input rate) aliases when taking every 4th sample
+x = tone(n, 0.3)
+dec = resample.Decimator(4, block=128)
+y = run(dec, x, 128)
+print("\nDecimator(4), {} taps".format(dec.taps))
+print("Outputs: {}".format(len(y)))
+every_4th = [x[i] for i in range(0, n, 4)]
+print("Tone at 0.3, RMS every 4th sample: {:.4f}".format(rms(every_4th)))
+print("Tone at 0.3, RMS decimated: {:.4f}".format(rms(y, dec.taps)))
+x = tone(n, 0.05)
+dec.reset()
+y = run(dec, x, 128)
+print("Tone at 0.05, RMS decimated: {:.4f} (expected {:.4f})".format(
+    rms(y, dec.taps), rms(x)))
+
+# Block sizes do not change the output
+for up, down in ((1, 4), (3, 1), (3, 2)):
+    x = tone(n, 0.02)
+    one = run(resample.Resampler(up, down, block=n), x, n)
+    blocks = run(resample.Resampler(up, down, block=100), x, 37)
+    error = max([abs(a - b) for a, b in zip(one, blocks)])
+    print("\nResampler({}, {}): {} outputs, blocks max difference {}".format(
+        up, down, len(one), error))
+
+# Interpolate by 3: compare with the tone at the higher rate
+# after the filter delay of (L*K - 1)/2 output samples
+interp = resample.Interpolator(3, block=n)
+x = tone(n, 0.02)
+y = run(interp, x, n)
+delay = (3*interp.taps - 1)/2
+expected = tone(len(y), 0.02/3, -delay)
+start = 3*interp.taps
+print("\nInterpolator(3): max error {:.5f}".format(
+    max([abs(a - b) for a, b in zip(y[start:], expected[start:])])))
+
+print("\nTime per block of 128 samples:")
+x = tone(128, 0.05)
+for name, r in (('Decimator(4)', resample.Decimator(4, block=128)),
+                ('Resampler(3, 2)', resample.Resampler(3, 2, block=128))):
+    y = array('f', [0.0]*r.max_output)
+    t = utime.ticks_us()
+    for i in range(10):
+        r.process(y, x, len(x))
+    delta = utime.ticks_diff(utime.ticks_us(), t)
+    print("{}: {}us".format(name, delta/10))
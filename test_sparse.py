@@ -0,0 +1,67 @@
+from array import array
+import utime
+import array_funcs as af
+import sparse
+
+# 64 x 64 matrix with about 5% non-zero elements
+n = 64
+rs = af.RandomState(1)
+A = array('f', [0.0]*n*n)
+mask = array('f', [0.0]*n*n)
+rs.normal(A)
+rs.random(mask)
+for i in range(n*n):
+    if mask[i] > 0.05:
+        A[i] = 0.0
+x = array('f', [0.0]*n)
+rs.normal(x)
+
+def dense_matvec(y, A, x):
+    mv = memoryview(A)
+    v = array('f', [0.0])
+    for r in range(n):
+        af.float_array_dot(mv[r*n:(r + 1)*n], n, x, v)
+        y[r] = v[0]
+
+print("\n-------- Testing Sparse Functions ----------")
+
+S = sparse.csr_from_dense(A, n, n)
+print("\nNon-zero elements: {} of {}".format(S.nnz, n*n))
+print("Memory: {} bytes (dense {} bytes)".format(
+    4*(len(S.values) + len(S.cols) + len(S.rowptr)), 4*n*n))
+
+y = array('f', [0.0]*n)
+expected = array('f', [0.0]*n)
+S.matvec(y, x)
+dense_matvec(expected, A, x)
+print("\nmatvec max error: {}".format(
+    max([abs(a - b) for a, b in zip(y, expected)])))
+print("row_dot(5, x): {} (expected {})".format(S.row_dot(5, x), expected[5]))
+
+B = array('f', [1.0]*n*n)
+S.to_dense(B)
+print("to_dense: {}".format(B == A))
+
+# The row with the most elements
+r = max(range(n), key=lambda r: S.rowptr[r + 1] - S.rowptr[r])
+row = A[r*n:(r + 1)*n]
+v = sparse.sparse_from_dense(row, n)
+print("\nSparse vector from row {}: {} elements".format(r, v.nnz))
+print("dot: {} (expected {})".format(v.dot(x), expected[r]))
+z = array('f', [0.0]*n)
+v.add_to(z, 2.0)
+print("add_to max error: {}".format(
+    max([abs(z[i] - 2*row[i]) for i in range(n)])))
+
+S = sparse.csr_from_dense(A, n, n, 1.0)
+print("\nWith threshold 1.0: {} elements".format(S.nnz))
+
+print("\nTime for A*x:")
+S = sparse.csr_from_dense(A, n, n)
+t = utime.ticks_us()
+S.matvec(y, x)
+print("CSR: {}us".format(utime.ticks_diff(utime.ticks_us(), t)))
+t = utime.ticks_us()
+dense_matvec(expected, A, x)
+print("Dense (float_array_dot per row): {}us".format(
+    utime.ticks_diff(utime.ticks_us(), t)))
@@ -1,5 +1,8 @@
 import utime
-import random
+from array import array
+from array_funcs.random_state import RandomState
+
+_random_state = RandomState(utime.ticks_us())
 
 def timed_function(f, *args, **kwargs):
     def new_func(*args, **kwargs):
@@ -11,4 +14,6 @@ def timed_function(f, *args, **kwargs):
     return new_func
 
 def float_array_random(n, min=-1e6, max=1e6):
-    return array('f', [random()*(max - min) + min for i in range(n)])
\ No newline at end of file
+    x = array('f', [0.0]*n)
+    _random_state.uniform(x, min, max)
+    return x